@@ -6,6 +6,10 @@
 import axios from 'axios';
 import { config } from '../config.js';
 
+const PAGE_SIZE = 500;
+// Most items the API accepts per batch request
+const BATCH_SIZE = 500;
+
 const apiClient = axios.create({
   baseURL: config.apiBaseUrl,
   headers: {
@@ -14,17 +18,27 @@ const apiClient = axios.create({
 });
 
 /**
- * Fetch all articles from the API
+ * Fetch all articles from the API, following next_cursor pages
  */
 export async function fetchArticles() {
   try {
-    const response = await apiClient.get('');
+    const articles = [];
+    let cursor = null;
     
-    if (response.data.success && response.data.articles) {
-      return response.data.articles;
-    }
+    do {
+      const params = { limit: PAGE_SIZE };
+      if (cursor) params.cursor = cursor;
+      const response = await apiClient.get('', { params });
+      
+      if (!response.data.success || !response.data.articles) {
+        throw new Error('Invalid API response format');
+      }
+      
+      articles.push(...response.data.articles);
+      cursor = response.data.next_cursor;
+    } while (cursor);
     
-    throw new Error('Invalid API response format');
+    return articles;
   } catch (error) {
     if (error.response) {
       throw new Error(`API Error: ${error.response.status} - ${error.response.data.error || error.message}`);
@@ -93,4 +107,82 @@ export async function updateArticle(articleId, articleData) {
   }
 }
 
+/**
+ * Fetch several articles by ID in one request (unknown IDs are skipped)
+ */
+export async function fetchArticlesByIds(articleIds) {
+  try {
+    const articles = [];
+    
+    for (let start = 0; start < articleIds.length; start += BATCH_SIZE) {
+      const ids = articleIds.slice(start, start + BATCH_SIZE).join(',');
+      const response = await apiClient.get('/batch', { params: { ids } });
+      
+      if (!response.data.success || !response.data.articles) {
+        throw new Error('Invalid API response format');
+      }
+      
+      articles.push(...response.data.articles);
+    }
+    
+    return articles;
+  } catch (error) {
+    if (error.response) {
+      throw new Error(`API Error: ${error.response.status} - ${error.response.data.error || error.message}`);
+    }
+    throw new Error(`Failed to fetch articles: ${error.message}`);
+  }
+}
 
+/**
+ * Send one batch request per BATCH_SIZE items and collect the per-item results
+ */
+async function sendBatches(method, items, bodyKey, action) {
+  try {
+    const results = [];
+    
+    for (let start = 0; start < items.length; start += BATCH_SIZE) {
+      const response = await apiClient.request({
+        method,
+        url: '/batch',
+        data: { [bodyKey]: items.slice(start, start + BATCH_SIZE) }
+      });
+      
+      if (!response.data.success || !response.data.results) {
+        throw new Error('Invalid API response format');
+      }
+      
+      // Item indexes are relative to the request; make them relative to `items`
+      results.push(...response.data.results.map(result => ({ ...result, index: result.index + start })));
+    }
+    
+    return results;
+  } catch (error) {
+    if (error.response) {
+      throw new Error(`API Error: ${error.response.status} - ${error.response.data.error || error.message}`);
+    }
+    throw new Error(`Failed to ${action}: ${error.message}`);
+  }
+}
+
+/**
+ * Publish several new articles, one transaction per batch.
+ * Returns one result per article ({ index, success, status, article_id | error })
+ */
+export async function publishArticles(articles) {
+  return sendBatches('post', articles, 'articles', 'publish articles');
+}
+
+/**
+ * Update several articles; every item needs an `id` plus the fields to change
+ */
+export async function updateArticles(articles) {
+  return sendBatches('patch', articles, 'articles', 'update articles');
+}
+
+/**
+ * Delete several articles by ID
+ */
+export async function deleteArticles(articleIds) {
+  return sendBatches('delete', articleIds, 'ids', 'delete articles');
+}
@@ -5,13 +5,37 @@ and provides CRUD operations via REST APIs.
 """
 
 import os
+import re
+import json
+import base64
+import hashlib
+import html
+import gzip
+import zlib
 import sqlite3
-import requests
-from bs4 import BeautifulSoup
-from flask import Flask, jsonify, request
+import struct
+import logging
+from flask import Flask, jsonify, request, g, Response
 from flask_cors import CORS
-from datetime import datetime
-import re
+from collections import namedtuple, OrderedDict, Counter
+from functools import wraps
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+import queue
+import threading
+import time
+import math
+
+try:
+    import brotli
+except ImportError:  # optional; responses fall back to gzip
+    brotli = None
+
+try:
+    import numpy as np
+except ImportError:  # optional; SimHash falls back to pure Python
+    np = None
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -21,15 +45,293 @@ CORS(app)  # Enable CORS for React frontend
 # Database configuration
 DB_PATH = os.path.join(os.path.dirname(__file__), 'articles.db')
 
+# Connection tuning applied to every SQLite connection
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 8))
+DB_BUSY_TIMEOUT_MS = 5000
+DB_PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -65536",      # 64 MiB page cache
+    "PRAGMA mmap_size = 268435456",    # 256 MiB memory-mapped I/O
+    "PRAGMA temp_store = MEMORY",
+    f"PRAGMA busy_timeout = {DB_BUSY_TIMEOUT_MS}",
+)
+
+# Scraper configuration
+SCRAPE_MAX_WORKERS = int(os.environ.get('SCRAPE_MAX_WORKERS', 8))
+SCRAPE_PER_HOST_LIMIT = int(os.environ.get('SCRAPE_PER_HOST_LIMIT', 4))
+SCRAPE_TIMEOUT = 10
+SCRAPE_MAX_RETRIES = 3
+SCRAPE_RETRY_BACKOFF = 0.5
+SCRAPE_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+# On-disk HTTP cache used to revalidate scraped pages with ETag/Last-Modified
+HTTP_CACHE_PATH = os.path.join(os.path.dirname(__file__), 'http_cache.db')
+
+# Raw article pages are kept zlib-compressed next to the database so extraction
+# can be re-run offline with reextract.py (PAGE_SNAPSHOTS=false to stop recording)
+SNAPSHOT_PATH = os.path.join(os.path.dirname(__file__), 'page_snapshots.db')
+PAGE_SNAPSHOTS_ENABLED = os.environ.get('PAGE_SNAPSHOTS', 'true').lower() != 'false'
+SNAPSHOT_COMPRESSION_LEVEL = 9
+
+# Last-page discovery: upper bound on listing pages and cache lifetime (seconds)
+MAX_LISTING_PAGES = 4096
+LAST_PAGE_CACHE_TTL = int(os.environ.get('LAST_PAGE_CACHE_TTL', 6 * 60 * 60))
+
+# Blog to scrape and number of frontier URLs scraped per batch in archive crawls
+BLOG_BASE_URL = "https://beyondchats.com/blogs/"
+CRAWL_BATCH_SIZE = 50
+
+# Adaptive re-crawl: a refresh cycle re-fetches the REFRESH_BUDGET stored articles
+# most likely to have changed, judged by each article's observed change rate.
+# REFRESH_INTERVAL_SECONDS > 0 runs a cycle on that interval while the server runs.
+REFRESH_BUDGET = int(os.environ.get('REFRESH_BUDGET', 50))
+REFRESH_INTERVAL_SECONDS = int(os.environ.get('REFRESH_INTERVAL_SECONDS', 0))
+# Prior change rate for articles with little history: one change per this many seconds
+REFRESH_PRIOR_SECONDS = 30 * 24 * 60 * 60
+# Articles are only due for a refresh once the estimated chance that they changed
+# since their last check reaches REFRESH_MIN_CHANGE_PROBABILITY and that check is
+# at least REFRESH_MIN_AGE_SECONDS old; a cycle with nothing due fetches nothing.
+REFRESH_MIN_CHANGE_PROBABILITY = float(os.environ.get('REFRESH_MIN_CHANGE_PROBABILITY', 0.1))
+REFRESH_MIN_AGE_SECONDS = int(os.environ.get('REFRESH_MIN_AGE_SECONDS', 60 * 60))
+
+# Scrape on server start: 'background' runs a scrape job after startup, 'none' skips it
+SCRAPE_ON_START = os.environ.get('SCRAPE_ON_START', 'background').lower()
+
+# Longest one page fetch can block: every attempt times out, plus the retry backoff
+SCRAPE_FETCH_MAX_SECONDS = (
+    SCRAPE_TIMEOUT * (SCRAPE_MAX_RETRIES + 1)
+    + sum(SCRAPE_RETRY_BACKOFF * 2 ** attempt for attempt in range(SCRAPE_MAX_RETRIES))
+)
+
+# Background scrape jobs without a heartbeat for this long are considered dead.
+# Heartbeats come between fetch batches, so allow for the slowest possible batch
+# (its pages run SCRAPE_PER_HOST_LIMIT at a time) plus a minute of slack.
+SCRAPE_JOB_STALE_SECONDS = max(
+    300,
+    -(-max(CRAWL_BATCH_SIZE, REFRESH_BUDGET) // SCRAPE_PER_HOST_LIMIT) * SCRAPE_FETCH_MAX_SECONDS + 60
+)
+
+# Number of articles written per executemany chunk when storing scraped articles
+STORE_CHUNK_SIZE = int(os.environ.get('STORE_CHUNK_SIZE', 500))
+
+# Article fields clients send as text; the nullable ones may also be null
+ARTICLE_TEXT_FIELDS = ('title', 'url', 'content', 'author', 'published_date')
+ARTICLE_NULLABLE_FIELDS = ('content', 'author', 'published_date', 'scraped_at')
+
+# Columns that can be selected with fields= on the article endpoints
+ARTICLE_COLUMNS = ('id', 'title', 'url', 'content', 'author', 'published_date', 'published_epoch',
+                   'scraped_at', 'duplicate_of')
+
+# Page sizes for GET /api/articles
+ARTICLES_DEFAULT_PAGE_SIZE = 50
+ARTICLES_MAX_PAGE_SIZE = 500
+
+# GET /api/articles sort orders: name -> column paginated with (column, id) keyset cursors
+ARTICLES_SORT_COLUMNS = {'id': 'id', 'published': 'published_epoch', 'scraped': 'scraped_at'}
+
+# Formats tried (after ISO 8601) when parsing the free-form published_date text
+PUBLISHED_DATE_FORMATS = (
+    '%B %d, %Y', '%b %d, %Y', '%B %d %Y', '%b %d %Y',
+    '%d %B %Y', '%d %b %Y', '%d %B, %Y', '%d %b, %Y',
+    '%Y/%m/%d', '%B %Y', '%b %Y',
+)
+
+# In-process cache for read endpoints (entries and total body bytes)
+RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', 1024))
+RESPONSE_CACHE_MAX_BYTES = int(os.environ.get('RESPONSE_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+
+# Number of authors and days listed by GET /api/articles/stats
+STATS_MAX_AUTHORS = 100
+STATS_MAX_DAYS = 30
+
+# Rows per chunk for NDJSON export, and lines per transaction for NDJSON import
+EXPORT_CHUNK_ROWS = 500
+IMPORT_BATCH_SIZE = int(os.environ.get('IMPORT_BATCH_SIZE', 1000))
+IMPORT_MAX_REPORTED_ERRORS = 50
+IMPORT_COUNT_KEYS = ('inserted', 'updated', 'unchanged', 'skipped')
+
+# Most items accepted by one /api/articles/batch request
+BATCH_MAX_ITEMS = 500
+
+# Page sizes for GET /api/articles/search
+SEARCH_DEFAULT_PAGE_SIZE = 20
+SEARCH_MAX_PAGE_SIZE = 100
+# Match delimiters handed to highlight()/snippet(); swapped for <mark> after escaping
+SEARCH_HIGHLIGHT_START = '\x02'
+SEARCH_HIGHLIGHT_END = '\x03'
+# Shared by the search index and the per-request index highlights are built from
+SEARCH_TOKENIZER = 'porter unicode61'
+
+# Article bodies are stored zlib-compressed with a preset dictionary trained on
+# the stored articles (CONTENT_COMPRESSION=none stores new bodies as plain text)
+CONTENT_COMPRESSION = os.environ.get('CONTENT_COMPRESSION', 'zlib').lower()
+CONTENT_COMPRESSION_LEVEL = 6
+CONTENT_COMPRESS_MIN_BYTES = 256
+CONTENT_DICT_MIN_ARTICLES = 50
+CONTENT_DICT_SAMPLE_SIZE = 500
+CONTENT_DICT_MAX_BYTES = 32 * 1024  # zlib window size
+
+# Near-duplicate detection: 64-bit SimHash over word shingles, indexed in bands
+# for LSH lookup. Any two fingerprints within NEAR_DUPLICATE_MAX_DISTANCE bits
+# share at least one band as long as it is below SIMHASH_BANDS.
+SIMHASH_SHINGLE_WORDS = 3
+SIMHASH_MIN_WORDS = 50
+SIMHASH_BANDS = 4
+NEAR_DUPLICATE_MAX_DISTANCE = 3
+# Rows fingerprinted per write transaction by the post-startup backfill, and the pause between them
+FINGERPRINT_BACKFILL_BATCH = int(os.environ.get('FINGERPRINT_BACKFILL_BATCH', 200))
+FINGERPRINT_BACKFILL_PAUSE_SECONDS = 0.05
+
+# Related articles: precomputed TF-IDF neighbours, saved as memory-mappable
+# .npy files (default: a directory next to the database) and kept in sync by a
+# background thread that wakes on writes and at least every RELATED_INDEX_SYNC_SECONDS
+RELATED_INDEX_PATH = os.environ.get('RELATED_INDEX_PATH')
+RELATED_DEFAULT_LIMIT = 5
+RELATED_MAX_LIMIT = 20
+RELATED_INDEX_SYNC_SECONDS = 30
+RELATED_FETCH_BATCH_SIZE = 500
+
+# /api/articles* responses of at least this size are gzip/br encoded when the client accepts it
+RESPONSE_COMPRESS_MIN_BYTES = 1024
+RESPONSE_GZIP_LEVEL = 6
+RESPONSE_BROTLI_QUALITY = 5
+
+# Metrics exposed on /metrics (METRICS_ENABLED=false turns collection off)
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() != 'false'
+METRICS_PREFIX = 'beyondchats_'
+METRICS_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Structured (one JSON object per line) summary of every scrape run
+run_logger = logging.getLogger('beyond_chats.scrape')
+if not run_logger.handlers:
+    _run_log_handler = logging.StreamHandler()
+    _run_log_handler.setFormatter(logging.Formatter('%(message)s'))
+    run_logger.addHandler(_run_log_handler)
+    run_logger.setLevel(logging.INFO)
+    run_logger.propagate = False
+
+def _configure_connection(conn):
+    """
+    Apply row factory, the content_text() SQL function and performance PRAGMAs
+    to a new connection. content_text() is for queries only: triggers and views
+    must stay usable from connections that do not register it.
+    """
+    conn.row_factory = sqlite3.Row
+    db_path = DB_PATH
+    conn.create_function(
+        'content_text', 1, lambda value: decompress_content(value, db_path), deterministic=True
+    )
+    for pragma in DB_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
 def get_db_connection():
     """Create and return a database connection."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = sqlite3.connect(DB_PATH, timeout=DB_BUSY_TIMEOUT_MS / 1000)
+    return _configure_connection(conn)
+
+def get_readonly_db_connection():
+    """Create and return a read-only database connection."""
+    conn = sqlite3.connect(
+        f"file:{DB_PATH}?mode=ro",
+        uri=True,
+        timeout=DB_BUSY_TIMEOUT_MS / 1000,
+        check_same_thread=False
+    )
+    _configure_connection(conn)
+    conn.execute("PRAGMA query_only = ON")
     return conn
 
+class ConnectionPool:
+    """
+    Small LIFO pool of SQLite connections shared by the request threads of one worker.
+    Connections are handed to one request at a time, so they may move between threads.
+    """
+    
+    def __init__(self, factory, size, path=None):
+        self.factory = factory
+        self.size = size
+        self.path = path or DB_PATH
+        self.pid = os.getpid()
+        self._idle = queue.LifoQueue(maxsize=size)
+    
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self.factory()
+    
+    def release(self, conn):
+        # Never hand an open transaction to the next request
+        if conn.in_transaction:
+            conn.rollback()
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+    
+    def close_all(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+_db_pools = {}
+_db_pools_lock = threading.Lock()
+
+def _get_pool(name, factory, path=None):
+    """
+    Return the named pool for this process, recreating it after a fork or a
+    change of its database path (`path`, DB_PATH by default).
+    """
+    path = path or DB_PATH
+    with _db_pools_lock:
+        pool = _db_pools.get(name)
+        if pool is None or pool.pid != os.getpid() or pool.path != path:
+            if pool is not None and pool.pid == os.getpid():
+                pool.close_all()
+            pool = ConnectionPool(factory, DB_POOL_SIZE, path)
+            _db_pools[name] = pool
+        return pool
+
+def _pooled_writer_connection():
+    conn = sqlite3.connect(DB_PATH, timeout=DB_BUSY_TIMEOUT_MS / 1000, check_same_thread=False)
+    return _configure_connection(conn)
+
+def get_db():
+    """
+    Return the read-write connection for the current app context.
+    The connection comes from the worker's pool and is returned on teardown.
+    """
+    if 'db' not in g:
+        g.db = _get_pool('write', _pooled_writer_connection).acquire()
+    return g.db
+
+def get_read_db():
+    """
+    Return a read-only connection for the current app context.
+    In WAL mode reads on this connection are not blocked by a concurrent scrape writing.
+    """
+    if 'read_db' not in g:
+        g.read_db = _get_pool('read', get_readonly_db_connection).acquire()
+    return g.read_db
+
+@app.teardown_appcontext
+def release_db_connections(exception=None):
+    """Return the connections borrowed by this app context to their pools."""
+    conn = g.pop('db', None)
+    if conn is not None:
+        _get_pool('write', _pooled_writer_connection).release(conn)
+    conn = g.pop('read_db', None)
+    if conn is not None:
+        _get_pool('read', get_readonly_db_connection).release(conn)
+
 def init_articles_db():
     """Initialize the articles database table."""
     conn = get_db_connection()
+    # WAL lets API readers keep working while the scraper writes
+    conn.execute("PRAGMA journal_mode = WAL")
     cur = conn.cursor()
     cur.execute("""
         CREATE TABLE IF NOT EXISTS articles (
@@ -42,341 +344,2983 @@ def init_articles_db():
             scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     """)
+    # URL frontier and per-blog state for incremental archive crawls
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS crawl_frontier (
+            url TEXT PRIMARY KEY,
+            title TEXT,
+            listing_page INTEGER,
+            status TEXT NOT NULL DEFAULT 'pending',
+            discovered_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            fetched_at TIMESTAMP
+        )
+    """)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_crawl_frontier_status ON crawl_frontier (status, listing_page)")
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS crawl_state (
+            base_url TEXT PRIMARY KEY,
+            archive_complete INTEGER NOT NULL DEFAULT 0,
+            last_crawled_at TIMESTAMP
+        )
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS scrape_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            mode TEXT NOT NULL,
+            full INTEGER NOT NULL DEFAULT 0,
+            status TEXT NOT NULL,
+            pages_discovered INTEGER NOT NULL DEFAULT 0,
+            pages_failed INTEGER NOT NULL DEFAULT 0,
+            articles_fetched INTEGER NOT NULL DEFAULT 0,
+            articles_stored INTEGER NOT NULL DEFAULT 0,
+            articles_failed INTEGER NOT NULL DEFAULT 0,
+            cancel_requested INTEGER NOT NULL DEFAULT 0,
+            error TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            started_at TIMESTAMP,
+            finished_at TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    columns = {row['name'] for row in cur.execute("PRAGMA table_info(scrape_jobs)")}
+    if 'pages_failed' not in columns:
+        cur.execute("ALTER TABLE scrape_jobs ADD COLUMN pages_failed INTEGER NOT NULL DEFAULT 0")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_scrape_jobs_status ON scrape_jobs (status)")
+    init_search_index(cur)
+    init_data_version(cur)
+    init_stats(cur)
+    init_related_changes(cur)
     conn.commit()
+    init_content_compression(conn)
+    init_fingerprints(conn)
+    init_published_dates(conn)
+    init_freshness(conn)
     conn.close()
     print("Articles database initialized.")
 
-def find_last_page(base_url):
+def init_search_index(cur):
     """
-    Find the last page number by checking pagination links.
-    Returns the last page number.
+    Create the contentless FTS5 index over article title/content/author and
+    the triggers that queue changed articles for it.
+    The index keeps no copy of the text (bodies may be compressed, which plain
+    SQL cannot read), so the triggers only record changed articles in
+    search_pending, together with the values the index currently holds for
+    them. sync_search_index applies the queue from Python. Any writer,
+    including the sqlite3 shell, keeps the queue complete.
+    The first time the index is created (or when an index from an older
+    version that stored or read article text is replaced) every article is
+    queued.
+    """
+    cur.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'articles_fts'")
+    existing = cur.fetchone()
+    needs_backfill = existing is None or "content=''" not in existing[0]
+    if existing is not None and needs_backfill:
+        cur.execute("DROP TABLE articles_fts")
+    cur.execute("DROP VIEW IF EXISTS articles_fts_source")
+    
+    cur.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+            title, content, author,
+            content='',
+            tokenize='{SEARCH_TOKENIZER}'
+        )
+    """)
+    # indexed = 0: nothing indexed yet; 1: the old_* values are what the index holds
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS search_pending (
+            article_id INTEGER PRIMARY KEY,
+            indexed INTEGER NOT NULL,
+            old_title TEXT,
+            old_content,
+            old_author TEXT
+        )
+    """)
+    # Triggers are recreated on every start so existing databases pick up changes.
+    # Only the first entry knows what the index holds, so later changes never
+    # touch it. NOT EXISTS rather than OR IGNORE: the conflict clause of the
+    # statement that fired the trigger (an upsert, INSERT OR REPLACE) overrides OR IGNORE.
+    for name in ('articles_fts_insert', 'articles_fts_delete', 'articles_fts_update'):
+        cur.execute(f"DROP TRIGGER IF EXISTS {name}")
+    cur.execute("""
+        CREATE TRIGGER articles_fts_insert AFTER INSERT ON articles BEGIN
+            INSERT INTO search_pending (article_id, indexed)
+            SELECT new.id, 0
+            WHERE NOT EXISTS (SELECT 1 FROM search_pending WHERE article_id = new.id);
+        END
+    """)
+    queue_old_row = """
+        INSERT INTO search_pending (article_id, indexed, old_title, old_content, old_author)
+        SELECT old.id, 1, old.title, old.content, old.author
+        WHERE NOT EXISTS (SELECT 1 FROM search_pending WHERE article_id = old.id);
+    """
+    cur.execute(f"""
+        CREATE TRIGGER articles_fts_delete AFTER DELETE ON articles BEGIN
+            {queue_old_row}
+        END
+    """)
+    cur.execute(f"""
+        CREATE TRIGGER articles_fts_update AFTER UPDATE OF title, content, author ON articles BEGIN
+            {queue_old_row}
+        END
+    """)
+    
+    if needs_backfill:
+        cur.execute("DELETE FROM search_pending")
+        cur.execute("INSERT INTO search_pending (article_id, indexed) SELECT id, 0 FROM articles")
+
+def sync_search_index(conn):
+    """
+    Apply the search_pending queue to the FTS index: remove the values each
+    queued article was indexed with and index its current text (decompressed).
+    Runs in write transactions of STORE_CHUNK_SIZE articles, so concurrent
+    callers never apply the same entry twice.
+    Returns the number of articles applied.
+    """
+    applied = 0
+    while True:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute("""
+                SELECT p.article_id, p.indexed, p.old_title, p.old_content, p.old_author,
+                       a.id IS NOT NULL AS present, a.title, a.content, a.author
+                FROM search_pending p
+                LEFT JOIN articles a ON a.id = p.article_id
+                ORDER BY p.article_id LIMIT ?
+            """, (STORE_CHUNK_SIZE,)).fetchall()
+            conn.executemany("""
+                INSERT INTO articles_fts (articles_fts, rowid, title, content, author)
+                VALUES ('delete', ?, ?, ?, ?)
+            """, [
+                (row['article_id'], row['old_title'], decompress_content(row['old_content']), row['old_author'])
+                for row in rows if row['indexed']
+            ])
+            conn.executemany("INSERT INTO articles_fts (rowid, title, content, author) VALUES (?, ?, ?, ?)", [
+                (row['article_id'], row['title'], decompress_content(row['content']), row['author'])
+                for row in rows if row['present']
+            ])
+            conn.executemany("DELETE FROM search_pending WHERE article_id = ?",
+                             [(row['article_id'],) for row in rows])
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied += len(rows)
+        if len(rows) < STORE_CHUNK_SIZE:
+            return applied
+
+def init_data_version(cur):
+    """
+    Create the single-row data_version table and the triggers that bump it
+    on every change to articles, so cached API responses can be invalidated
+    by any writer (API endpoints, the scraper, other worker processes).
+    """
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS data_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL
+        )
+    """)
+    cur.execute("INSERT OR IGNORE INTO data_version (id, version) VALUES (1, 0)")
+    for event in ('INSERT', 'UPDATE', 'DELETE'):
+        cur.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS articles_version_{event.lower()} AFTER {event} ON articles BEGIN
+                UPDATE data_version SET version = version + 1 WHERE id = 1;
+            END
+        """)
+
+def init_stats(cur):
+    """
+    Create the statistics tables and the triggers that keep them up to date,
+    so /api/articles/stats never has to scan the articles table.
+    Counters are backfilled from existing rows the first time they are created.
+    Content bytes are uncompressed UTF-8 sizes: the triggers read them from the
+    content_bytes column for compressed bodies (see encode_content), so they
+    only use plain SQL.
+    """
+    cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'article_stats'")
+    needs_backfill = cur.fetchone() is None
+    
+    columns = {row['name'] for row in cur.execute("PRAGMA table_info(articles)")}
+    if 'content_bytes' not in columns:
+        cur.execute("ALTER TABLE articles ADD COLUMN content_bytes INTEGER")
+        rows = cur.execute("SELECT id, content FROM articles WHERE typeof(content) = 'blob'").fetchall()
+        cur.executemany("UPDATE articles SET content_bytes = ? WHERE id = ?",
+                        [(content_size(row['content']), row['id']) for row in rows])
+    
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS article_stats (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            total_articles INTEGER NOT NULL DEFAULT 0,
+            articles_with_content INTEGER NOT NULL DEFAULT 0,
+            total_content_bytes INTEGER NOT NULL DEFAULT 0,
+            last_scraped_at TIMESTAMP
+        )
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS author_stats (
+            author TEXT PRIMARY KEY,
+            article_count INTEGER NOT NULL
+        )
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS daily_scrape_stats (
+            day TEXT PRIMARY KEY,
+            article_count INTEGER NOT NULL
+        )
+    """)
+    cur.execute("INSERT OR IGNORE INTO article_stats (id) VALUES (1)")
+    for name in ('articles_stats_insert', 'articles_stats_delete',
+                 'articles_stats_update', 'articles_stats_rescrape'):
+        cur.execute(f"DROP TRIGGER IF EXISTS {name}")
+    
+    content_bytes = """COALESCE(CASE WHEN typeof({row}.content) = 'blob' THEN {row}.content_bytes
+                                      ELSE length(CAST({row}.content AS BLOB)) END, 0)"""
+    add_row = f"""
+        UPDATE article_stats SET
+            total_articles = total_articles + 1,
+            articles_with_content = articles_with_content + (COALESCE(new.content, '') != ''),
+            total_content_bytes = total_content_bytes + {content_bytes.format(row='new')},
+            last_scraped_at = MAX(COALESCE(last_scraped_at, ''), new.scraped_at)
+        WHERE id = 1;
+        INSERT INTO author_stats (author, article_count) VALUES (COALESCE(new.author, ''), 1)
+            ON CONFLICT(author) DO UPDATE SET article_count = article_count + 1;
+    """
+    remove_row = f"""
+        UPDATE article_stats SET
+            total_articles = total_articles - 1,
+            articles_with_content = articles_with_content - (COALESCE(old.content, '') != ''),
+            total_content_bytes = total_content_bytes - {content_bytes.format(row='old')}
+        WHERE id = 1;
+        UPDATE author_stats SET article_count = article_count - 1 WHERE author = COALESCE(old.author, '');
+        DELETE FROM author_stats WHERE author = COALESCE(old.author, '') AND article_count <= 0;
+    """
+    count_scrape = """
+        INSERT INTO daily_scrape_stats (day, article_count) VALUES (date(new.scraped_at), 1)
+            ON CONFLICT(day) DO UPDATE SET article_count = article_count + 1;
+    """
+    cur.execute(f"""
+        CREATE TRIGGER articles_stats_insert AFTER INSERT ON articles BEGIN
+            {add_row}
+            {count_scrape}
+        END
+    """)
+    cur.execute(f"""
+        CREATE TRIGGER articles_stats_delete AFTER DELETE ON articles BEGIN
+            {remove_row}
+        END
+    """)
+    cur.execute(f"""
+        CREATE TRIGGER articles_stats_update AFTER UPDATE OF content, author, scraped_at ON articles BEGIN
+            {remove_row}
+            {add_row}
+        END
+    """)
+    # A re-scrape refreshes scraped_at and counts towards that day's scrapes
+    cur.execute(f"""
+        CREATE TRIGGER articles_stats_rescrape AFTER UPDATE OF scraped_at ON articles
+        WHEN new.scraped_at IS NOT old.scraped_at BEGIN
+            {count_scrape}
+        END
+    """)
+    
+    if needs_backfill:
+        cur.execute(f"""
+            UPDATE article_stats SET
+                total_articles = (SELECT COUNT(*) FROM articles),
+                articles_with_content = (SELECT COUNT(*) FROM articles WHERE COALESCE(content, '') != ''),
+                total_content_bytes = (SELECT COALESCE(SUM({content_bytes.format(row='articles')}), 0) FROM articles),
+                last_scraped_at = (SELECT MAX(scraped_at) FROM articles)
+            WHERE id = 1
+        """)
+        cur.execute("""
+            INSERT INTO author_stats (author, article_count)
+            SELECT COALESCE(author, ''), COUNT(*) FROM articles GROUP BY COALESCE(author, '')
+        """)
+        cur.execute("""
+            INSERT INTO daily_scrape_stats (day, article_count)
+            SELECT date(scraped_at), COUNT(*) FROM articles
+            WHERE scraped_at IS NOT NULL
+            GROUP BY date(scraped_at)
+        """)
+
+def init_related_changes(cur):
+    """
+    Create the related_changes log and the triggers that fill it: every
+    insert, delete, and change of title or content hash appends the article
+    id with a new sequence number, so the related-articles index can sync
+    only what changed since the position it last synced (see
+    sync_related_index). Older entries for the same article are dropped, so
+    the log holds at most one row per article id.
+    """
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS related_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            article_id INTEGER NOT NULL
+        )
+    """)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_related_changes_article ON related_changes (article_id)")
+    log_change = """
+        INSERT INTO related_changes (article_id) VALUES ({id});
+        DELETE FROM related_changes
+        WHERE article_id = {id} AND seq < (SELECT MAX(seq) FROM related_changes);
+    """
+    for name in ('articles_related_insert', 'articles_related_update', 'articles_related_delete'):
+        cur.execute(f"DROP TRIGGER IF EXISTS {name}")
+    cur.execute(f"""
+        CREATE TRIGGER articles_related_insert AFTER INSERT ON articles BEGIN
+            {log_change.format(id='new.id')}
+        END
+    """)
+    cur.execute(f"""
+        CREATE TRIGGER articles_related_update AFTER UPDATE OF title, content_hash ON articles
+        WHEN new.title IS NOT old.title OR new.content_hash IS NOT old.content_hash BEGIN
+            {log_change.format(id='new.id')}
+        END
+    """)
+    cur.execute(f"""
+        CREATE TRIGGER articles_related_delete AFTER DELETE ON articles BEGIN
+            {log_change.format(id='old.id')}
+        END
+    """)
+
+def get_data_version(conn):
+    """Return the current articles data version."""
+    row = conn.execute("SELECT version FROM data_version WHERE id = 1").fetchone()
+    return row['version'] if row else 0
+
+# ==================== CONTENT COMPRESSION ====================
+
+# Stored content is either plain TEXT (short bodies, rows from before compression)
+# or a BLOB: 1-byte dictionary id (0 = none), 4-byte uncompressed size, zlib stream
+_CONTENT_HEADER = struct.Struct('>BI')
+
+_content_dictionaries = {}       # (db path, dictionary id) -> dictionary bytes
+_active_content_dictionary = {}  # db path -> dictionary id used for new writes
+
+def _content_dictionary(db_path, dictionary_id):
+    """Return a preset dictionary, loading it on a separate connection on first use."""
+    key = (db_path, dictionary_id)
+    dictionary = _content_dictionaries.get(key)
+    if dictionary is None:
+        conn = sqlite3.connect(db_path, timeout=DB_BUSY_TIMEOUT_MS / 1000)
+        try:
+            row = conn.execute(
+                "SELECT dictionary FROM content_dictionaries WHERE id = ?", (dictionary_id,)
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            raise ValueError(f"Unknown content dictionary {dictionary_id}")
+        dictionary = _content_dictionaries[key] = bytes(row[0])
+    return dictionary
+
+def _active_dictionary_id(db_path):
+    """Return the newest dictionary id of a database (0 if none), cached per process."""
+    dictionary_id = _active_content_dictionary.get(db_path)
+    if dictionary_id is None:
+        conn = sqlite3.connect(db_path, timeout=DB_BUSY_TIMEOUT_MS / 1000)
+        try:
+            row = conn.execute("SELECT MAX(id) FROM content_dictionaries").fetchone()
+        except sqlite3.OperationalError:
+            row = None  # table not created yet
+        finally:
+            conn.close()
+        dictionary_id = _active_content_dictionary[db_path] = (row[0] if row and row[0] else 0)
+    return dictionary_id
+
+def compress_content(text, db_path=None):
+    """
+    Encode article content for storage.
+    Bodies of at least CONTENT_COMPRESS_MIN_BYTES are zlib-compressed with the
+    active preset dictionary; shorter bodies, bodies that do not shrink and all
+    bodies when CONTENT_COMPRESSION=none are kept as plain text.
+    Returns the value to store (str or bytes).
+    """
+    if CONTENT_COMPRESSION != 'zlib' or not text or not isinstance(text, str):
+        return text
+    data = text.encode('utf-8')
+    if len(data) < CONTENT_COMPRESS_MIN_BYTES:
+        return text
+    db_path = db_path or DB_PATH
+    dictionary_id = _active_dictionary_id(db_path)
+    if dictionary_id:
+        compressor = zlib.compressobj(
+            CONTENT_COMPRESSION_LEVEL, zdict=_content_dictionary(db_path, dictionary_id)
+        )
+    else:
+        compressor = zlib.compressobj(CONTENT_COMPRESSION_LEVEL)
+    blob = _CONTENT_HEADER.pack(dictionary_id, len(data)) + compressor.compress(data) + compressor.flush()
+    return blob if len(blob) < len(data) else text
+
+def decompress_content(value, db_path=None):
+    """Decode a stored content value (plain text or compressed BLOB) back to text."""
+    if not isinstance(value, bytes):
+        return value
+    dictionary_id, _ = _CONTENT_HEADER.unpack_from(value)
+    if dictionary_id:
+        decompressor = zlib.decompressobj(zdict=_content_dictionary(db_path or DB_PATH, dictionary_id))
+    else:
+        decompressor = zlib.decompressobj()
+    data = decompressor.decompress(value[_CONTENT_HEADER.size:]) + decompressor.flush()
+    return data.decode('utf-8')
+
+def content_size(value):
+    """Return the uncompressed UTF-8 size of a stored content value without decompressing it."""
+    if value is None:
+        return None
+    if isinstance(value, bytes):
+        return _CONTENT_HEADER.unpack_from(value)[1]
+    return len(str(value).encode('utf-8'))
+
+def encode_content(text):
+    """
+    Encode article content for storage (see compress_content).
+    Returns (value to store, content_bytes): content_bytes is the uncompressed
+    size of a compressed value, for the plain-SQL statistics triggers, and
+    None for plain text.
+    """
+    value = compress_content(text)
+    return value, (content_size(value) if isinstance(value, bytes) else None)
+
+def article_dict(row):
+    """Convert an articles row to a dictionary, decompressing content only if it was selected."""
+    article = dict(row)
+    if 'content' in article:
+        article['content'] = decompress_content(article['content'])
+    return article
+
+def train_content_dictionary(conn):
+    """
+    Train a zlib preset dictionary from a sample of stored article bodies.
+    The dictionary is the most frequent three-word phrases of the sample, most
+    frequent last (closest to the data, so references to them are shortest).
+    It is stored and used for new writes from then on.
+    Returns the new dictionary id, or None if the sample has no repeated phrases.
+    """
+    rows = conn.execute("""
+        SELECT content FROM articles WHERE COALESCE(content, '') != ''
+        ORDER BY random() LIMIT ?
+    """, (CONTENT_DICT_SAMPLE_SIZE,)).fetchall()
+    phrase_counts = Counter()
+    for row in rows:
+        words = decompress_content(row['content']).split()
+        phrase_counts.update(' '.join(words[i:i + 3]) for i in range(len(words) - 2))
+    
+    phrases = []
+    size = 0
+    for phrase, count in phrase_counts.most_common():
+        if count < 2:
+            break
+        phrase_size = len(phrase.encode('utf-8')) + 1
+        if size + phrase_size > CONTENT_DICT_MAX_BYTES:
+            continue
+        phrases.append(phrase)
+        size += phrase_size
+    if not phrases:
+        return None
+    
+    dictionary = ' '.join(reversed(phrases)).encode('utf-8')
+    cur = conn.execute(
+        "INSERT INTO content_dictionaries (dictionary, sample_size) VALUES (?, ?)",
+        (dictionary, len(rows))
+    )
+    dictionary_id = cur.lastrowid
+    conn.commit()
+    _content_dictionaries[(DB_PATH, dictionary_id)] = dictionary
+    _active_content_dictionary[DB_PATH] = dictionary_id
+    return dictionary_id
+
+def init_content_compression(conn):
+    """
+    Create the content_dictionaries table, train the preset dictionary once
+    CONTENT_DICT_MIN_ARTICLES articles have content, and compress article
+    bodies that are still stored as plain text.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS content_dictionaries (
+            id INTEGER PRIMARY KEY CHECK (id BETWEEN 1 AND 255),
+            dictionary BLOB NOT NULL,
+            sample_size INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.commit()
+    _active_content_dictionary.pop(DB_PATH, None)
+    if CONTENT_COMPRESSION != 'zlib':
+        return
+    
+    if not _active_dictionary_id(DB_PATH):
+        row = conn.execute("SELECT articles_with_content FROM article_stats WHERE id = 1").fetchone()
+        if row['articles_with_content'] >= CONTENT_DICT_MIN_ARTICLES:
+            train_content_dictionary(conn)
+    
+    compressed = 0
+    last_id = 0
+    while True:
+        rows = conn.execute("""
+            SELECT id, content FROM articles
+            WHERE id > ? AND typeof(content) = 'text' AND length(CAST(content AS BLOB)) >= ?
+            ORDER BY id LIMIT ?
+        """, (last_id, CONTENT_COMPRESS_MIN_BYTES, STORE_CHUNK_SIZE)).fetchall()
+        if not rows:
+            break
+        updates = []
+        for row in rows:
+            value, size = encode_content(row['content'])
+            if isinstance(value, bytes):
+                updates.append((value, size, row['id']))
+        conn.executemany("UPDATE articles SET content = ?, content_bytes = ? WHERE id = ?", updates)
+        conn.commit()
+        compressed += len(updates)
+        last_id = rows[-1]['id']
+    if compressed:
+        print(f"Compressed {compressed} stored article bodies.")
+
+# ==================== CONTENT FINGERPRINTS ====================
+
+_WORD_PATTERN = re.compile(r'\w+')
+_SIMHASH_BAND_BITS = 64 // SIMHASH_BANDS
+_SIMHASH_BAND_MASK = (1 << _SIMHASH_BAND_BITS) - 1
+_BYTE_BITS = [[bit for bit in range(8) if byte >> bit & 1] for byte in range(256)]
+
+def simhash(words):
+    """
+    Compute the 64-bit SimHash of a word list, using its SIMHASH_SHINGLE_WORDS-word
+    shingles weighted by frequency as features.
+    With numpy the per-bit weights are one matrix product over the unpacked
+    feature hashes; without it, weights are accumulated per hash byte value
+    (8 table updates per feature instead of 64 bit tests) and only then
+    spread over the bits. Both give the same fingerprint.
+    Returns the fingerprint as a signed 64-bit integer, as SQLite stores it.
+    """
+    features = Counter(map(' '.join, zip(*(words[i:] for i in range(SIMHASH_SHINGLE_WORDS)))))
+    total = sum(features.values())
+    blake2b = hashlib.blake2b
+    digests = [blake2b(feature.encode('utf-8'), digest_size=8).digest() for feature in features]
+    
+    if np is not None:
+        # Row per feature, column c is bit 63 - c of its big-endian hash
+        bits = np.unpackbits(np.frombuffer(b''.join(digests), dtype=np.uint8).reshape(-1, 8), axis=1)
+        weights = np.fromiter(features.values(), dtype=np.int64, count=len(features))
+        # Set the bits where the features with the bit set outweigh those without
+        value = int.from_bytes(np.packbits(2 * (weights @ bits) > total).tobytes(), 'big')
+        return value - (1 << 64) if value >= 1 << 63 else value
+    
+    byte_weights = [[0] * 256 for _ in range(8)]
+    for digest, weight in zip(digests, features.values()):
+        for index in range(8):
+            byte_weights[index][digest[index]] += weight
+    
+    value = 0
+    for index, weights in enumerate(byte_weights):
+        bit_weights = [0] * 8
+        for byte, weight in enumerate(weights):
+            if weight:
+                for bit in _BYTE_BITS[byte]:
+                    bit_weights[bit] += weight
+        shift = (7 - index) * 8
+        for bit, weight in enumerate(bit_weights):
+            # Set the bit when the features with it set outweigh those without
+            if 2 * weight > total:
+                value |= 1 << (shift + bit)
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+def simhash_bands(value):
+    """Split a SimHash into its SIMHASH_BANDS band values (the LSH keys)."""
+    return [(value >> (band * _SIMHASH_BAND_BITS)) & _SIMHASH_BAND_MASK for band in range(SIMHASH_BANDS)]
+
+def hamming_distance(first, second):
+    return bin((first ^ second) & 0xFFFFFFFFFFFFFFFF).count('1')
+
+def content_fingerprint(content):
+    """
+    Fingerprint article content for duplicate detection.
+    `content_hash` is the SHA-256 of the whitespace-normalised text and catches
+    exact copies; `simhash` catches near copies and is None for bodies shorter
+    than SIMHASH_MIN_WORDS words, whose SimHash is too unstable to compare.
+    Returns (content_hash, simhash); both are None for empty content.
+    """
+    normalized = ' '.join(str(content).split()) if content else ''
+    if not normalized:
+        return None, None
+    content_hash = hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+    words = _WORD_PATTERN.findall(normalized.lower())
+    if len(words) < SIMHASH_MIN_WORDS:
+        return content_hash, None
+    return content_hash, simhash(words)
+
+def find_near_duplicate(conn, article_id, fingerprint):
+    """
+    Find an older article whose SimHash is within NEAR_DUPLICATE_MAX_DISTANCE bits.
+    Candidates come from the banded index (articles sharing at least one band),
+    so the lookup does not scan the table.
+    Returns the id of the oldest match (or of the article it duplicates), or None.
+    """
+    bands = simhash_bands(fingerprint)
+    conditions = ' OR '.join('(b.band = ? AND b.value = ?)' for _ in bands)
+    params = [value for pair in enumerate(bands) for value in pair]
+    rows = conn.execute(f"""
+        SELECT DISTINCT a.id, a.simhash, a.duplicate_of
+        FROM article_simhash_bands b
+        JOIN articles a ON a.id = b.article_id
+        WHERE ({conditions}) AND b.article_id < ?
+        ORDER BY a.id
+    """, params + [article_id]).fetchall()
+    for row in rows:
+        if hamming_distance(row['simhash'], fingerprint) <= NEAR_DUPLICATE_MAX_DISTANCE:
+            return row['duplicate_of'] or row['id']
+    return None
+
+def mark_near_duplicates(conn, article_ids):
+    """
+    Set (or clear) duplicate_of on the given articles from their current SimHash.
+    Articles flagged as duplicates of them are re-checked too, since a content
+    change can break (or move) their match.
+    Returns the number of the given articles flagged as near-duplicates.
+    """
+    if not article_ids:
+        return 0
+    article_ids = list(article_ids)
+    placeholders = ', '.join('?' * len(article_ids))
+    rows = conn.execute(f"""
+        SELECT id, simhash, duplicate_of FROM articles WHERE id IN ({placeholders}) ORDER BY id
+    """, article_ids).fetchall()
+    flagged = _update_duplicate_flags(conn, rows)
+    
+    dependents = conn.execute(f"""
+        SELECT id, simhash, duplicate_of FROM articles
+        WHERE duplicate_of IN ({placeholders}) AND id NOT IN ({placeholders})
+        ORDER BY id
+    """, article_ids + article_ids).fetchall()
+    _update_duplicate_flags(conn, dependents)
+    return flagged
+
+def _update_duplicate_flags(conn, rows):
+    """
+    Recompute duplicate_of for articles rows (id, simhash, duplicate_of) in id order.
+    Returns the number of rows flagged as near-duplicates.
     """
+    flagged = 0
+    for row in rows:
+        duplicate_of = None
+        if row['simhash'] is not None:
+            duplicate_of = find_near_duplicate(conn, row['id'], row['simhash'])
+        flagged += duplicate_of is not None
+        if duplicate_of != row['duplicate_of']:
+            conn.execute("UPDATE articles SET duplicate_of = ? WHERE id = ?", (duplicate_of, row['id']))
+    return flagged
+
+def init_fingerprints(conn):
+    """
+    Add the content_hash/simhash/duplicate_of columns, the banded SimHash index
+    and the triggers that maintain it. Rows stored before fingerprinting
+    existed are fingerprinted after startup (see start_fingerprint_backfill).
+    """
+    columns = {row['name'] for row in conn.execute("PRAGMA table_info(articles)")}
+    for name, definition in (('content_hash', 'TEXT'), ('simhash', 'INTEGER'),
+                             ('duplicate_of', 'INTEGER')):
+        if name not in columns:
+            conn.execute(f"ALTER TABLE articles ADD COLUMN {name} {definition}")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_content_hash ON articles (content_hash)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_duplicate_of ON articles (duplicate_of)")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS article_simhash_bands (
+            band INTEGER NOT NULL,
+            value INTEGER NOT NULL,
+            article_id INTEGER NOT NULL,
+            PRIMARY KEY (band, value, article_id)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_article_simhash_bands_article ON article_simhash_bands (article_id)")
+    
+    band_numbers = ' UNION ALL '.join(f"SELECT {band} AS band" for band in range(SIMHASH_BANDS))
+    add_bands = f"""
+        INSERT INTO article_simhash_bands (band, value, article_id)
+        SELECT band, (new.simhash >> (band * {_SIMHASH_BAND_BITS})) & {_SIMHASH_BAND_MASK}, new.id
+        FROM ({band_numbers})
+        WHERE new.simhash IS NOT NULL;
+    """
+    for name in ('articles_simhash_insert', 'articles_simhash_update', 'articles_simhash_delete'):
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+    conn.execute(f"""
+        CREATE TRIGGER articles_simhash_insert AFTER INSERT ON articles BEGIN
+            {add_bands}
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER articles_simhash_update AFTER UPDATE OF simhash ON articles
+        WHEN new.simhash IS NOT old.simhash BEGIN
+            DELETE FROM article_simhash_bands WHERE article_id = old.id;
+            {add_bands}
+        END
+    """)
+    # Duplicates of a deleted article lose their flag rather than point nowhere
+    conn.execute("""
+        CREATE TRIGGER articles_simhash_delete AFTER DELETE ON articles BEGIN
+            DELETE FROM article_simhash_bands WHERE article_id = old.id;
+            UPDATE articles SET duplicate_of = NULL WHERE duplicate_of = old.id;
+        END
+    """)
+    conn.commit()
+
+def backfill_fingerprints(conn, after_id=0, batch_size=FINGERPRINT_BACKFILL_BATCH):
+    """
+    Fingerprint the next `batch_size` rows after `after_id` that have content
+    but no hash yet (rows stored before fingerprinting existed) and flag their
+    near-duplicates. Fingerprints are computed before the write transaction
+    starts, so the write lock is only held for the updates. A row whose
+    content changed in the meantime is left to the writer that changed it.
+    Returns (rows fingerprinted, id of the last row), or (0, None) when none are left.
+    """
+    rows = conn.execute("""
+        SELECT id, content FROM articles
+        WHERE id > ? AND content_hash IS NULL AND COALESCE(content, '') != ''
+        ORDER BY id LIMIT ?
+    """, (after_id, batch_size)).fetchall()
+    if not rows:
+        return 0, None
+    fingerprints = [content_fingerprint(decompress_content(row['content'])) for row in rows]
+    try:
+        conn.executemany("""
+            UPDATE articles SET content_hash = ?, simhash = ?
+            WHERE id = ? AND content_hash IS NULL AND content IS ?
+        """, [fingerprint + (row['id'], row['content']) for fingerprint, row in zip(fingerprints, rows)])
+        mark_near_duplicates(conn, [row['id'] for row in rows])
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return len(rows), rows[-1]['id']
+
+def _run_fingerprint_backfill():
+    """Background loop fingerprinting old rows in bounded batches until none are left."""
+    fingerprinted = 0
+    last_id = 0
+    conn = get_db_connection()
     try:
-        # Start from page 1 to understand pagination structure
-        page = 1
-        last_page = 1
-        
         while True:
-            url = f"{base_url}?page={page}" if page > 1 else base_url
-            response = requests.get(url, timeout=10, headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            })
-            
-            if response.status_code != 200:
-                break
-                
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Look for pagination links - common patterns
-            pagination_links = soup.find_all('a', href=True)
-            page_numbers = []
-            
-            for link in pagination_links:
-                href = link.get('href', '')
-                # Check for page numbers in href or text
-                if 'page=' in href or link.text.strip().isdigit():
-                    # Extract page number
-                    page_match = re.search(r'page=(\d+)', href)
-                    if page_match:
-                        page_numbers.append(int(page_match.group(1)))
-                    elif link.text.strip().isdigit():
-                        page_numbers.append(int(link.text.strip()))
-            
-            # Also check for pagination divs/classes
-            pagination_divs = soup.find_all(['div', 'nav', 'ul'], class_=re.compile(r'pagination|page', re.I))
-            for div in pagination_divs:
-                links = div.find_all('a', href=True)
-                for link in links:
-                    href = link.get('href', '')
-                    page_match = re.search(r'page=(\d+)', href)
-                    if page_match:
-                        page_numbers.append(int(page_match.group(1)))
-                    elif link.text.strip().isdigit():
-                        page_numbers.append(int(link.text.strip()))
-            
-            if page_numbers:
-                potential_last = max(page_numbers)
-                if potential_last > last_page:
-                    last_page = potential_last
-                else:
-                    break
-            else:
-                # If no pagination found, check if current page has articles
-                articles = soup.find_all(['article', 'div'], class_=re.compile(r'article|blog|post', re.I))
-                if not articles:
-                    break
-            
-            # Safety limit to avoid infinite loops
-            if page > 100:
+            count, last_id = backfill_fingerprints(conn, last_id)
+            if last_id is None:
                 break
-                
-            page += 1
-        
-        return max(1, last_page)
+            fingerprinted += count
+            # Let API writers in between batches
+            time.sleep(FINGERPRINT_BACKFILL_PAUSE_SECONDS)
     except Exception as e:
-        print(f"Error finding last page: {e}")
-        return 1
+        print(f"Fingerprint backfill failed: {e}")
+    finally:
+        conn.close()
+    if fingerprinted:
+        print(f"Fingerprinted {fingerprinted} stored articles.")
 
-def scrape_article_details(article_url):
+def start_fingerprint_backfill():
     """
-    Scrape detailed content from an individual article page.
-    Returns a dictionary with article details.
+    Fingerprint rows stored before fingerprinting existed in a background
+    thread, so startup does not wait for them. Until a row is fingerprinted it
+    is neither flagged as a near-duplicate nor matched by new articles.
+    """
+    threading.Thread(target=_run_fingerprint_backfill, name='fingerprint-backfill', daemon=True).start()
+
+# ==================== PUBLISHED DATES ====================
+
+_ORDINAL_SUFFIX = re.compile(r'(?<=\d)(st|nd|rd|th)\b', re.I)
+
+def parse_published_date(text):
+    """
+    Parse a scraped published_date (a datetime attribute or free text such as
+    "April 8, 2025") into Unix epoch seconds. Dates without a time zone are
+    taken as UTC.
+    Returns the epoch as an int, or None if the text is not a recognised date.
     """
+    if not text or not isinstance(text, str):
+        return None
+    text = ' '.join(_ORDINAL_SUFFIX.sub('', text).split())
     try:
-        response = requests.get(article_url, timeout=10, headers={
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
-        
-        if response.status_code != 200:
-            return None
-            
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Extract title
-        title = ""
-        title_tag = soup.find('h1') or soup.find('title')
-        if title_tag:
-            title = title_tag.get_text(strip=True)
-        
-        # Extract content - try multiple common selectors
-        content = ""
-        content_selectors = [
-            {'class': re.compile(r'content|post-content|article-content|entry-content', re.I)},
-            {'class': re.compile(r'post-body|article-body', re.I)},
-            {'id': re.compile(r'content|post-content|article-content', re.I)},
-        ]
-        
-        for selector in content_selectors:
-            content_div = soup.find('div', selector)
-            if content_div:
-                # Get all paragraphs
-                paragraphs = content_div.find_all('p')
-                content = ' '.join([p.get_text(strip=True) for p in paragraphs])
-                if content:
-                    break
-        
-        # If no content found, try main/article tag
-        if not content:
-            main_tag = soup.find('main') or soup.find('article')
-            if main_tag:
-                paragraphs = main_tag.find_all('p')
-                content = ' '.join([p.get_text(strip=True) for p in paragraphs])
-        
-        # Extract author
-        author = ""
-        author_selectors = [
-            {'class': re.compile(r'author|byline|writer', re.I)},
-            {'itemprop': 'author'},
-        ]
-        for selector in author_selectors:
-            author_tag = soup.find(['span', 'div', 'a'], selector)
-            if author_tag:
-                author = author_tag.get_text(strip=True)
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        parsed = None
+        for date_format in PUBLISHED_DATE_FORMATS:
+            try:
+                parsed = datetime.strptime(text, date_format)
                 break
-        
-        # Extract published date
-        published_date = ""
-        date_selectors = [
-            {'class': re.compile(r'date|published|time', re.I)},
-            {'itemprop': 'datePublished'},
-            {'datetime': True},
-        ]
-        for selector in date_selectors:
-            date_tag = soup.find(['time', 'span', 'div'], selector)
-            if date_tag:
-                published_date = date_tag.get('datetime') or date_tag.get_text(strip=True)
-                if published_date:
-                    break
-        
-        return {
-            'title': title,
-            'content': content,
-            'author': author,
-            'published_date': published_date
-        }
-    except Exception as e:
-        print(f"Error scraping article {article_url}: {e}")
+            except ValueError:
+                continue
+    if parsed is None:
         return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+def init_published_dates(conn):
+    """
+    Add the published_epoch column (published_date parsed at ingest) and the
+    indexes behind the sorted and filtered article listings. The column is
+    backfilled once, when it is added.
+    """
+    columns = {row['name'] for row in conn.execute("PRAGMA table_info(articles)")}
+    if 'published_epoch' not in columns:
+        conn.execute("ALTER TABLE articles ADD COLUMN published_epoch INTEGER")
+        rows = conn.execute("""
+            SELECT id, published_date FROM articles WHERE COALESCE(published_date, '') != ''
+        """).fetchall()
+        updates = [(parse_published_date(row['published_date']), row['id']) for row in rows]
+        conn.executemany("UPDATE articles SET published_epoch = ? WHERE id = ?",
+                         [update for update in updates if update[0] is not None])
+        if rows:
+            print(f"Parsed published dates of {sum(1 for update in updates if update[0] is not None)}"
+                  f"/{len(rows)} stored articles.")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_published_epoch ON articles (published_epoch)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_author ON articles (author)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_author_published ON articles (author, published_epoch)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_scraped_at ON articles (scraped_at)")
+    conn.commit()
+
+# ==================== METRICS ====================
+
+# (type, help) of every metric, keyed by name without METRICS_PREFIX
+METRIC_DEFINITIONS = {
+    'http_requests_total': ('counter', 'HTTP responses by route, method and status code.'),
+    'http_request_duration_seconds': ('histogram', 'HTTP request latency by route and method.'),
+    'scrape_stage_duration_seconds': ('histogram', 'Time spent per scraper stage (fetch, parse, extract, store).'),
+    'scrape_fetch_responses_total': ('counter', 'Scraper HTTP responses by status code.'),
+    'scrape_fetch_errors_total': ('counter', 'Scraper fetches that raised, by exception type.'),
+    'scrape_runs_total': ('counter', 'Finished scrape jobs by mode and status.'),
+    'scrape_run_duration_seconds': ('histogram', 'Wall time of scrape jobs by mode.'),
+}
+
+class _Timer:
+    """Context manager that observes its wall time into a histogram."""
+    
+    __slots__ = ('metrics', 'name', 'labels', 'start')
+    
+    def __init__(self, metrics, name, labels):
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.metrics.observe(self.name, time.perf_counter() - self.start, **self.labels)
+        return False
+
+class _NullTimer:
+    """Timer used while metrics are disabled."""
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        return False
+
+_NULL_TIMER = _NullTimer()
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape_label(value)}"' for name, value in labels) + '}'
+
+class Metrics:
+    """
+    Thread-safe in-process registry of labelled counters and histograms,
+    rendered in the Prometheus text exposition format.
+    Every method returns immediately when the registry is disabled.
+    """
+    
+    def __init__(self, enabled=True, buckets=METRICS_LATENCY_BUCKETS):
+        self.enabled = enabled
+        self.buckets = buckets
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+    
+    def inc(self, name, amount=1, **labels):
+        """Add `amount` to a counter."""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+    
+    def observe(self, name, seconds, **labels):
+        """Record one observation in a histogram."""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                # [per-bucket counts (last one is +Inf), sum, count]
+                histogram = self._histograms[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    break
+            else:
+                index = len(self.buckets)
+            histogram[0][index] += 1
+            histogram[1] += seconds
+            histogram[2] += 1
+    
+    def timer(self, name, **labels):
+        """Return a context manager that times its block into histogram `name`."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name, labels)
+    
+    def histogram_totals(self, name, label):
+        """
+        Sum a histogram's observations grouped by one label.
+        Returns {label value: {'count', 'seconds'}}.
+        """
+        totals = {}
+        with self._lock:
+            for (metric, labels), (_, seconds, count) in self._histograms.items():
+                if metric != name:
+                    continue
+                value = dict(labels).get(label, '')
+                entry = totals.setdefault(value, {'count': 0, 'seconds': 0.0})
+                entry['count'] += count
+                entry['seconds'] += seconds
+        return totals
+    
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+    
+    def render(self):
+        """
+        Render every metric in the Prometheus text format (version 0.0.4).
+        Returns the exposition as a string.
+        """
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(
+                (key, (list(buckets), seconds, count))
+                for key, (buckets, seconds, count) in self._histograms.items()
+            )
+        
+        series = {}
+        for (name, labels), value in counters:
+            series.setdefault(name, []).append(f"{METRICS_PREFIX}{name}{_format_labels(labels)} {value}")
+        for (name, labels), (buckets, seconds, count) in histograms:
+            lines = series.setdefault(name, [])
+            cumulative = 0
+            bounds = [repr(float(bound)) for bound in self.buckets] + ['+Inf']
+            for bound, bucket_count in zip(bounds, buckets):
+                cumulative += bucket_count
+                lines.append(
+                    f"{METRICS_PREFIX}{name}_bucket{_format_labels(labels + (('le', bound),))} {cumulative}"
+                )
+            lines.append(f"{METRICS_PREFIX}{name}_sum{_format_labels(labels)} {seconds}")
+            lines.append(f"{METRICS_PREFIX}{name}_count{_format_labels(labels)} {count}")
+        
+        output = []
+        for name in sorted(series):
+            metric_type, help_text = METRIC_DEFINITIONS.get(name, ('untyped', name))
+            output.append(f"# HELP {METRICS_PREFIX}{name} {help_text}")
+            output.append(f"# TYPE {METRICS_PREFIX}{name} {metric_type}")
+            output.extend(series[name])
+        return '\n'.join(output) + '\n'
+
+metrics = Metrics(enabled=METRICS_ENABLED)
+
+@app.before_request
+def start_request_timer():
+    if metrics.enabled:
+        g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    """Count every response and record its latency under the matched route pattern."""
+    started = g.get('request_started')
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        metrics.observe('http_request_duration_seconds', time.perf_counter() - started,
+                        route=route, method=request.method)
+        metrics.inc('http_requests_total', route=route, method=request.method,
+                    status=response.status_code)
+    return response
+
+# ==================== HTTP FETCH LAYER ====================
+
+# Result of fetch_page(). `not_modified` is True when the server answered 304
+# and `content` was served from the on-disk cache.
+FetchedPage = namedtuple('FetchedPage', ['url', 'status_code', 'content', 'not_modified'])
+
+_http_session = None
+_http_session_lock = threading.Lock()
+_http_cache_initialized = set()  # cache paths whose tables exist
+_http_cache_lock = threading.Lock()
+
+def get_http_session():
+    """
+    Return the shared requests Session used by the scraper.
+    Connections are pooled and kept alive, and failed requests are retried with backoff.
+    """
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            # Scraping dependencies are loaded on first use so API-only processes start fast
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+            
+            retry = Retry(
+                total=SCRAPE_MAX_RETRIES,
+                backoff_factor=SCRAPE_RETRY_BACKOFF,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=['GET', 'HEAD']
+            )
+            adapter = HTTPAdapter(
+                pool_connections=SCRAPE_MAX_WORKERS,
+                pool_maxsize=SCRAPE_MAX_WORKERS,
+                max_retries=retry
+            )
+            session = requests.Session()
+            session.headers.update({'User-Agent': SCRAPE_USER_AGENT})
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _http_session = session
+        return _http_session
+
+def get_http_cache_connection():
+    """
+    Create and return a connection to the on-disk HTTP cache (WAL mode, so
+    the scraper threads do not block each other's reads).
+    """
+    conn = sqlite3.connect(HTTP_CACHE_PATH, timeout=30, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    if HTTP_CACHE_PATH not in _http_cache_initialized:
+        with _http_cache_lock:
+            if HTTP_CACHE_PATH not in _http_cache_initialized:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS http_cache (
+                        url TEXT PRIMARY KEY,
+                        etag TEXT,
+                        last_modified TEXT,
+                        body BLOB,
+                        details TEXT,
+                        fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS last_page_cache (
+                        base_url TEXT PRIMARY KEY,
+                        last_page INTEGER NOT NULL,
+                        discovered_at REAL NOT NULL
+                    )
+                """)
+                conn.commit()
+                _http_cache_initialized.add(HTTP_CACHE_PATH)
+    return conn
+
+def _http_cache_pool():
+    """Pool of HTTP cache connections shared by the scraper threads of this process."""
+    return _get_pool('http_cache', get_http_cache_connection, HTTP_CACHE_PATH)
+
+def _load_cached_response(url):
+    """Return the cached http_cache row for a URL, or None."""
+    pool = _http_cache_pool()
+    conn = pool.acquire()
+    try:
+        return conn.execute("SELECT * FROM http_cache WHERE url = ?", (url,)).fetchone()
+    finally:
+        pool.release(conn)
+
+def _store_cached_response(url, etag, last_modified, body):
+    """
+    Store the validators of a fresh response, with its body unless the page
+    snapshot store keeps it (body None); any cached parse result is discarded.
+    """
+    pool = _http_cache_pool()
+    conn = pool.acquire()
+    try:
+        conn.execute("""
+            INSERT OR REPLACE INTO http_cache (url, etag, last_modified, body, details, fetched_at)
+            VALUES (?, ?, ?, ?, NULL, CURRENT_TIMESTAMP)
+        """, (url, etag, last_modified, body))
+        conn.commit()
+    finally:
+        pool.release(conn)
+
+def _drop_cached_body(url):
+    """Forget the cached body of a URL whose page snapshot now keeps it."""
+    pool = _http_cache_pool()
+    conn = pool.acquire()
+    try:
+        conn.execute("UPDATE http_cache SET body = NULL WHERE url = ?", (url,))
+        conn.commit()
+    finally:
+        pool.release(conn)
+
+def load_cached_details(url):
+    """Return the cached scrape_article_details() result for a URL, or None."""
+    row = _load_cached_response(url)
+    if row and row['details']:
+        return json.loads(row['details'])
+    return None
+
+def store_cached_details(url, details):
+    """Remember the parsed details for a cached URL so a 304 needs no re-parse."""
+    pool = _http_cache_pool()
+    conn = pool.acquire()
+    try:
+        conn.execute(
+            "UPDATE http_cache SET details = ? WHERE url = ?",
+            (json.dumps(details), url)
+        )
+        conn.commit()
+    finally:
+        pool.release(conn)
+
+def fetch_page(url, use_cache=True, snapshot=False):
+    """
+    Fetch a page through the shared session.
+    When the URL is cached, the request is sent as a conditional GET
+    (If-None-Match / If-Modified-Since) and a 304 is served from the cache.
+    With `snapshot` (article pages), a fresh body is kept as a page snapshot
+    and the cache row only holds its validators, so the body is stored once;
+    a 304 is then served from the snapshot.
+    Returns a FetchedPage.
+    """
+    cached = _load_cached_response(url) if use_cache else None
+    cached_body = None
+    if cached:
+        cached_body = cached['body'] if cached['body'] is not None else load_page_snapshot(url)
+        if cached_body is None:
+            # Nothing to serve a 304 from (snapshot gone): fetch unconditionally
+            cached = None
+    
+    headers = {}
+    if cached:
+        if cached['etag']:
+            headers['If-None-Match'] = cached['etag']
+        if cached['last_modified']:
+            headers['If-Modified-Since'] = cached['last_modified']
+    
+    try:
+        with metrics.timer('scrape_stage_duration_seconds', stage='fetch'):
+            response = get_http_session().get(url, timeout=SCRAPE_TIMEOUT, headers=headers)
+    except Exception as e:
+        metrics.inc('scrape_fetch_errors_total', error=type(e).__name__)
+        raise
+    metrics.inc('scrape_fetch_responses_total', status=response.status_code)
+    
+    if response.status_code == 304 and cached:
+        # Rows cached with their body (before snapshots, or with snapshots off) hand it over
+        if snapshot and cached['body'] is not None and store_page_snapshot(url, cached_body):
+            _drop_cached_body(url)
+        return FetchedPage(url, 200, cached_body, True)
+    
+    if response.status_code == 200:
+        snapshotted = snapshot and store_page_snapshot(url, response.content)
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if use_cache and (etag or last_modified):
+            _store_cached_response(url, etag, last_modified, None if snapshotted else response.content)
+    
+    return FetchedPage(url, response.status_code, response.content, False)
+
+# ==================== PAGE SNAPSHOTS ====================
+
+_snapshot_initialized = set()  # snapshot paths whose table exists
+_snapshot_lock = threading.Lock()
+
+def get_snapshot_connection():
+    """Create and return a connection to the page snapshot store (WAL mode)."""
+    conn = sqlite3.connect(SNAPSHOT_PATH, timeout=30, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    if SNAPSHOT_PATH not in _snapshot_initialized:
+        with _snapshot_lock:
+            if SNAPSHOT_PATH not in _snapshot_initialized:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS page_snapshots (
+                        url TEXT PRIMARY KEY,
+                        body BLOB NOT NULL,
+                        size INTEGER NOT NULL,
+                        sha256 TEXT NOT NULL,
+                        captured_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+                conn.commit()
+                _snapshot_initialized.add(SNAPSHOT_PATH)
+    return conn
+
+def _snapshot_pool():
+    """Pool of snapshot store connections shared by the scraper threads of this process."""
+    return _get_pool('snapshots', get_snapshot_connection, SNAPSHOT_PATH)
+
+def store_page_snapshot(url, body):
+    """
+    Keep a compressed copy of a fetched article page.
+    A snapshot is only rewritten when the page bytes changed.
+    Returns True when the snapshot store holds `body` for the URL (False
+    with PAGE_SNAPSHOTS=false or an empty body).
+    """
+    if not PAGE_SNAPSHOTS_ENABLED or not body:
+        return False
+    pool = _snapshot_pool()
+    conn = pool.acquire()
+    try:
+        conn.execute("""
+            INSERT INTO page_snapshots (url, body, size, sha256) VALUES (?, ?, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET
+                body = excluded.body,
+                size = excluded.size,
+                sha256 = excluded.sha256,
+                captured_at = CURRENT_TIMESTAMP
+            WHERE page_snapshots.sha256 != excluded.sha256
+        """, (url, zlib.compress(body, SNAPSHOT_COMPRESSION_LEVEL), len(body), hashlib.sha256(body).hexdigest()))
+        conn.commit()
+    finally:
+        pool.release(conn)
+    return True
+
+def load_page_snapshot(url):
+    """Return the raw page bytes of the snapshot of a URL, or None."""
+    pool = _snapshot_pool()
+    conn = pool.acquire()
+    try:
+        row = conn.execute("SELECT body FROM page_snapshots WHERE url = ?", (url,)).fetchone()
+    finally:
+        pool.release(conn)
+    return decompress_snapshot(row['body']) if row else None
+
+def decompress_snapshot(body):
+    """Return the raw page bytes of a stored snapshot."""
+    return zlib.decompress(body)
+
+def clear_cached_details():
+    """
+    Forget every cached parse result, so pages answered with 304 are
+    extracted again (after the extraction rules changed).
+    """
+    pool = _http_cache_pool()
+    conn = pool.acquire()
+    try:
+        conn.execute("UPDATE http_cache SET details = NULL WHERE details IS NOT NULL")
+        conn.commit()
+    finally:
+        pool.release(conn)
+
+# ==================== SCRAPER ====================
+
+def listing_page_url(base_url, page):
+    """Return the URL of a listing page (page 1 is the bare base URL)."""
+    return f"{base_url}?page={page}" if page > 1 else base_url
+
+def listing_page_exists(base_url, page):
+    """
+    Probe a listing page.
+    A page exists when it returns 200 and contains at least one article element.
+    """
+    response = fetch_page(listing_page_url(base_url, page))
+    if response.status_code != 200:
+        return False
+    from extractor import parse_html, has_listing_articles
+    return has_listing_articles(parse_html(response.content))
+
+def _load_cached_last_page(base_url):
+    """Return the cached last page for a base URL if it is younger than the TTL."""
+    pool = _http_cache_pool()
+    conn = pool.acquire()
+    try:
+        row = conn.execute(
+            "SELECT last_page, discovered_at FROM last_page_cache WHERE base_url = ?",
+            (base_url,)
+        ).fetchone()
+    finally:
+        pool.release(conn)
+    if row and time.time() - row['discovered_at'] < LAST_PAGE_CACHE_TTL:
+        return row['last_page']
+    return None
+
+def _store_cached_last_page(base_url, last_page):
+    """Remember the discovered last page for a base URL."""
+    pool = _http_cache_pool()
+    conn = pool.acquire()
+    try:
+        conn.execute("""
+            INSERT OR REPLACE INTO last_page_cache (base_url, last_page, discovered_at)
+            VALUES (?, ?, ?)
+        """, (base_url, last_page, time.time()))
+        conn.commit()
+    finally:
+        pool.release(conn)
+
+def find_last_page(base_url, refresh=False):
+    """
+    Find the last page number of a paginated listing.
+    Probes ?page=N exponentially (1, 2, 4, 8, ...) until a page is missing,
+    then binary-searches the gap, so only O(log P) pages are fetched.
+    The result is cached for LAST_PAGE_CACHE_TTL seconds unless `refresh` is set.
+    Returns the last page number.
+    """
+    try:
+        if not refresh:
+            cached_last_page = _load_cached_last_page(base_url)
+            if cached_last_page is not None:
+                return cached_last_page
+        
+        if not listing_page_exists(base_url, 1):
+            return 1
+        
+        # Exponential phase: find a page that does not exist
+        last_existing = 1
+        probe = 2
+        while probe <= MAX_LISTING_PAGES and listing_page_exists(base_url, probe):
+            last_existing = probe
+            probe *= 2
+        
+        if probe > MAX_LISTING_PAGES:
+            # Every probe succeeded; check the remaining range up to the cap
+            probe = MAX_LISTING_PAGES + 1
+        
+        # Binary phase: last_existing exists, probe does not
+        low, high = last_existing, probe
+        while high - low > 1:
+            middle = (low + high) // 2
+            if listing_page_exists(base_url, middle):
+                low = middle
+            else:
+                high = middle
+        
+        _store_cached_last_page(base_url, low)
+        return low
+    except Exception as e:
+        print(f"Error finding last page: {e}")
+        return 1
+
+def scrape_article_details(article_url):
+    """
+    Scrape detailed content from an individual article page.
+    Fetched pages are also kept as snapshots (see fetch_page).
+    Returns a dictionary with article details.
+    """
+    try:
+        response = fetch_page(article_url, snapshot=True)
+        
+        if response.status_code != 200:
+            return None
+        
+        # Unchanged page: reuse the previous parse instead of re-extracting
+        if response.not_modified:
+            cached_details = load_cached_details(article_url)
+            if cached_details is not None:
+                return cached_details
+            
+        from extractor import parse_html, extract_article_details
+        with metrics.timer('scrape_stage_duration_seconds', stage='parse'):
+            root = parse_html(response.content)
+        with metrics.timer('scrape_stage_duration_seconds', stage='extract'):
+            details = extract_article_details(root)
+        store_cached_details(article_url, details)
+        return details
+    except Exception as e:
+        print(f"Error scraping article {article_url}: {e}")
+        return None
+
+def fetch_article_details_concurrently(article_urls, max_workers=None, per_host_limit=None):
+    """
+    Scrape several article pages in parallel on a bounded thread pool.
+    At most `per_host_limit` requests run against the same host at once.
+    Returns a list of detail dictionaries (or None) in the same order as the URLs.
+    """
+    if not article_urls:
+        return []
+    
+    max_workers = max_workers or SCRAPE_MAX_WORKERS
+    per_host_limit = per_host_limit or SCRAPE_PER_HOST_LIMIT
+    
+    host_semaphores = {}
+    for article_url in article_urls:
+        host = urlparse(article_url).netloc
+        if host not in host_semaphores:
+            host_semaphores[host] = threading.BoundedSemaphore(per_host_limit)
+    
+    def fetch(article_url):
+        with host_semaphores[urlparse(article_url).netloc]:
+            return scrape_article_details(article_url)
+    
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(article_urls))) as executor:
+        # executor.map yields results in submission order
+        return list(executor.map(fetch, article_urls))
+
+def fetch_listing_links(url, limit=None):
+    """
+    Fetch a listing page and extract its article links.
+    Returns a list of {'url', 'title'} dictionaries (empty if the page is unavailable).
+    """
+    response = fetch_page(url)
+    
+    if response.status_code != 200:
+        print(f"Failed to fetch page: {response.status_code}")
+        return []
+    
+    from extractor import parse_html, extract_article_links
+    with metrics.timer('scrape_stage_duration_seconds', stage='parse'):
+        root = parse_html(response.content)
+    with metrics.timer('scrape_stage_duration_seconds', stage='extract'):
+        return extract_article_links(root, url, limit=limit)
+
+def build_article(article_link, details):
+    """
+    Combine a listing link with its scraped details into an article dictionary.
+    If details scraping failed, only the basic title/url info is kept.
+    """
+    if details:
+        return {
+            'title': details.get('title') or article_link['title'],
+            'url': article_link['url'],
+            'content': details.get('content', ''),
+            'author': details.get('author', ''),
+            'published_date': details.get('published_date', '')
+        }
+    return {
+        'title': article_link['title'],
+        'url': article_link['url'],
+        'content': '',
+        'author': '',
+        'published_date': ''
+    }
+
+def scrape_articles_from_page(url, limit=5, max_workers=None, per_host_limit=None, job=None):
+    """
+    Scrape articles from a given page URL.
+    Article detail pages are fetched concurrently (see fetch_article_details_concurrently).
+    Progress is reported to `job` when given.
+    Returns a list of article dictionaries in listing order.
+    """
+    try:
+        article_links = fetch_listing_links(url, limit=limit)
+        
+        # Get detailed content for each article
+        selected_links = article_links[:limit]
+        all_details = fetch_article_details_concurrently(
+            [article_link['url'] for article_link in selected_links],
+            max_workers=max_workers,
+            per_host_limit=per_host_limit
+        )
+        if job:
+            job.advance(
+                pages_discovered=1,
+                articles_fetched=sum(1 for details in all_details if details),
+                articles_failed=sum(1 for details in all_details if not details)
+            )
+        return [
+            build_article(article_link, details)
+            for article_link, details in zip(selected_links, all_details)
+        ]
+    except Exception as e:
+        print(f"Error scraping articles from {url}: {e}")
+        return []
+
+ARTICLE_FIELDS = ('title', 'url', 'content', 'author', 'published_date')
+STORE_COUNT_KEYS = ('inserted', 'updated', 'unchanged', 'duplicates')
+
+def store_articles(conn, articles, chunk_size=None, record_checks=True):
+    """
+    Upsert scraped articles in a single transaction.
+    Rows are matched on url, so existing articles keep their id; rows whose
+    fields and content hash did not change are not written at all, and a new
+    url whose content hash matches a stored article is skipped as an exact
+    duplicate. Written articles are checked for near-duplicates (see
+    mark_near_duplicates). Articles are written with executemany in chunks
+    of `chunk_size`.
+    Every article that was already stored counts as a freshness check, changed
+    or not (see record_freshness); pass record_checks=False when the articles
+    were not just fetched from the blog.
+    Returns a dictionary with inserted/updated/unchanged/duplicates counts.
+    """
+    chunk_size = chunk_size or STORE_CHUNK_SIZE
+    counts = dict.fromkeys(STORE_COUNT_KEYS, 0)
+    
+    # Last occurrence wins if the same URL was scraped twice
+    by_url = {}
+    for article in articles:
+        by_url[article['url']] = tuple(article.get(field) or '' for field in ARTICLE_FIELDS)
+    rows = list(by_url.values())
+    
+    cur = conn.cursor()
+    started = time.perf_counter()
+    try:
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            fingerprints = [content_fingerprint(row[2]) for row in chunk]
+            placeholders = ', '.join('?' * len(chunk))
+            # Compare content by hash, so stored bodies never need decompressing here
+            cur.execute(f"""
+                SELECT id, url, title, author, published_date, content_hash
+                FROM articles WHERE url IN ({placeholders})
+            """, [row[1] for row in chunk])
+            stored = cur.fetchall()
+            existing = {
+                row['url']: (row['title'] or '', row['author'] or '', row['published_date'] or '', row['content_hash'])
+                for row in stored
+            }
+            stored_ids = {row['url']: row['id'] for row in stored}
+            hashes = list({content_hash for content_hash, _ in fingerprints if content_hash})
+            cur.execute(f"""
+                SELECT DISTINCT content_hash FROM articles
+                WHERE content_hash IN ({', '.join('?' * len(hashes))})
+            """, hashes)
+            stored_hashes = {row['content_hash'] for row in cur.fetchall()}
+            
+            to_write = []
+            checks = []
+            for row, (content_hash, fingerprint) in zip(chunk, fingerprints):
+                title, url, content, author, published_date = row
+                if url not in existing:
+                    if content_hash in stored_hashes:
+                        counts['duplicates'] += 1
+                        continue
+                    counts['inserted'] += 1
+                elif existing[url] != (title, author, published_date, content_hash):
+                    counts['updated'] += 1
+                    checks.append((stored_ids[url], True))
+                else:
+                    counts['unchanged'] += 1
+                    checks.append((stored_ids[url], False))
+                    continue
+                if content_hash:
+                    stored_hashes.add(content_hash)
+                value, size = encode_content(content)
+                to_write.append((
+                    title, url, value, size, author, published_date,
+                    parse_published_date(published_date), content_hash, fingerprint
+                ))
+            
+            cur.executemany("""
+                INSERT INTO articles (title, url, content, content_bytes, author, published_date,
+                                      published_epoch, content_hash, simhash)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    title = excluded.title,
+                    content = excluded.content,
+                    content_bytes = excluded.content_bytes,
+                    author = excluded.author,
+                    published_date = excluded.published_date,
+                    published_epoch = excluded.published_epoch,
+                    content_hash = excluded.content_hash,
+                    simhash = excluded.simhash,
+                    scraped_at = CURRENT_TIMESTAMP
+            """, to_write)
+            if to_write:
+                cur.execute(f"""
+                    SELECT id FROM articles WHERE url IN ({', '.join('?' * len(to_write))})
+                """, [row[1] for row in to_write])
+                mark_near_duplicates(conn, [row['id'] for row in cur.fetchall()])
+            if record_checks:
+                record_freshness(conn, checks)
+        conn.commit()
+        related_articles_changed()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        metrics.observe('scrape_stage_duration_seconds', time.perf_counter() - started, stage='store')
+    
+    return counts
+
+def stored_count(counts):
+    """
+    Number of articles a store_articles call wrote (inserted + updated), the
+    articles_stored counter of every scrape job mode.
+    """
+    return counts['inserted'] + counts['updated']
+
+def scrape_and_store_articles(job=None):
+    """
+    Main function to scrape the 5 oldest articles from the last page
+    and store them in the database.
+    Progress is reported to `job` when given.
+    Returns a dictionary with inserted/updated/unchanged counts.
+    """
+    base_url = BLOG_BASE_URL
+    
+    print("Finding last page...")
+    last_page = find_last_page(base_url)
+    print(f"Last page found: {last_page}")
+    
+    # Construct URL for last page
+    last_page_url = listing_page_url(base_url, last_page)
+    
+    print(f"Scraping articles from: {last_page_url}")
+    articles = scrape_articles_from_page(last_page_url, limit=5, job=job)
+    
+    if not articles:
+        print("No articles found. Trying alternative approach...")
+        if job:
+            job.checkpoint()
+        # Try direct access to the base URL
+        articles = scrape_articles_from_page(base_url, limit=5, job=job)
+    
+    if job:
+        job.checkpoint()
+    
+    # Store articles in database
+    conn = get_db_connection()
+    counts = store_articles(conn, articles)
+    conn.close()
+    if job:
+        job.advance(articles_stored=stored_count(counts))
+    
+    print(f"Successfully stored {stored_count(counts)} articles in database "
+          f"({counts['inserted']} inserted, {counts['updated']} updated; {counts['unchanged']} unchanged, "
+          f"{counts['duplicates']} duplicates skipped).")
+    return counts
+
+# ==================== ARCHIVE CRAWL ====================
+
+def _known_urls(conn, urls):
+    """Return the subset of URLs that are already stored or queued in the frontier."""
+    known = set()
+    urls = list(urls)
+    # Stay well below SQLite's bound-parameter limit
+    for start in range(0, len(urls), 400):
+        chunk = urls[start:start + 400]
+        placeholders = ', '.join('?' * len(chunk))
+        rows = conn.execute(f"""
+            SELECT url FROM articles WHERE url IN ({placeholders})
+            UNION
+            SELECT url FROM crawl_frontier WHERE url IN ({placeholders})
+        """, chunk + chunk).fetchall()
+        known.update(row['url'] for row in rows)
+    return known
+
+def discover_archive_urls(conn, base_url, full=False, job=None):
+    """
+    Walk the listing pages from newest (page 1) to oldest and queue every
+    article URL that is not stored yet in the crawl_frontier table.
+    Once a complete walk has been recorded, paging stops at the first page
+    with no new URLs (known territory) unless `full` is set.
+    A listing page that cannot be fetched is counted as failed and skipped;
+    the walk is then not recorded as complete, so the next crawl covers it again.
+    Returns the number of newly discovered URLs.
+    """
+    state = conn.execute(
+        "SELECT archive_complete FROM crawl_state WHERE base_url = ?", (base_url,)
+    ).fetchone()
+    stop_at_known = bool(state and state['archive_complete']) and not full
+    
+    last_page = find_last_page(base_url)
+    discovered = 0
+    reached_end = True
+    
+    for page in range(1, last_page + 1):
+        try:
+            page_links = fetch_listing_links(listing_page_url(base_url, page))
+        except Exception as e:
+            print(f"Page {page}/{last_page}: failed to fetch listing page: {e}")
+            reached_end = False
+            if job:
+                job.advance(pages_failed=1)
+                job.checkpoint()
+            continue
+        
+        known = _known_urls(conn, [link['url'] for link in page_links])
+        new_links = [link for link in page_links if link['url'] not in known]
+        
+        conn.executemany("""
+            INSERT OR IGNORE INTO crawl_frontier (url, title, listing_page)
+            VALUES (?, ?, ?)
+        """, [(link['url'], link['title'], page) for link in new_links])
+        conn.commit()
+        discovered += len(new_links)
+        print(f"Page {page}/{last_page}: {len(new_links)} new of {len(page_links)} links")
+        if job:
+            job.advance(pages_discovered=1)
+            job.checkpoint()
+        
+        if stop_at_known and page_links and not new_links:
+            print(f"Reached known articles on page {page}, stopping.")
+            reached_end = False
+            break
+    
+    conn.execute("""
+        INSERT INTO crawl_state (base_url, archive_complete, last_crawled_at)
+        VALUES (?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(base_url) DO UPDATE SET
+            archive_complete = MAX(archive_complete, excluded.archive_complete),
+            last_crawled_at = excluded.last_crawled_at
+    """, (base_url, int(reached_end)))
+    conn.commit()
+    return discovered
+
+def process_frontier(conn, batch_size=CRAWL_BATCH_SIZE, job=None):
+    """
+    Scrape every pending URL in the crawl frontier in batches and store the articles.
+    URLs whose details could not be scraped are stored with their basic info and
+    marked 'failed' so the next crawl retries them.
+    Returns a dictionary with inserted/updated/unchanged counts.
+    """
+    conn.execute("UPDATE crawl_frontier SET status = 'pending' WHERE status = 'failed'")
+    conn.commit()
+    
+    counts = dict.fromkeys(STORE_COUNT_KEYS, 0)
+    while True:
+        rows = conn.execute("""
+            SELECT url, title FROM crawl_frontier
+            WHERE status = 'pending'
+            ORDER BY listing_page, rowid
+            LIMIT ?
+        """, (batch_size,)).fetchall()
+        if not rows:
+            break
+        
+        article_links = [{'url': row['url'], 'title': row['title']} for row in rows]
+        all_details = fetch_article_details_concurrently([link['url'] for link in article_links])
+        articles = [
+            build_article(article_link, details)
+            for article_link, details in zip(article_links, all_details)
+        ]
+        batch_counts = store_articles(conn, articles)
+        for key, value in batch_counts.items():
+            counts[key] += value
+        
+        conn.executemany("""
+            UPDATE crawl_frontier SET status = ?, fetched_at = CURRENT_TIMESTAMP
+            WHERE url = ?
+        """, [
+            ('done' if details else 'failed', article_link['url'])
+            for article_link, details in zip(article_links, all_details)
+        ])
+        conn.commit()
+        print(f"Stored {stored_count(counts)} articles so far...")
+        if job:
+            job.advance(
+                articles_fetched=sum(1 for details in all_details if details),
+                articles_failed=sum(1 for details in all_details if not details),
+                articles_stored=stored_count(batch_counts)
+            )
+            job.checkpoint()
+    
+    return counts
+
+def crawl_archive(base_url=None, full=False, job=None):
+    """
+    Incrementally crawl the full blog archive.
+    New article URLs are queued in the persistent frontier and then scraped;
+    articles that are already stored are skipped.
+    Progress is reported to `job` when given.
+    Returns a dictionary with inserted/updated/unchanged counts.
+    """
+    base_url = base_url or BLOG_BASE_URL
+    conn = get_db_connection()
+    try:
+        print("Discovering archive URLs...")
+        discovered = discover_archive_urls(conn, base_url, full=full, job=job)
+        print(f"Discovered {discovered} new article URLs.")
+        counts = process_frontier(conn, job=job)
+    finally:
+        conn.close()
+    
+    print(f"Successfully stored {stored_count(counts)} articles in database "
+          f"({counts['inserted']} inserted, {counts['updated']} updated; {counts['unchanged']} unchanged, "
+          f"{counts['duplicates']} duplicates skipped).")
+    return counts
+
+# ==================== FRESHNESS RE-CRAWL ====================
+
+# Seconds since the Unix epoch, in SQL
+_SQL_NOW = "((julianday('now') - 2440587.5) * 86400.0)"
+
+def init_freshness(conn):
+    """
+    Create the article_freshness table, which tracks when every article was
+    last checked and last seen changing and its estimated change rate, and
+    the triggers that add and remove rows with the articles. Articles stored
+    before tracking existed count as checked when they were scraped.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS article_freshness (
+            article_id INTEGER PRIMARY KEY,
+            last_checked REAL NOT NULL,
+            last_changed REAL,
+            checks INTEGER NOT NULL DEFAULT 0,
+            changes INTEGER NOT NULL DEFAULT 0,
+            observed_seconds REAL NOT NULL DEFAULT 0,
+            change_rate REAL NOT NULL
+        )
+    """)
+    for name in ('articles_freshness_insert', 'articles_freshness_delete'):
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+    conn.execute(f"""
+        CREATE TRIGGER articles_freshness_insert AFTER INSERT ON articles BEGIN
+            INSERT OR IGNORE INTO article_freshness (article_id, last_checked, last_changed, change_rate)
+            VALUES (new.id, {_SQL_NOW}, {_SQL_NOW}, {1.0 / REFRESH_PRIOR_SECONDS});
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER articles_freshness_delete AFTER DELETE ON articles BEGIN
+            DELETE FROM article_freshness WHERE article_id = old.id;
+        END
+    """)
+    cur = conn.execute(f"""
+        INSERT OR IGNORE INTO article_freshness (article_id, last_checked, last_changed, change_rate)
+        SELECT id, COALESCE((julianday(scraped_at) - 2440587.5) * 86400.0, {_SQL_NOW}),
+               (julianday(scraped_at) - 2440587.5) * 86400.0, ?
+        FROM articles
+    """, (1.0 / REFRESH_PRIOR_SECONDS,))
+    conn.commit()
+    if cur.rowcount > 0:
+        print(f"Started freshness tracking for {cur.rowcount} stored articles.")
+
+def select_refresh_batch(conn, budget, now):
+    """
+    Pick the `budget` articles most likely to have changed since their last check,
+    among those due: checked at least REFRESH_MIN_AGE_SECONDS ago and with a
+    chance of change of at least REFRESH_MIN_CHANGE_PROBABILITY.
+    Changes are modelled as a Poisson process, so the chance of at least one
+    change, 1 - exp(-rate * elapsed), ranks the same as rate * elapsed, and the
+    probability floor is the bound rate * elapsed >= -ln(1 - floor).
+    Returns the article rows (url, stored fields and last_checked), empty when none are due.
+    """
+    min_expected_changes = -math.log1p(-min(REFRESH_MIN_CHANGE_PROBABILITY, 0.999999))
+    return conn.execute("""
+        SELECT a.id, a.url, a.title, a.author, a.published_date, a.content_hash, f.last_checked
+        FROM article_freshness f
+        JOIN articles a ON a.id = f.article_id
+        WHERE f.last_checked <= :now - :min_age
+          AND f.change_rate * (:now - f.last_checked) >= :min_expected_changes
+        ORDER BY f.change_rate * (:now - f.last_checked) DESC
+        LIMIT :budget
+    """, {
+        'now': now, 'min_age': REFRESH_MIN_AGE_SECONDS,
+        'min_expected_changes': min_expected_changes, 'budget': budget
+    }).fetchall()
+
+def record_freshness(conn, checks, now=None):
+    """
+    Record checks of stored articles in article_freshness and update their
+    change rates. Every path that re-fetches or rewrites an article reports
+    here, so the estimate sees all observations, not only the scheduler's.
+    The rate estimate is (changes + 1) / (observed seconds + REFRESH_PRIOR_SECONDS).
+    `checks` is a list of (article id, changed) pairs. Nothing is committed.
+    """
+    now = now or time.time()
+    # Right-hand sides see the old row, so the rate uses the updated totals
+    conn.executemany("""
+        UPDATE article_freshness SET
+            last_checked = ?1,
+            last_changed = CASE WHEN ?2 THEN ?1 ELSE last_changed END,
+            checks = checks + 1,
+            changes = changes + ?2,
+            observed_seconds = observed_seconds + MAX(0.0, ?1 - last_checked),
+            change_rate = (changes + ?2 + 1.0) / (observed_seconds + MAX(0.0, ?1 - last_checked) + ?3)
+        WHERE article_id = ?4
+    """, [(now, int(changed), REFRESH_PRIOR_SECONDS, article_id) for article_id, changed in checks])
+
+def refresh_articles(budget=None, job=None):
+    """
+    Run one adaptive re-crawl cycle: re-fetch the due articles most likely to
+    have changed (conditional GETs, so unchanged pages are mostly 304s) and store
+    them, which writes only the ones that did change and records a check for
+    each (see record_freshness). A failed fetch counts as a check without a
+    change, so dead URLs fade out.
+    Progress is reported to `job` when given.
+    Returns a dictionary with inserted/updated/unchanged counts.
+    """
+    budget = budget or REFRESH_BUDGET
+    conn = get_db_connection()
+    try:
+        now = time.time()
+        rows = select_refresh_batch(conn, budget, now)
+        if not rows:
+            print("No articles due for a refresh.")
+            return dict.fromkeys(STORE_COUNT_KEYS, 0)
+        all_details = fetch_article_details_concurrently([row['url'] for row in rows])
+        if job:
+            job.advance(
+                articles_fetched=sum(1 for details in all_details if details),
+                articles_failed=sum(1 for details in all_details if not details)
+            )
+            job.checkpoint()
+        
+        articles = [
+            build_article({'url': row['url'], 'title': row['title']}, details)
+            for row, details in zip(rows, all_details) if details
+        ]
+        counts = store_articles(conn, articles)
+        record_freshness(conn, [(row['id'], False) for row, details in zip(rows, all_details) if not details], now)
+        conn.commit()
+        if job:
+            job.advance(articles_stored=stored_count(counts))
+    finally:
+        conn.close()
+    
+    print(f"Refreshed {len(rows)} articles: {counts['updated']} changed, "
+          f"{sum(1 for details in all_details if not details)} failed.")
+    return counts
+
+def _run_refresh_scheduler():
+    """
+    Start a refresh job every REFRESH_INTERVAL_SECONDS, joining a running
+    refresh job and skipping the cycle while another kind of job runs.
+    """
+    while True:
+        time.sleep(REFRESH_INTERVAL_SECONDS)
+        try:
+            start_scrape_job('refresh')
+        except Exception as e:
+            print(f"Could not start refresh job: {e}")
+
+def start_refresh_scheduler():
+    """Run refresh cycles in the background when REFRESH_INTERVAL_SECONDS is set."""
+    if REFRESH_INTERVAL_SECONDS > 0:
+        threading.Thread(target=_run_refresh_scheduler, name='refresh-scheduler', daemon=True).start()
+
+# ==================== SCRAPE JOBS ====================
+
+SCRAPE_JOB_COUNTERS = ('pages_discovered', 'pages_failed', 'articles_fetched', 'articles_stored', 'articles_failed')
+
+class ScrapeCancelled(Exception):
+    """Raised at a checkpoint when cancellation of the running scrape job was requested."""
+
+class ScrapeJobConflict(Exception):
+    """Raised when a scrape job is requested while a job with a different mode or `full` runs."""
+    
+    def __init__(self, job_id, mode, full):
+        super().__init__(f"Scrape job {job_id} ({mode}{', full' if full else ''}) is already running")
+        self.job_id = job_id
+        self.mode = mode
+        self.full = full
+
+class ScrapeJob:
+    """
+    Progress reporter for a background scrape job.
+    Counters are persisted to the scrape_jobs table, which doubles as a heartbeat.
+    """
+    
+    def __init__(self, job_id):
+        self.id = job_id
+        self.counters = dict.fromkeys(SCRAPE_JOB_COUNTERS, 0)
+    
+    def _update(self, sql, params=()):
+        conn = get_db_connection()
+        try:
+            conn.execute(sql, params)
+            conn.commit()
+        finally:
+            conn.close()
+    
+    def advance(self, **deltas):
+        """Add to the progress counters and persist them."""
+        for name, delta in deltas.items():
+            self.counters[name] += delta
+        assignments = ', '.join(f"{name} = ?" for name in SCRAPE_JOB_COUNTERS)
+        self._update(
+            f"UPDATE scrape_jobs SET {assignments}, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+            [self.counters[name] for name in SCRAPE_JOB_COUNTERS] + [self.id]
+        )
+    
+    def checkpoint(self):
+        """
+        Record a heartbeat, then raise ScrapeCancelled if cancellation was
+        requested for this job.
+        """
+        conn = get_db_connection()
+        try:
+            row = conn.execute("""
+                UPDATE scrape_jobs SET updated_at = CURRENT_TIMESTAMP WHERE id = ?
+                RETURNING cancel_requested
+            """, (self.id,)).fetchone()
+            conn.commit()
+        finally:
+            conn.close()
+        if row and row['cancel_requested']:
+            raise ScrapeCancelled()
+    
+    def set_status(self, status, error=None):
+        """Record a status change; terminal statuses also set finished_at."""
+        finished = status in ('completed', 'failed', 'cancelled')
+        self._update(f"""
+            UPDATE scrape_jobs SET
+                status = ?,
+                error = ?,
+                started_at = COALESCE(started_at, CASE WHEN ? = 'running' THEN CURRENT_TIMESTAMP END),
+                finished_at = {'CURRENT_TIMESTAMP' if finished else 'finished_at'},
+                updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        """, (status, error, status, self.id))
+
+def log_run_summary(job, mode, full, status, started, stages_before, counts=None, error=None):
+    """
+    Log one JSON line summarising a finished scrape run: outcome, progress
+    counters, store counts and the time spent in each scraper stage.
+    Stage times are process-wide deltas, which is exact while one job runs at a time.
+    """
+    duration = time.perf_counter() - started
+    metrics.inc('scrape_runs_total', mode=mode, status=status)
+    metrics.observe('scrape_run_duration_seconds', duration, mode=mode)
+    
+    stages = {}
+    for stage, totals in metrics.histogram_totals('scrape_stage_duration_seconds', 'stage').items():
+        before = stages_before.get(stage, {'count': 0, 'seconds': 0.0})
+        if totals['count'] > before['count']:
+            stages[stage] = {
+                'count': totals['count'] - before['count'],
+                'seconds': round(totals['seconds'] - before['seconds'], 6)
+            }
+    
+    run_logger.info(json.dumps({
+        'event': 'scrape_run',
+        'job_id': job.id,
+        'mode': mode,
+        'full': bool(full),
+        'status': status,
+        'error': error,
+        'duration_seconds': round(duration, 6),
+        'counters': job.counters,
+        'counts': counts,
+        'stages': stages,
+        'finished_at': datetime.now(timezone.utc).isoformat()
+    }))
+
+def run_scrape_job(job_id, mode, full):
+    """Run a scrape job to completion in the current (background) thread."""
+    job = ScrapeJob(job_id)
+    job.set_status('running')
+    started = time.perf_counter()
+    stages_before = metrics.histogram_totals('scrape_stage_duration_seconds', 'stage')
+    counts = error = None
+    try:
+        if mode == 'archive':
+            counts = crawl_archive(full=full, job=job)
+        elif mode == 'refresh':
+            counts = refresh_articles(job=job)
+        else:
+            counts = scrape_and_store_articles(job=job)
+        status = 'completed'
+    except ScrapeCancelled:
+        print(f"Scrape job {job_id} cancelled.")
+        status = 'cancelled'
+    except Exception as e:
+        print(f"Scrape job {job_id} failed: {e}")
+        status, error = 'failed', str(e)
+    job.set_status(status, error=error)
+    log_run_summary(job, mode, full, status, started, stages_before, counts=counts, error=error)
+
+def start_scrape_job(mode='latest', full=False):
+    """
+    Start a background scrape job, or join the one already running if it
+    does the same work (same mode and `full`); a running job with a different
+    mode or `full` raises ScrapeJobConflict, since the requested work would
+    never happen.
+    Only one job runs at a time across all workers: the check and the insert
+    happen in one write transaction, and jobs without a heartbeat for
+    SCRAPE_JOB_STALE_SECONDS are treated as dead.
+    Returns (job_id, joined).
+    """
+    conn = get_db_connection()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        stale_after = f"-{SCRAPE_JOB_STALE_SECONDS} seconds"
+        conn.execute("""
+            UPDATE scrape_jobs SET status = 'failed', error = 'Job stopped responding',
+                finished_at = CURRENT_TIMESTAMP
+            WHERE status IN ('queued', 'running') AND updated_at < datetime('now', ?)
+        """, (stale_after,))
+        active = conn.execute("""
+            SELECT id, mode, full FROM scrape_jobs
+            WHERE status IN ('queued', 'running')
+            ORDER BY id DESC LIMIT 1
+        """).fetchone()
+        if active:
+            conn.commit()
+            if (active['mode'], bool(active['full'])) != (mode, bool(full)):
+                raise ScrapeJobConflict(active['id'], active['mode'], bool(active['full']))
+            return active['id'], True
+        
+        cur = conn.execute("""
+            INSERT INTO scrape_jobs (mode, full, status) VALUES (?, ?, 'queued')
+        """, (mode, int(full)))
+        job_id = cur.lastrowid
+        conn.commit()
+    finally:
+        conn.close()
+    
+    threading.Thread(
+        target=run_scrape_job,
+        args=(job_id, mode, full),
+        name=f"scrape-job-{job_id}",
+        daemon=True
+    ).start()
+    return job_id, False
+
+# ==================== RESPONSE CACHE ====================
+
+class ResponseCache:
+    """
+    Thread-safe LRU of serialized JSON responses, bounded by entry count and total bytes.
+    Each entry remembers the data version it was built from and is ignored once it changes.
+    """
+    
+    def __init__(self, max_entries, max_bytes):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry
+    
+    def put(self, key, version, etag, body):
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= len(old[2])
+            self._entries[key] = (version, etag, body)
+            self.total_bytes += len(body)
+            while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.total_bytes -= len(evicted[2])
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+response_cache = ResponseCache(RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_MAX_BYTES)
+
+def cached_response(view):
+    """
+    Cache successful JSON responses of a read endpoint, keyed by path and query string.
+    Entries are invalidated when the articles data version changes, and requests
+    whose If-None-Match matches the current ETag get an empty 304.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = (request.path, tuple(sorted(request.args.items(multi=True))))
+        version = get_data_version(get_read_db())
+        
+        entry = response_cache.get(key, version)
+        if entry is None:
+            response = app.make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            body = response.get_data()
+            etag = hashlib.sha1(body).hexdigest()
+            response_cache.put(key, version, etag, body)
+        else:
+            _, etag, body = entry
+        
+        # Encoded variants are cached next to the plain body, with their own ETag
+        encoding = negotiate_response_encoding() if len(body) >= RESPONSE_COMPRESS_MIN_BYTES else None
+        if encoding:
+            variant = response_cache.get(key + (encoding,), version)
+            if variant is None:
+                body = encode_response_body(body, encoding)
+                etag = f"{etag}-{encoding}"
+                response_cache.put(key + (encoding,), version, etag, body)
+            else:
+                _, etag, body = variant
+        
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = Response(body, mimetype='application/json')
+            if encoding:
+                response.headers['Content-Encoding'] = encoding
+        response.set_etag(etag)
+        # Clients may store the response but must revalidate it each time
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+    return wrapper
+
+# ==================== RESPONSE COMPRESSION ====================
+
+def negotiate_response_encoding():
+    """
+    Pick a response encoding from the request's Accept-Encoding header:
+    br (when the brotli package is installed) or gzip, whichever the client
+    prefers; br wins ties.
+    Returns the encoding name, or None to send the body as is.
+    """
+    accepted = request.accept_encodings
+    candidates = [('br', accepted['br'])] if brotli else []
+    candidates.append(('gzip', accepted['gzip']))
+    encoding, quality = max(candidates, key=lambda candidate: candidate[1])
+    return encoding if quality > 0 else None
+
+def encode_response_body(body, encoding):
+    """Compress a response body with the negotiated encoding."""
+    if encoding == 'br':
+        return brotli.compress(body, quality=RESPONSE_BROTLI_QUALITY)
+    return gzip.compress(body, RESPONSE_GZIP_LEVEL, mtime=0)
+
+@app.after_request
+def compress_api_response(response):
+    """
+    Encode /api/articles* responses with gzip or br when the client accepts it.
+    Streamed responses (the NDJSON export), small bodies and responses that are
+    already encoded (cached responses) are passed through.
+    """
+    if not request.path.startswith('/api/articles'):
+        return response
+    response.vary.add('Accept-Encoding')
+    if (response.direct_passthrough or response.is_streamed or
+            response.status_code in (204, 304) or 'Content-Encoding' in response.headers):
+        return response
+    if response.content_length is not None and response.content_length < RESPONSE_COMPRESS_MIN_BYTES:
+        return response
+    encoding = negotiate_response_encoding()
+    if encoding is None:
+        return response
+    body = response.get_data()
+    if len(body) < RESPONSE_COMPRESS_MIN_BYTES:
+        return response
+    response.set_data(encode_response_body(body, encoding))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+# ==================== RELATED ARTICLES ====================
+
+_related_index = None
+_related_index_error = None
+_related_wakeup = threading.Event()
+_related_worker = None
+_related_worker_lock = threading.Lock()
+
+def related_index_path():
+    """Directory of the saved related-articles index."""
+    return RELATED_INDEX_PATH or os.path.splitext(DB_PATH)[0] + '_related'
+
+def _related_documents(conn, article_ids=None):
+    """
+    Yield (id, document key, text) for articles, all of them or the given ids.
+    The text indexed is the title followed by the content.
+    """
+    import related
+    if article_ids is None:
+        batches = [None]
+    else:
+        article_ids = list(article_ids)
+        batches = [
+            article_ids[start:start + RELATED_FETCH_BATCH_SIZE]
+            for start in range(0, len(article_ids), RELATED_FETCH_BATCH_SIZE)
+        ]
+    for batch in batches:
+        where = '' if batch is None else f"WHERE id IN ({', '.join('?' * len(batch))})"
+        cur = conn.execute(f"""
+            SELECT id, title, content_hash, content_text(content) AS content
+            FROM articles {where}
+        """, batch or [])
+        for row in cur:
+            yield (
+                row['id'],
+                related.document_key(row['title'], row['content_hash']),
+                f"{row['title'] or ''}\n{row['content'] or ''}"
+            )
+
+def build_related_index(conn):
+    """Build the related-articles index from every stored article and save it."""
+    import related
+    started = time.perf_counter()
+    index = related.RelatedIndex.build(related_index_path(), _related_documents(conn))
+    print(f"Built related-articles index for {len(index)} articles in {time.perf_counter() - started:.1f}s")
+    return index
+
+def sync_related_index(conn, index, position=None):
+    """
+    Bring the index up to date with the articles table: articles whose title
+    or content hash changed (or that are new) are re-indexed, deleted ones removed.
+    With `position` (returned by an earlier call), only the articles logged in
+    related_changes after it are looked at; without it every article is
+    compared, as after loading or building the index.
+    Returns the related_changes position the index is now up to date with.
+    """
+    import related
+    # One snapshot for the log position and the keys it covers
+    conn.execute("BEGIN")
+    try:
+        latest = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM related_changes").fetchone()[0]
+        if position is None:
+            rows = conn.execute("SELECT id, title, content_hash FROM articles")
+            article_ids = None
+        else:
+            rows = conn.execute("""
+                SELECT c.article_id AS log_id, a.id, a.title, a.content_hash
+                FROM related_changes c
+                LEFT JOIN articles a ON a.id = c.article_id
+                WHERE c.seq > ?
+            """, (position,)).fetchall()
+            article_ids = [row['log_id'] for row in rows]
+        current = {
+            row['id']: related.document_key(row['title'], row['content_hash'])
+            for row in rows if row['id'] is not None
+        }
+    finally:
+        conn.commit()
+    changed, removed = index.diff(current, article_ids)
+    if changed or removed:
+        index.update(_related_documents(conn, changed), removed)
+    return latest
+
+def _run_related_index():
+    """
+    Background loop owning the related-articles index: load (or build) it,
+    then apply changes whenever the data version moved, rebuilding once the
+    frozen IDF weights have gone stale.
+    """
+    global _related_index, _related_index_error
+    import related
+    synced_version = None
+    # related_changes position synced so far; None compares every article once
+    position = None
+    while True:
+        conn = get_db_connection()
+        try:
+            version = get_data_version(conn)
+            if _related_index is None:
+                index = related.RelatedIndex.load(related_index_path())
+                if index is None:
+                    index = build_related_index(conn)
+                _related_index = index
+                position = None
+            if version != synced_version:
+                position = sync_related_index(conn, _related_index, position)
+                if _related_index.needs_rebuild():
+                    _related_index = build_related_index(conn)
+                    position = None
+                    version = None
+                synced_version = version
+            _related_index_error = None
+        except Exception as e:
+            _related_index_error = str(e)
+            print(f"Related-articles index sync failed: {e}")
+        finally:
+            conn.close()
+        _related_wakeup.wait(RELATED_INDEX_SYNC_SECONDS)
+        _related_wakeup.clear()
+
+def start_related_index():
+    """
+    Start the background thread that maintains the related-articles index,
+    once per process.
+    Returns False if numpy, scipy or scikit-learn is not installed.
+    """
+    global _related_worker
+    try:
+        import related  # noqa: F401
+    except ImportError:
+        return False
+    with _related_worker_lock:
+        if _related_worker is None:
+            _related_worker = threading.Thread(target=_run_related_index, name='related-index', daemon=True)
+            _related_worker.start()
+    return True
+
+def related_articles_changed():
+    """Wake the related-articles index thread after articles were written."""
+    _related_wakeup.set()
+
+# ==================== CRUD API ENDPOINTS ====================
+
+def encode_cursor(position):
+    """Encode a keyset position (dict of sort-key values) as an opaque cursor token."""
+    raw = json.dumps(position, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(token):
+    """Decode a cursor token back into a keyset position; raises ValueError if invalid."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError('Invalid cursor') from e
+    if not isinstance(position, dict) or not isinstance(position.get('id'), int):
+        raise ValueError('Invalid cursor')
+    return position
+
+def parse_fields(fields_param):
+    """
+    Parse the `fields=` query parameter into a list of article columns.
+    `id` is always included; raises ValueError for unknown fields.
+    """
+    if not fields_param:
+        return list(ARTICLE_COLUMNS)
+    fields = ['id']
+    for field in fields_param.split(','):
+        field = field.strip()
+        if not field or field in fields:
+            continue
+        if field not in ARTICLE_COLUMNS:
+            raise ValueError(f'Unknown field: {field}')
+        fields.append(field)
+    return fields
+
+def parse_epoch_param(name):
+    """
+    Read a date query parameter given as epoch seconds or a date/datetime
+    string (see parse_published_date).
+    Returns the epoch, or None if the parameter is absent; raises ValueError if invalid.
+    """
+    value = request.args.get(name, '').strip()
+    if not value:
+        return None
+    if value.lstrip('-').isdigit():
+        return int(value)
+    epoch = parse_published_date(value)
+    if epoch is None:
+        raise ValueError(f'Invalid date for {name}: {value}')
+    return epoch
+
+@app.route('/api/articles', methods=['GET'])
+@cached_response
+def get_articles():
+    """
+    Get articles, newest first (READ).
+    `sort=published` orders by published date and `sort=scraped` by scrape time
+    instead of id; `order=asc` reverses the order (e.g. the oldest articles first).
+    `author=` and `published_after=`/`published_before=` (epoch seconds or a
+    date, after inclusive and before exclusive) filter the list; sorting or
+    filtering by published date leaves out articles without a parsed date.
+    Results are paginated with a keyset cursor on (sort column, id): pass the
+    returned `next_cursor` as `cursor` to get the next page. `limit` defaults
+    to ARTICLES_DEFAULT_PAGE_SIZE and is capped at ARTICLES_MAX_PAGE_SIZE.
+    `fields=title,author,...` selects only those columns.
+    """
+    try:
+        # Optional query parameters
+        limit = request.args.get('limit', type=int) or ARTICLES_DEFAULT_PAGE_SIZE
+        limit = max(1, min(limit, ARTICLES_MAX_PAGE_SIZE))
+        offset = request.args.get('offset', type=int)
+        cursor = request.args.get('cursor')
+        sort = request.args.get('sort', 'id')
+        descending = request.args.get('order', 'desc').lower() != 'asc'
+        author = request.args.get('author')
+        
+        try:
+            if sort not in ARTICLES_SORT_COLUMNS:
+                raise ValueError(f'Unknown sort: {sort}')
+            sort_column = ARTICLES_SORT_COLUMNS[sort]
+            fields = parse_fields(request.args.get('fields'))
+            published_after = parse_epoch_param('published_after')
+            published_before = parse_epoch_param('published_before')
+            position = decode_cursor(cursor) if cursor else None
+            if position and sort_column != 'id' and not isinstance(position.get(sort_column), (int, str)):
+                raise ValueError('Invalid cursor')
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        conn = get_read_db()
+        cur = conn.cursor()
+        
+        # Every condition and the order match an index (see init_published_dates)
+        conditions = []
+        params = []
+        if author is not None:
+            conditions.append("author = ?")
+            params.append(author)
+        if published_after is not None:
+            conditions.append("published_epoch >= ?")
+            params.append(published_after)
+        if published_before is not None:
+            conditions.append("published_epoch < ?")
+            params.append(published_before)
+        if sort_column == 'published_epoch':
+            conditions.append("published_epoch IS NOT NULL")
+        
+        direction = 'DESC' if descending else 'ASC'
+        comparison = '<' if descending else '>'
+        if position:
+            if sort_column == 'id':
+                conditions.append(f"id {comparison} ?")
+                params.append(position['id'])
+            else:
+                conditions.append(f"({sort_column}, id) {comparison} (?, ?)")
+                params.extend((position[sort_column], position['id']))
+        
+        selected = fields if sort_column in fields else fields + [sort_column]
+        query = f"SELECT {', '.join(selected)} FROM articles"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += (f" ORDER BY id {direction}" if sort_column == 'id'
+                  else f" ORDER BY {sort_column} {direction}, id {direction}")
+        
+        # Fetch one extra row to know whether another page exists
+        query += " LIMIT ?"
+        params.append(limit + 1)
+        
+        if offset and not position:
+            # Legacy offset pagination; cost grows with the offset
+            query += " OFFSET ?"
+            params.append(offset)
+        
+        cur.execute(query, params)
+        articles = cur.fetchall()
+        
+        next_cursor = None
+        if len(articles) > limit:
+            articles = articles[:limit]
+            last = articles[-1]
+            next_cursor = encode_cursor(
+                {'id': last['id']} if sort_column == 'id'
+                else {sort_column: last[sort_column], 'id': last['id']}
+            )
+        
+        articles = [article_dict(article) for article in articles]
+        if sort_column not in fields:
+            for article in articles:
+                del article[sort_column]
+        
+        return jsonify({
+            'success': True,
+            'count': len(articles),
+            'articles': articles,
+            'next_cursor': next_cursor
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/articles/<int:article_id>', methods=['GET'])
+@cached_response
+def get_article(article_id):
+    """Get a specific article by ID (READ)."""
+    try:
+        conn = get_read_db()
+        cur = conn.cursor()
+        cur.execute(f"SELECT {', '.join(ARTICLE_COLUMNS)} FROM articles WHERE id = ?", (article_id,))
+        article = cur.fetchone()
+        
+        if article:
+            return jsonify({
+                'success': True,
+                'article': article_dict(article)
+            }), 200
+        else:
+            return jsonify({
+                'success': False,
+                'error': 'Article not found'
+            }), 404
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/articles/<int:article_id>/related', methods=['GET'])
+def get_related_articles(article_id):
+    """
+    Get the articles most similar in content to an article.
+    Neighbours are read from the precomputed related-articles index, so the
+    cost does not depend on the number of articles; near-duplicates of the
+    article are left out. Returns up to `limit` articles with their cosine
+    similarity `score`, or 503 while the index is not ready.
+    """
+    try:
+        limit = request.args.get('limit', type=int) or RELATED_DEFAULT_LIMIT
+        limit = max(1, min(limit, RELATED_MAX_LIMIT))
+        
+        conn = get_read_db()
+        cur = conn.cursor()
+        cur.execute("SELECT id, duplicate_of FROM articles WHERE id = ?", (article_id,))
+        article = cur.fetchone()
+        if not article:
+            return jsonify({
+                'success': False,
+                'error': 'Article not found'
+            }), 404
+        
+        if not start_related_index():
+            return jsonify({
+                'success': False,
+                'error': 'Related articles need numpy, scipy and scikit-learn'
+            }), 503
+        index = _related_index
+        neighbors = index.neighbors(article_id) if index is not None else None
+        if neighbors is None:
+            related_articles_changed()
+            return jsonify({
+                'success': False,
+                'error': _related_index_error or 'Related articles index is not ready yet'
+            }), 503
+        
+        scores = dict(neighbors)
+        cur.execute(f"""
+            SELECT id, title, url, author, published_date, duplicate_of
+            FROM articles WHERE id IN ({', '.join('?' * len(scores))})
+        """, list(scores))
+        root = article['duplicate_of'] or article_id
+        results = []
+        for row in sorted(cur.fetchall(), key=lambda row: -scores[row['id']]):
+            if (row['duplicate_of'] or row['id']) == root:
+                continue
+            result = dict(row)
+            del result['duplicate_of']
+            result['score'] = round(scores[row['id']], 4)
+            results.append(result)
+        
+        return jsonify({
+            'success': True,
+            'article_id': article_id,
+            'count': len(results[:limit]),
+            'related': results[:limit]
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+def article_field_error(data, required=True, fields=ARTICLE_TEXT_FIELDS):
+    """
+    Check the types of the article fields a client sent (create, update, import).
+    With `required`, title and url must be present and non-empty.
+    Returns an error message, or None when the fields are valid.
+    """
+    if not isinstance(data, dict):
+        return 'Title and URL are required' if required else 'No data provided'
+    if required and (not data.get('title') or not data.get('url')):
+        return 'Title and URL are required'
+    for field in fields:
+        value = data.get(field)
+        if field in data and not isinstance(value, str) and not (value is None and field in ARTICLE_NULLABLE_FIELDS):
+            return f'Field {field} must be a string'
+    return None
+
+def insert_article(cur, data):
+    """
+    Validate and insert one article (shared by create_article and the batch create).
+    Content identical to a stored article is rejected with 409; near-duplicate
+    content is stored and flagged with `duplicate_of`. A URL that already
+    exists raises sqlite3.IntegrityError. Nothing is committed.
+    Returns (result dictionary, HTTP status).
+    """
+    # Validate required fields and field types
+    error = article_field_error(data)
+    if error:
+        return {
+            'success': False,
+            'error': error
+        }, 400
+    
+    content_hash, fingerprint = content_fingerprint(data.get('content', ''))
+    if content_hash:
+        cur.execute("SELECT id FROM articles WHERE content_hash = ? LIMIT 1", (content_hash,))
+        existing = cur.fetchone()
+        if existing:
+            return {
+                'success': False,
+                'error': 'Article with identical content already exists',
+                'article_id': existing['id']
+            }, 409
+    
+    content, content_bytes = encode_content(data.get('content', ''))
+    cur.execute("""
+        INSERT INTO articles (title, url, content, content_bytes, author, published_date,
+                              published_epoch, content_hash, simhash)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, (
+        data.get('title'),
+        data.get('url'),
+        content,
+        content_bytes,
+        data.get('author', ''),
+        data.get('published_date', ''),
+        parse_published_date(data.get('published_date')),
+        content_hash,
+        fingerprint
+    ))
+    
+    article_id = cur.lastrowid
+    mark_near_duplicates(cur.connection, [article_id])
+    cur.execute("SELECT duplicate_of FROM articles WHERE id = ?", (article_id,))
+    return {
+        'success': True,
+        'message': 'Article created successfully',
+        'article_id': article_id,
+        'duplicate_of': cur.fetchone()['duplicate_of']
+    }, 201
+
+def apply_article_update(cur, article_id, data):
+    """
+    Update the given fields of one article (shared by update_article and the batch patch).
+    An update that changes the article's fields is recorded as a change in its
+    freshness history (see record_freshness).
+    A URL that already exists raises sqlite3.IntegrityError. Nothing is committed.
+    Returns (result dictionary, HTTP status).
+    """
+    if not data or not isinstance(data, dict):
+        return {
+            'success': False,
+            'error': 'No data provided'
+        }, 400
+    error = article_field_error(data, required=False)
+    if error:
+        return {
+            'success': False,
+            'error': error
+        }, 400
+    
+    # Check if article exists
+    cur.execute("SELECT title, author, published_date, content_hash FROM articles WHERE id = ?", (article_id,))
+    existing = cur.fetchone()
+    if not existing:
+        return {
+            'success': False,
+            'error': 'Article not found'
+        }, 404
+    
+    # Build update query dynamically based on provided fields
+    update_fields = []
+    values = []
+    
+    if 'title' in data:
+        update_fields.append("title = ?")
+        values.append(data['title'])
+    if 'url' in data:
+        update_fields.append("url = ?")
+        values.append(data['url'])
+    # Same comparison as store_articles: the listed fields plus the content hash
+    changed = any(
+        field in data and (data[field] or '') != (existing[field] or '')
+        for field in ('title', 'author', 'published_date')
+    )
+    if 'content' in data:
+        content, content_bytes = encode_content(data['content'])
+        content_hash, fingerprint = content_fingerprint(data['content'])
+        update_fields.append("content = ?, content_bytes = ?, content_hash = ?, simhash = ?")
+        values.extend((content, content_bytes, content_hash, fingerprint))
+        changed = changed or content_hash != existing['content_hash']
+    if 'author' in data:
+        update_fields.append("author = ?")
+        values.append(data['author'])
+    if 'published_date' in data:
+        update_fields.append("published_date = ?, published_epoch = ?")
+        values.extend((data['published_date'], parse_published_date(data['published_date'])))
+    
+    if not update_fields:
+        return {
+            'success': False,
+            'error': 'No valid fields to update'
+        }, 400
+    
+    values.append(article_id)
+    query = f"UPDATE articles SET {', '.join(update_fields)} WHERE id = ?"
+    
+    cur.execute(query, values)
+    if 'content' in data:
+        mark_near_duplicates(cur.connection, [article_id])
+    if changed:
+        record_freshness(cur.connection, [(article_id, True)])
+    return {
+        'success': True,
+        'message': 'Article updated successfully'
+    }, 200
+
+def delete_article_row(cur, article_id):
+    """
+    Delete one article (shared by delete_article and the batch delete).
+    Nothing is committed.
+    Returns (result dictionary, HTTP status).
+    """
+    cur.execute("SELECT id FROM articles WHERE duplicate_of = ?", (article_id,))
+    duplicates = [row['id'] for row in cur.fetchall()]
+    cur.execute("DELETE FROM articles WHERE id = ?", (article_id,))
+    if not cur.rowcount:
+        return {
+            'success': False,
+            'error': 'Article not found'
+        }, 404
+    # The delete trigger cleared their flag; they may still duplicate another article
+    mark_near_duplicates(cur.connection, duplicates)
+    return {
+        'success': True,
+        'message': 'Article deleted successfully'
+    }, 200
+
+@app.route('/api/articles', methods=['POST'])
+def create_article():
+    """
+    Create a new article (CREATE).
+    Content identical to a stored article is rejected with 409; near-duplicate
+    content is stored and flagged with `duplicate_of`.
+    """
+    try:
+        conn = get_db()
+        result, status = insert_article(conn.cursor(), request.get_json())
+        if status == 201:
+            conn.commit()
+            related_articles_changed()
+        return jsonify(result), status
+    except sqlite3.IntegrityError:
+        return jsonify({
+            'success': False,
+            'error': 'Article with this URL already exists'
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/articles/<int:article_id>', methods=['PUT'])
+def update_article(article_id):
+    """Update an existing article (UPDATE)."""
+    try:
+        conn = get_db()
+        result, status = apply_article_update(conn.cursor(), article_id, request.get_json())
+        if status == 200:
+            conn.commit()
+            related_articles_changed()
+        return jsonify(result), status
+    except sqlite3.IntegrityError:
+        return jsonify({
+            'success': False,
+            'error': 'Article with this URL already exists'
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/articles/<int:article_id>', methods=['DELETE'])
+def delete_article(article_id):
+    """Delete an article (DELETE)."""
+    try:
+        conn = get_db()
+        result, status = delete_article_row(conn.cursor(), article_id)
+        if status == 200:
+            conn.commit()
+            related_articles_changed()
+        return jsonify(result), status
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+# ==================== BATCH API ENDPOINTS ====================
+
+def parse_batch_ids(values):
+    """
+    Validate a list of article ids for a batch request.
+    Raises ValueError unless it is a non-empty list of at most BATCH_MAX_ITEMS integers.
+    Returns the ids with duplicates removed, in order.
+    """
+    if not isinstance(values, list) or not values:
+        raise ValueError('A non-empty list of ids is required')
+    if len(values) > BATCH_MAX_ITEMS:
+        raise ValueError(f'At most {BATCH_MAX_ITEMS} items per batch')
+    if not all(isinstance(value, int) and not isinstance(value, bool) for value in values):
+        raise ValueError('Ids must be integers')
+    return list(dict.fromkeys(values))
 
-def scrape_articles_from_page(url, limit=5):
+def batch_items(data, key):
     """
-    Scrape articles from a given page URL.
-    Returns a list of article dictionaries.
+    Return the list of items under `key` in a batch request body.
+    Raises ValueError unless it is a non-empty list of at most BATCH_MAX_ITEMS items.
     """
-    try:
-        response = requests.get(url, timeout=10, headers={
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
-        
-        if response.status_code != 200:
-            print(f"Failed to fetch page: {response.status_code}")
-            return []
-            
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        articles = []
-        
-        # Try multiple common article/blog post selectors
-        article_selectors = [
-            soup.find_all('article'),
-            soup.find_all('div', class_=re.compile(r'article|blog|post', re.I)),
-            soup.find_all('div', id=re.compile(r'article|blog|post', re.I)),
-            soup.find_all(['div', 'section'], {'class': re.compile(r'card|item|entry', re.I)}),
-        ]
-        
-        article_links = []
-        
-        for selector_result in article_selectors:
-            for element in selector_result:
-                # Find link to article
-                link = element.find('a', href=True)
-                if link:
-                    href = link.get('href', '')
-                    if href:
-                        # Make absolute URL if relative
-                        if href.startswith('/'):
-                            base = '/'.join(url.split('/')[:3])
-                            href = base + href
-                        elif not href.startswith('http'):
-                            href = url.rstrip('/') + '/' + href.lstrip('/')
-                        
-                        # Get title
-                        title_elem = element.find(['h1', 'h2', 'h3', 'h4'])
-                        title = title_elem.get_text(strip=True) if title_elem else link.get_text(strip=True)
-                        
-                        if href and title and href not in [a['url'] for a in article_links]:
-                            article_links.append({
-                                'url': href,
-                                'title': title
-                            })
-        
-        # If no articles found with common selectors, try finding all links
-        if not article_links:
-            all_links = soup.find_all('a', href=True)
-            for link in all_links:
-                href = link.get('href', '')
-                text = link.get_text(strip=True)
-                # Filter for blog/article links
-                if ('/blog/' in href or '/article/' in href or '/post/' in href) and text:
-                    if href.startswith('/'):
-                        base = '/'.join(url.split('/')[:3])
-                        href = base + href
-                    elif not href.startswith('http'):
-                        href = url.rstrip('/') + '/' + href.lstrip('/')
-                    
-                    if href not in [a['url'] for a in article_links]:
-                        article_links.append({
-                            'url': href,
-                            'title': text
-                        })
-        
-        # Get detailed content for each article
-        for article_link in article_links[:limit]:
-            details = scrape_article_details(article_link['url'])
-            if details:
-                article = {
-                    'title': details.get('title') or article_link['title'],
-                    'url': article_link['url'],
-                    'content': details.get('content', ''),
-                    'author': details.get('author', ''),
-                    'published_date': details.get('published_date', '')
-                }
-                articles.append(article)
-            else:
-                # If details scraping fails, at least save the basic info
-                articles.append({
-                    'title': article_link['title'],
-                    'url': article_link['url'],
-                    'content': '',
-                    'author': '',
-                    'published_date': ''
-                })
-        
-        return articles
-    except Exception as e:
-        print(f"Error scraping articles from {url}: {e}")
-        return []
+    items = data.get(key) if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items:
+        raise ValueError(f'A non-empty "{key}" list is required')
+    if len(items) > BATCH_MAX_ITEMS:
+        raise ValueError(f'At most {BATCH_MAX_ITEMS} items per batch')
+    return items
 
-def scrape_and_store_articles():
+def run_batch(conn, items, operation):
     """
-    Main function to scrape the 5 oldest articles from the last page
-    and store them in the database.
+    Apply `operation(cur, item)` to every item of a batch in one write transaction.
+    Every item runs in its own savepoint, so a failing item is rolled back on
+    its own and reported in its result while the rest are committed together.
+    Returns the per-item results, each with the item's `index` and HTTP `status`.
     """
-    base_url = "https://beyondchats.com/blogs/"
-    
-    print("Finding last page...")
-    last_page = find_last_page(base_url)
-    print(f"Last page found: {last_page}")
-    
-    # Construct URL for last page
-    if last_page > 1:
-        last_page_url = f"{base_url}?page={last_page}"
-    else:
-        last_page_url = base_url
-    
-    print(f"Scraping articles from: {last_page_url}")
-    articles = scrape_articles_from_page(last_page_url, limit=5)
-    
-    if not articles:
-        print("No articles found. Trying alternative approach...")
-        # Try direct access to the base URL
-        articles = scrape_articles_from_page(base_url, limit=5)
-    
-    # Store articles in database
-    conn = get_db_connection()
     cur = conn.cursor()
-    
-    stored_count = 0
-    for article in articles:
-        try:
-            cur.execute("""
-                INSERT OR REPLACE INTO articles (title, url, content, author, published_date)
-                VALUES (?, ?, ?, ?, ?)
-            """, (
-                article['title'],
-                article['url'],
-                article['content'],
-                article['author'],
-                article['published_date']
-            ))
-            stored_count += 1
-        except Exception as e:
-            print(f"Error storing article {article['title']}: {e}")
-    
-    conn.commit()
-    conn.close()
-    
-    print(f"Successfully stored {stored_count} articles in database.")
-    return stored_count
+    results = []
+    cur.execute("BEGIN IMMEDIATE")
+    try:
+        for index, item in enumerate(items):
+            cur.execute("SAVEPOINT batch_item")
+            try:
+                result, status = operation(cur, item)
+            except sqlite3.IntegrityError:
+                result, status = {
+                    'success': False,
+                    'error': 'Article with this URL already exists'
+                }, 400
+            if status >= 400:
+                cur.execute("ROLLBACK TO batch_item")
+            cur.execute("RELEASE batch_item")
+            result.pop('message', None)
+            results.append({'index': index, 'status': status, **result})
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    if any(result['success'] for result in results):
+        related_articles_changed()
+    return results
 
-# ==================== CRUD API ENDPOINTS ====================
+def batch_response(results):
+    """Build the JSON response of a batch write: per-item results plus totals."""
+    succeeded = sum(1 for result in results if result['success'])
+    return jsonify({
+        'success': True,
+        'succeeded': succeeded,
+        'failed': len(results) - succeeded,
+        'results': results
+    }), 200
 
-@app.route('/api/articles', methods=['GET'])
-def get_articles():
-    """Get all articles (READ)."""
+@app.route('/api/articles/batch', methods=['GET'])
+@cached_response
+def get_articles_batch():
+    """
+    Get several articles by id in one request (READ).
+    Pass `ids=1,2,3` (at most BATCH_MAX_ITEMS); `fields=` works as for GET /api/articles.
+    Articles are returned in the order requested; unknown ids are listed in `missing`.
+    """
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-        
-        # Optional query parameters
-        limit = request.args.get('limit', type=int)
-        offset = request.args.get('offset', type=int, default=0)
-        
-        query = "SELECT * FROM articles ORDER BY id DESC"
-        params = []
-        
-        if limit:
-            query += " LIMIT ? OFFSET ?"
-            params = [limit, offset]
+        try:
+            values = [value.strip() for value in request.args.get('ids', '').split(',') if value.strip()]
+            if not all(value.isdigit() for value in values):
+                raise ValueError('Ids must be integers')
+            ids = parse_batch_ids([int(value) for value in values])
+            fields = parse_fields(request.args.get('fields'))
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
         
-        cur.execute(query, params)
-        articles = cur.fetchall()
-        conn.close()
+        conn = get_read_db()
+        cur = conn.cursor()
+        cur.execute(f"""
+            SELECT {', '.join(fields)} FROM articles
+            WHERE id IN ({', '.join('?' * len(ids))})
+        """, ids)
+        found = {article['id']: article for article in cur.fetchall()}
         
         return jsonify({
             'success': True,
-            'count': len(articles),
-            'articles': [dict(article) for article in articles]
+            'count': len(found),
+            'articles': [article_dict(found[article_id]) for article_id in ids if article_id in found],
+            'missing': [article_id for article_id in ids if article_id not in found]
         }), 200
     except Exception as e:
         return jsonify({
@@ -384,175 +3328,227 @@ def get_articles():
             'error': str(e)
         }), 500
 
-@app.route('/api/articles/<int:article_id>', methods=['GET'])
-def get_article(article_id):
-    """Get a specific article by ID (READ)."""
+@app.route('/api/articles/batch', methods=['POST'])
+def create_articles_batch():
+    """
+    Create several articles in one transaction (CREATE).
+    Body: {"articles": [{...}, ...]}, each item as for POST /api/articles.
+    Returns one result per item; failed items are skipped, the rest are committed.
+    """
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-        cur.execute("SELECT * FROM articles WHERE id = ?", (article_id,))
-        article = cur.fetchone()
-        conn.close()
-        
-        if article:
+        try:
+            items = batch_items(request.get_json(silent=True), 'articles')
+        except ValueError as e:
             return jsonify({
-                'success': True,
-                'article': dict(article)
-            }), 200
-        else:
+                'success': False,
+                'error': str(e)
+            }), 400
+        return batch_response(run_batch(get_db(), items, insert_article))
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/articles/batch', methods=['PATCH'])
+def update_articles_batch():
+    """
+    Update several articles in one transaction (UPDATE).
+    Body: {"articles": [{"id": 1, "title": ...}, ...]}; only the fields given are changed.
+    Returns one result per item; failed items are skipped, the rest are committed.
+    """
+    def update(cur, item):
+        article_id = item.get('id') if isinstance(item, dict) else None
+        if not isinstance(article_id, int) or isinstance(article_id, bool):
+            return {
+                'success': False,
+                'error': 'Article id is required'
+            }, 400
+        result, status = apply_article_update(cur, article_id, item)
+        return {'article_id': article_id, **result}, status
+    
+    try:
+        try:
+            items = batch_items(request.get_json(silent=True), 'articles')
+        except ValueError as e:
             return jsonify({
                 'success': False,
-                'error': 'Article not found'
-            }), 404
+                'error': str(e)
+            }), 400
+        return batch_response(run_batch(get_db(), items, update))
     except Exception as e:
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
-@app.route('/api/articles', methods=['POST'])
-def create_article():
-    """Create a new article (CREATE)."""
+@app.route('/api/articles/batch', methods=['DELETE'])
+def delete_articles_batch():
+    """
+    Delete several articles in one transaction (DELETE).
+    Body: {"ids": [1, 2, 3]}.
+    Returns one result per id; unknown ids are reported as not found.
+    """
+    def delete(cur, article_id):
+        result, status = delete_article_row(cur, article_id)
+        return {'article_id': article_id, **result}, status
+    
     try:
-        data = request.get_json()
-        
-        # Validate required fields
-        if not data or not data.get('title') or not data.get('url'):
+        try:
+            data = request.get_json(silent=True)
+            ids = parse_batch_ids(data.get('ids') if isinstance(data, dict) else None)
+        except ValueError as e:
             return jsonify({
                 'success': False,
-                'error': 'Title and URL are required'
+                'error': str(e)
             }), 400
-        
-        conn = get_db_connection()
-        cur = conn.cursor()
-        
-        cur.execute("""
-            INSERT INTO articles (title, url, content, author, published_date)
-            VALUES (?, ?, ?, ?, ?)
-        """, (
-            data.get('title'),
-            data.get('url'),
-            data.get('content', ''),
-            data.get('author', ''),
-            data.get('published_date', '')
-        ))
-        
-        article_id = cur.lastrowid
-        conn.commit()
-        conn.close()
-        
+        return batch_response(run_batch(get_db(), ids, delete))
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/articles/scrape', methods=['POST'])
+def scrape_articles_endpoint():
+    """
+    Endpoint to trigger article scraping in the background.
+    Pass mode=archive to incrementally crawl the whole archive
+    (add full=true to walk every listing page again), or mode=refresh to
+    re-check the stored articles most likely to have changed.
+    Returns the job id right away; if a scrape with the same mode and `full`
+    is already running, the request joins that job instead of starting
+    another one. A running job with a different mode or `full` gives 409
+    with that job's id, mode and `full`.
+    """
+    try:
+        mode = request.args.get('mode')
+        if mode not in ('archive', 'refresh'):
+            mode = 'latest'
+        full = request.args.get('full', '').lower() in ('1', 'true', 'yes')
+        job_id, joined = start_scrape_job(mode, full)
         return jsonify({
             'success': True,
-            'message': 'Article created successfully',
-            'article_id': article_id
-        }), 201
-    except sqlite3.IntegrityError:
+            'message': 'Joined running scrape job' if joined else 'Scrape job started',
+            'job_id': job_id,
+            'joined': joined
+        }), 202
+    except ScrapeJobConflict as e:
         return jsonify({
             'success': False,
-            'error': 'Article with this URL already exists'
-        }), 400
+            'error': str(e),
+            'job_id': e.job_id,
+            'mode': e.mode,
+            'full': e.full
+        }), 409
     except Exception as e:
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
-@app.route('/api/articles/<int:article_id>', methods=['PUT'])
-def update_article(article_id):
-    """Update an existing article (UPDATE)."""
+@app.route('/api/articles/scrape/jobs/<int:job_id>', methods=['GET'])
+def get_scrape_job(job_id):
+    """Get the status and progress of a scrape job."""
     try:
-        data = request.get_json()
+        conn = get_read_db()
+        cur = conn.cursor()
+        cur.execute("SELECT * FROM scrape_jobs WHERE id = ?", (job_id,))
+        job = cur.fetchone()
         
-        if not data:
+        if job:
+            return jsonify({
+                'success': True,
+                'job': dict(job)
+            }), 200
+        else:
             return jsonify({
                 'success': False,
-                'error': 'No data provided'
-            }), 400
-        
-        conn = get_db_connection()
+                'error': 'Scrape job not found'
+            }), 404
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/articles/scrape/jobs/<int:job_id>/cancel', methods=['POST'])
+def cancel_scrape_job(job_id):
+    """Request cancellation of a queued or running scrape job."""
+    try:
+        conn = get_db()
         cur = conn.cursor()
-        
-        # Check if article exists
-        cur.execute("SELECT id FROM articles WHERE id = ?", (article_id,))
-        if not cur.fetchone():
-            conn.close()
+        cur.execute("SELECT status FROM scrape_jobs WHERE id = ?", (job_id,))
+        job = cur.fetchone()
+        if not job:
             return jsonify({
                 'success': False,
-                'error': 'Article not found'
+                'error': 'Scrape job not found'
             }), 404
         
-        # Build update query dynamically based on provided fields
-        update_fields = []
-        values = []
-        
-        if 'title' in data:
-            update_fields.append("title = ?")
-            values.append(data['title'])
-        if 'url' in data:
-            update_fields.append("url = ?")
-            values.append(data['url'])
-        if 'content' in data:
-            update_fields.append("content = ?")
-            values.append(data['content'])
-        if 'author' in data:
-            update_fields.append("author = ?")
-            values.append(data['author'])
-        if 'published_date' in data:
-            update_fields.append("published_date = ?")
-            values.append(data['published_date'])
-        
-        if not update_fields:
-            conn.close()
+        if job['status'] not in ('queued', 'running'):
             return jsonify({
                 'success': False,
-                'error': 'No valid fields to update'
-            }), 400
+                'error': f"Scrape job already {job['status']}"
+            }), 409
         
-        values.append(article_id)
-        query = f"UPDATE articles SET {', '.join(update_fields)} WHERE id = ?"
-        
-        cur.execute(query, values)
+        cur.execute("UPDATE scrape_jobs SET cancel_requested = 1 WHERE id = ?", (job_id,))
         conn.commit()
-        conn.close()
         
         return jsonify({
             'success': True,
-            'message': 'Article updated successfully'
-        }), 200
-    except sqlite3.IntegrityError:
-        return jsonify({
-            'success': False,
-            'error': 'Article with this URL already exists'
-        }), 400
+            'message': 'Cancellation requested'
+        }), 202
     except Exception as e:
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
-@app.route('/api/articles/<int:article_id>', methods=['DELETE'])
-def delete_article(article_id):
-    """Delete an article (DELETE)."""
+@app.route('/api/articles/stats', methods=['GET'])
+@cached_response
+def get_stats():
+    """
+    Get statistics about stored articles.
+    All figures are read from counters maintained by triggers, so the cost
+    does not depend on the number of articles.
+    """
     try:
-        conn = get_db_connection()
+        conn = get_read_db()
         cur = conn.cursor()
         
-        # Check if article exists
-        cur.execute("SELECT id FROM articles WHERE id = ?", (article_id,))
-        if not cur.fetchone():
-            conn.close()
-            return jsonify({
-                'success': False,
-                'error': 'Article not found'
-            }), 404
+        cur.execute("SELECT * FROM article_stats WHERE id = 1")
+        totals = cur.fetchone()
         
-        cur.execute("DELETE FROM articles WHERE id = ?", (article_id,))
-        conn.commit()
-        conn.close()
+        cur.execute("""
+            SELECT author, article_count FROM author_stats
+            WHERE author != ''
+            ORDER BY article_count DESC, author
+            LIMIT ?
+        """, (STATS_MAX_AUTHORS,))
+        per_author = cur.fetchall()
+        
+        cur.execute("""
+            SELECT day, article_count FROM daily_scrape_stats
+            ORDER BY day DESC
+            LIMIT ?
+        """, (STATS_MAX_DAYS,))
+        per_day = cur.fetchall()
+        
+        total = totals['total_articles']
+        with_content = totals['articles_with_content']
         
         return jsonify({
             'success': True,
-            'message': 'Article deleted successfully'
+            'stats': {
+                'total_articles': total,
+                'articles_with_content': with_content,
+                'articles_without_content': total - with_content,
+                'total_content_bytes': totals['total_content_bytes'],
+                'last_scraped_at': totals['last_scraped_at'],
+                'articles_per_author': {row['author']: row['article_count'] for row in per_author},
+                'scrapes_per_day': {row['day']: row['article_count'] for row in per_day}
+            }
         }), 200
     except Exception as e:
         return jsonify({
@@ -560,44 +3556,329 @@ def delete_article(article_id):
             'error': str(e)
         }), 500
 
-@app.route('/api/articles/scrape', methods=['POST'])
-def scrape_articles_endpoint():
-    """Endpoint to trigger article scraping."""
+def iter_export_chunks(compress=False):
+    """
+    Yield all articles as NDJSON, one line per article in id order.
+    Rows are streamed from a dedicated read-only cursor in chunks of
+    EXPORT_CHUNK_ROWS, so memory use does not grow with the table.
+    With `compress`, the stream is gzip-encoded on the fly.
+    """
+    conn = get_readonly_db_connection()
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    try:
+        cur = conn.execute(f"SELECT {', '.join(ARTICLE_COLUMNS)} FROM articles ORDER BY id")
+        while True:
+            rows = cur.fetchmany(EXPORT_CHUNK_ROWS)
+            if not rows:
+                break
+            chunk = ''.join(json.dumps(article_dict(row), ensure_ascii=False) + '\n' for row in rows).encode('utf-8')
+            if compressor:
+                chunk = compressor.compress(chunk)
+                if not chunk:
+                    continue
+            yield chunk
+        if compressor:
+            yield compressor.flush()
+    finally:
+        conn.close()
+
+@app.route('/api/articles/export', methods=['GET'])
+def export_articles():
+    """
+    Stream every article as NDJSON (one JSON object per line).
+    Pass gzip=true to download a gzip-compressed file instead.
+    """
+    compress = request.args.get('gzip', '').lower() in ('1', 'true', 'yes')
+    filename = 'articles.ndjson.gz' if compress else 'articles.ndjson'
+    return Response(
+        iter_export_chunks(compress),
+        mimetype='application/gzip' if compress else 'application/x-ndjson',
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
+
+def import_article_rows(conn, rows, counts, skipped, restore=False):
+    """
+    Write exported articles in one transaction, keeping their scraped_at.
+    Rows are matched on url: an existing article is updated in place and keeps
+    its id, a new url is inserted with a fresh id, so importing another
+    database's export never overwrites unrelated local articles.
+    With `restore`, rows are written back under their own id instead (an
+    export restored into the database it came from round-trips exactly); a
+    row whose url belongs to a different article is then skipped. Derived
+    columns (content hash, SimHash, published_epoch, duplicate_of) are recomputed.
+    `rows` is a list of (line number, article dictionary). Updates `counts`
+    in place and appends skipped rows to `skipped` as {'line', 'url', 'error'}.
+    """
+    cur = conn.cursor()
+    written = set()
+    try:
+        for line_number, data in rows:
+            article_id = data.get('id') if restore else None
+            if article_id is None:
+                cur.execute("SELECT id FROM articles WHERE url = ?", (data['url'],))
+                row = cur.fetchone()
+                article_id = row['id'] if row else None
+            
+            text = data.get('content')
+            content_hash, fingerprint = content_fingerprint(text)
+            existing = None
+            if article_id is not None:
+                cur.execute("""
+                    SELECT title, url, author, published_date, content_hash, scraped_at
+                    FROM articles WHERE id = ?
+                """, (article_id,))
+                existing = cur.fetchone()
+            # Rows without scraped_at are stamped like a fresh write, so it only counts when given
+            if existing is not None and (
+                (data['title'], data['url'], data.get('author') or '', data.get('published_date') or '',
+                 content_hash, data.get('scraped_at') or existing['scraped_at'])
+                == (existing['title'], existing['url'], existing['author'] or '', existing['published_date'] or '',
+                    existing['content_hash'], existing['scraped_at'])
+            ):
+                counts['unchanged'] += 1
+                continue
+            
+            content, content_bytes = encode_content(text)
+            try:
+                cur.execute("""
+                    INSERT INTO articles (id, title, url, content, content_bytes, author, published_date,
+                                          published_epoch, scraped_at, content_hash, simhash)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP), ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET
+                        title = excluded.title,
+                        url = excluded.url,
+                        content = excluded.content,
+                        content_bytes = excluded.content_bytes,
+                        author = excluded.author,
+                        published_date = excluded.published_date,
+                        published_epoch = excluded.published_epoch,
+                        scraped_at = excluded.scraped_at,
+                        content_hash = excluded.content_hash,
+                        simhash = excluded.simhash
+                """, (
+                    article_id, data['title'], data['url'], content, content_bytes,
+                    data.get('author'), data.get('published_date'),
+                    parse_published_date(data.get('published_date')), data.get('scraped_at'),
+                    content_hash, fingerprint
+                ))
+            except sqlite3.IntegrityError:
+                cur.execute("SELECT id FROM articles WHERE url = ?", (data['url'],))
+                owner = cur.fetchone()
+                counts['skipped'] += 1
+                skipped.append({
+                    'line': line_number,
+                    'url': data['url'],
+                    'error': f"URL already belongs to article {owner['id']}" if owner else 'Constraint violation'
+                })
+                continue
+            
+            counts['updated' if existing is not None else 'inserted'] += 1
+            if article_id is None:
+                article_id = cur.lastrowid
+            written.add(article_id)
+        
+        mark_near_duplicates(conn, list(written))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    if written:
+        related_articles_changed()
+
+@app.route('/api/articles/import', methods=['POST'])
+def import_articles():
+    """
+    Import articles from an NDJSON request body (one JSON object per line),
+    such as the output of /api/articles/export (see import_article_rows).
+    Rows are matched on url; pass restore=true to write them back under their
+    own ids. The body is read one line at a time and written in transactions of
+    IMPORT_BATCH_SIZE lines, so memory use stays bounded for large imports.
+    Gzip bodies are accepted with Content-Encoding: gzip or gzip=true.
+    Rows whose url belongs to another article (restore=true) are reported in
+    `skipped` (capped at IMPORT_MAX_REPORTED_ERRORS entries).
+    A malformed line (bad JSON, missing title or url, a field of the wrong
+    type) stops the import with 400 naming the line. The lines before it have
+    already been imported, and the response counts them, so the import can be
+    resumed after fixing the line (re-imported rows come back unchanged).
+    """
     try:
-        count = scrape_and_store_articles()
+        stream = request.stream
+        if (request.headers.get('Content-Encoding', '').lower() == 'gzip' or
+                request.args.get('gzip', '').lower() in ('1', 'true', 'yes')):
+            stream = gzip.GzipFile(fileobj=stream, mode='rb')
+        restore = request.args.get('restore', '').lower() in ('1', 'true', 'yes')
+        
+        conn = get_db()
+        counts = dict.fromkeys(IMPORT_COUNT_KEYS, 0)
+        skipped = []
+        batch = []
+        
+        def flush():
+            import_article_rows(conn, batch, counts, skipped, restore)
+            del skipped[IMPORT_MAX_REPORTED_ERRORS:]
+            batch.clear()
+        
+        def summary():
+            return {
+                'inserted': counts['inserted'],
+                'updated': counts['updated'],
+                'unchanged': counts['unchanged'],
+                'skipped_count': counts['skipped'],
+                'skipped': skipped
+            }
+        
+        for line_number, line in enumerate(stream, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                data = json.loads(line)
+                error = article_field_error(data, fields=ARTICLE_TEXT_FIELDS + ('scraped_at',))
+                if error:
+                    raise ValueError(error)
+                article_id = data.get('id')
+                if article_id is not None and (
+                        not isinstance(article_id, int) or isinstance(article_id, bool) or article_id < 1):
+                    raise ValueError('Article id must be a positive integer')
+            except ValueError as e:
+                # Keep the valid lines read so far, then stop at the bad one
+                if batch:
+                    flush()
+                return jsonify({
+                    'success': False,
+                    'error': f'Line {line_number}: {e}',
+                    'line': line_number,
+                    **summary()
+                }), 400
+            
+            batch.append((line_number, data))
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                flush()
+        if batch:
+            flush()
+        
         return jsonify({
             'success': True,
-            'message': f'Successfully scraped and stored {count} articles',
-            'count': count
+            'message': f"Imported {counts['inserted'] + counts['updated'] + counts['unchanged']} articles",
+            **summary()
         }), 200
+    except (OSError, EOFError) as e:
+        # Corrupt or truncated gzip body
+        return jsonify({
+            'success': False,
+            'error': f'Invalid request body: {e}'
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
-@app.route('/api/articles/stats', methods=['GET'])
-def get_stats():
-    """Get statistics about stored articles."""
+# C0/C1 control characters; FTS5 cuts a query string at NUL
+_CONTROL_CHARACTERS = re.compile(r'[\x00-\x1f\x7f-\x9f]')
+
+def build_fts_query(text):
+    """
+    Turn free text into an FTS5 query matching all of its words.
+    Each word is quoted so user input cannot inject FTS5 syntax, and control
+    characters separate words like whitespace.
+    """
+    terms = [term.replace('"', '""') for term in _CONTROL_CHARACTERS.sub(' ', text).split()]
+    return ' '.join(f'"{term}"' for term in terms if term)
+
+def escape_highlight(text):
+    """
+    HTML-escape FTS5 highlight()/snippet() output produced with the sentinel
+    delimiters, so article text can never inject markup.
+    Returns the escaped text with matches wrapped in <mark> tags (None stays None).
+    """
+    if text is None:
+        return None
+    return html.escape(text).replace(SEARCH_HIGHLIGHT_START, '<mark>').replace(SEARCH_HIGHLIGHT_END, '</mark>')
+
+def highlight_results(rows, fts_query):
+    """
+    Build the title highlight and content snippet for a page of search results.
+    articles_fts keeps no text, so the page's decompressed articles are indexed
+    into a throwaway in-memory FTS5 table with the same tokenizer and the query
+    is run again there.
+    Returns {article id: (title_highlight, snippet)}, HTML-escaped.
+    """
+    mem = sqlite3.connect(':memory:')
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
+        mem.execute(f"CREATE VIRTUAL TABLE page USING fts5(title, content, author, tokenize='{SEARCH_TOKENIZER}')")
+        mem.executemany("INSERT INTO page (rowid, title, content, author) VALUES (?, ?, ?, ?)", [
+            (row['id'], row['title'], decompress_content(row['content']), row['author'])
+            for row in rows
+        ])
+        highlights = mem.execute("""
+            SELECT rowid,
+                   highlight(page, 0, :start, :end),
+                   snippet(page, 1, :start, :end, '...', 24)
+            FROM page
+            WHERE page MATCH :query
+        """, {'start': SEARCH_HIGHLIGHT_START, 'end': SEARCH_HIGHLIGHT_END, 'query': fts_query})
+        return {
+            article_id: (escape_highlight(title), escape_highlight(snippet))
+            for article_id, title, snippet in highlights
+        }
+    finally:
+        mem.close()
+
+@app.route('/api/articles/search', methods=['GET'])
+def search_articles():
+    """
+    Full-text search over article title, content and author.
+    Results are ranked by bm25 (title matches weigh most) and include
+    highlighted snippets (HTML-escaped, matches in <mark>). Paginate with
+    `limit` and `offset`. Articles changed since the last search are indexed first.
+    """
+    try:
+        fts_query = build_fts_query(request.args.get('q', ''))
+        if not fts_query:
+            return jsonify({
+                'success': False,
+                'error': 'Query parameter q is required'
+            }), 400
         
-        cur.execute("SELECT COUNT(*) as total FROM articles")
-        total = cur.fetchone()['total']
+        limit = request.args.get('limit', type=int) or SEARCH_DEFAULT_PAGE_SIZE
+        limit = max(1, min(limit, SEARCH_MAX_PAGE_SIZE))
+        offset = max(0, request.args.get('offset', type=int, default=0))
         
-        cur.execute("SELECT COUNT(*) as with_content FROM articles WHERE content != '' AND content IS NOT NULL")
-        with_content = cur.fetchone()['with_content']
+        conn = get_read_db()
+        cur = conn.cursor()
+        cur.execute("SELECT EXISTS (SELECT 1 FROM search_pending)")
+        if cur.fetchone()[0]:
+            sync_search_index(get_db())
+        cur.execute("""
+            SELECT a.id, a.title, a.url, a.author, a.published_date, a.content,
+                   bm25(articles_fts, 10.0, 1.0, 2.0) AS score
+            FROM articles_fts
+            JOIN articles a ON a.id = articles_fts.rowid
+            WHERE articles_fts MATCH :query
+            ORDER BY score
+            LIMIT :limit OFFSET :offset
+        """, {'query': fts_query, 'limit': limit + 1, 'offset': offset})
+        results = cur.fetchall()
         
-        conn.close()
+        next_offset = None
+        if len(results) > limit:
+            results = results[:limit]
+            next_offset = offset + limit
         
+        highlights = highlight_results(results, fts_query)
         return jsonify({
             'success': True,
-            'stats': {
-                'total_articles': total,
-                'articles_with_content': with_content,
-                'articles_without_content': total - with_content
-            }
+            'count': len(results),
+            'results': [
+                {
+                    **{key: result[key] for key in result.keys() if key != 'content'},
+                    'title_highlight': highlights.get(result['id'], (None, None))[0],
+                    'snippet': highlights.get(result['id'], (None, None))[1]
+                }
+                for result in results
+            ],
+            'next_offset': next_offset
         }), 200
     except Exception as e:
         return jsonify({
@@ -605,13 +3886,41 @@ def get_stats():
             'error': str(e)
         }), 500
 
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """
+    Prometheus scrape endpoint: per-route request counts and latency histograms,
+    scraper stage timings, fetch status/error counters and scrape run totals.
+    Returns the metrics in the Prometheus text format.
+    """
+    if not metrics.enabled:
+        return jsonify({
+            'success': False,
+            'error': 'Metrics are disabled'
+        }), 404
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
 if __name__ == '__main__':
     # Initialize database
     init_articles_db()
     
-    # Scrape articles on startup
-    print("Starting article scraping...")
-    scrape_and_store_articles()
+    # Scrape articles on startup in the background (SCRAPE_ON_START=none to skip),
+    # so the API serves the existing articles.db right away. With the debug
+    # reloader only the serving child process starts the job.
+    if SCRAPE_ON_START == 'background' and os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        try:
+            job_id, joined = start_scrape_job()
+            print(f"Started background scrape job {job_id}." if not joined
+                  else f"Scrape job {job_id} is already running.")
+        except ScrapeJobConflict as e:
+            print(f"{e}; skipping the startup scrape.")
+    
+    # Fingerprint old rows, load or build the related-articles index, and run
+    # refresh cycles, in the background
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_fingerprint_backfill()
+        start_related_index()
+        start_refresh_scheduler()
     
     # Run Flask app
     print("Starting Flask server on http://localhost:5001")
@@ -0,0 +1,318 @@
+"""
+API load-test and latency benchmark for the article CRUD endpoints.
+
+Seeds databases of several sizes, serves the Flask app from a separate
+threaded server process and drives it with concurrent readers and writers.
+Reports p50/p95/p99 latency and throughput per operation, plus SQLite
+lock-contention errors ("database is locked") seen under mixed load.
+
+Usage:
+    python benchmarks/bench_api.py --output api-before.json
+    python benchmarks/bench_api.py --rows 1000,100000 --compare api-before.json
+"""
+
+import argparse
+import contextlib
+import http.client
+import io
+import json
+import logging
+import os
+import random
+import shutil
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import quote
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+from fixtures import WORDS, AUTHORS  # noqa: E402
+from report import new_report, load_report, save_report, print_report  # noqa: E402
+
+SEED_CHUNK_ROWS = 10000
+
+# Operation mix: (name, weight)
+READ_MIX = [('list', 3), ('list_cursor', 2), ('list_author', 1), ('get', 4), ('stats', 1)]
+WRITE_MIX = [('create', 5), ('update', 4), ('delete', 1)]
+
+def _words(rng, size):
+    """Return roughly `size` bytes of random words."""
+    return ' '.join(rng.choices(WORDS, k=max(1, size // 8)))
+
+def _seed_row(rng, index, content_bytes):
+    """
+    Build one synthetic article row, fingerprinted and compressed as the app stores it.
+    """
+    content = _words(rng, content_bytes)
+    published_date = f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T10:00:00+00:00"
+    return (
+        f"Seed article {index}: {_words(rng, 40)}",
+        f"https://bench.local/blogs/seed-{index}/",
+    ) + app.encode_content(content) + (
+        rng.choice(AUTHORS),
+        published_date,
+        app.parse_published_date(published_date),
+    ) + app.content_fingerprint(content)
+
+def seed_database(path, rows, content_bytes):
+    """
+    Create a database at `path` with `rows` synthetic articles.
+    Rows go through the normal triggers so the FTS index, stats
+    and data version are populated as in production.
+    """
+    app.DB_PATH = path
+    with contextlib.redirect_stdout(io.StringIO()):
+        app.init_articles_db()
+    rng = random.Random(rows)
+    conn = app.get_db_connection()
+    start = time.perf_counter()
+    for first in range(0, rows, SEED_CHUNK_ROWS):
+        seeds = [_seed_row(rng, index, content_bytes) for index in range(first, min(first + SEED_CHUNK_ROWS, rows))]
+        conn.executemany("""
+            INSERT INTO articles (title, url, content, content_bytes, author, published_date,
+                                  published_epoch, content_hash, simhash)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, seeds)
+        conn.commit()
+        print(f"  seeded {min(first + SEED_CHUNK_ROWS, rows)}/{rows} rows", end='\r', flush=True)
+    # Index the queued rows now, so the first search request does not pay for it
+    app.sync_search_index(conn)
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    conn.close()
+    print(f"  seeded {rows} rows in {time.perf_counter() - start:.1f}s")
+
+def seeded_database(db_dir, rows, content_bytes):
+    """Return the path of a seeded database, building it once per (rows, content size)."""
+    os.makedirs(db_dir, exist_ok=True)
+    path = os.path.join(db_dir, f"seed-{rows}-{content_bytes}.db")
+    if os.path.exists(path):
+        with contextlib.closing(sqlite3.connect(path)) as conn:
+            if conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0] == rows:
+                return path
+        os.remove(path)
+    seed_database(path + '.tmp', rows, content_bytes)
+    os.replace(path + '.tmp', path)
+    return path
+
+def serve(db_path):
+    """Run the API on a free port (server process entry point); prints the port."""
+    from werkzeug.serving import make_server, WSGIRequestHandler
+
+    class RequestHandler(WSGIRequestHandler):
+        # Headers and body are written separately; avoid Nagle/delayed-ACK stalls
+        disable_nagle_algorithm = True
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    app.DB_PATH = db_path
+    with contextlib.redirect_stdout(io.StringIO()):
+        app.init_articles_db()
+    server = make_server('127.0.0.1', 0, app.app, threaded=True, request_handler=RequestHandler)
+    print(server.server_port, flush=True)
+    server.serve_forever()
+
+def start_server(db_path):
+    """Start the server process and return (process, port)."""
+    process = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), '--serve', db_path],
+        stdout=subprocess.PIPE, text=True
+    )
+    port = process.stdout.readline().strip()
+    if not port:
+        process.kill()
+        raise RuntimeError('API server failed to start')
+    return process, int(port)
+
+class LoadClient:
+    """One keep-alive HTTP connection plus the latency samples it recorded."""
+
+    def __init__(self, port, rows, seed):
+        self.port = port
+        self.rows = rows
+        self.rng = random.Random(seed)
+        self.conn = None
+        self.samples = {}
+        self.created = []
+
+    def request(self, name, method, path, body=None):
+        """Send a request and record its latency under `name`."""
+        headers = {'Content-Type': 'application/json'} if body is not None else {}
+        payload = json.dumps(body) if body is not None else None
+        start = time.perf_counter()
+        try:
+            if self.conn is None:
+                self.conn = http.client.HTTPConnection('127.0.0.1', self.port, timeout=60)
+                self.conn.connect()
+                self.conn.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.conn.request(method, path, payload, headers)
+            response = self.conn.getresponse()
+            data = response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            self.conn.close()
+            self.conn = None
+            status, data = 0, b''
+        elapsed = time.perf_counter() - start
+
+        stats = self.samples.setdefault(name, {'latencies': [], 'errors': 0, 'lock_errors': 0})
+        stats['latencies'].append(elapsed)
+        if status >= 500 and b'locked' in data:
+            stats['lock_errors'] += 1
+        elif status >= 500 or status == 0:
+            stats['errors'] += 1
+        return status, data
+
+    def read(self, name):
+        if name == 'list':
+            self.request(name, 'GET', '/api/articles?limit=20')
+        elif name == 'list_cursor':
+            cursor = app.encode_cursor({'id': self.rng.randint(1, self.rows)})
+            self.request(name, 'GET', f'/api/articles?limit=20&cursor={cursor}')
+        elif name == 'list_author':
+            author = quote(self.rng.choice(AUTHORS))
+            self.request(name, 'GET', f'/api/articles?limit=20&sort=published&author={author}')
+        elif name == 'get':
+            self.request(name, 'GET', f'/api/articles/{self.rng.randint(1, self.rows)}')
+        else:
+            self.request(name, 'GET', '/api/articles/stats')
+
+    def write(self, name):
+        if name == 'delete' and self.created:
+            article_id = self.created.pop(self.rng.randrange(len(self.created)))
+            self.request(name, 'DELETE', f'/api/articles/{article_id}')
+        elif name == 'update':
+            self.request(name, 'PUT', f'/api/articles/{self.rng.randint(1, self.rows)}', {
+                'content': _words(self.rng, 512), 'author': self.rng.choice(AUTHORS)
+            })
+        else:
+            status, data = self.request('create', 'POST', '/api/articles', {
+                'title': f"Load test {_words(self.rng, 40)}",
+                'url': f"https://bench.local/blogs/load-{self.rng.getrandbits(64):x}/",
+                'content': _words(self.rng, 512),
+                'author': self.rng.choice(AUTHORS),
+            })
+            if status == 201:
+                self.created.append(json.loads(data)['article_id'])
+
+    def run(self, mix, action, deadline):
+        names = [name for name, _ in mix]
+        weights = [weight for _, weight in mix]
+        while time.perf_counter() < deadline:
+            action(self.rng.choices(names, weights)[0])
+        if self.conn is not None:
+            self.conn.close()
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+def summarize(clients, elapsed):
+    """Merge client samples into per-operation latency and throughput figures."""
+    merged = {}
+    for client in clients:
+        for name, stats in client.samples.items():
+            target = merged.setdefault(name, {'latencies': [], 'errors': 0, 'lock_errors': 0})
+            target['latencies'].extend(stats['latencies'])
+            target['errors'] += stats['errors']
+            target['lock_errors'] += stats['lock_errors']
+
+    results = {}
+    everything = []
+    for name in sorted(merged):
+        latencies = sorted(merged[name]['latencies'])
+        everything.extend(latencies)
+        results[name] = {
+            'requests': len(latencies),
+            'throughput_rps': len(latencies) / elapsed,
+            'p50_ms': percentile(latencies, 0.50) * 1000,
+            'p95_ms': percentile(latencies, 0.95) * 1000,
+            'p99_ms': percentile(latencies, 0.99) * 1000,
+            'errors': merged[name]['errors'],
+            'lock_errors': merged[name]['lock_errors'],
+        }
+    everything.sort()
+    results['total'] = {
+        'requests': len(everything),
+        'throughput_rps': len(everything) / elapsed,
+        'p50_ms': percentile(everything, 0.50) * 1000,
+        'p95_ms': percentile(everything, 0.95) * 1000,
+        'p99_ms': percentile(everything, 0.99) * 1000,
+        'errors': sum(stats['errors'] for stats in merged.values()),
+        'lock_errors': sum(stats['lock_errors'] for stats in merged.values()),
+    }
+    return results
+
+def bench_size(args, rows, workdir):
+    """Run the mixed read/write load against a fresh copy of a seeded database."""
+    print(f"Database with {rows} rows")
+    seed_path = seeded_database(args.db_dir, rows, args.content_bytes)
+    db_path = os.path.join(workdir, f'articles-{rows}.db')
+    shutil.copyfile(seed_path, db_path)
+
+    process, port = start_server(db_path)
+    try:
+        readers = [LoadClient(port, rows, seed=index) for index in range(args.readers)]
+        writers = [LoadClient(port, rows, seed=1000 + index) for index in range(args.writers)]
+        deadline = time.perf_counter() + args.duration
+        threads = [
+            threading.Thread(target=client.run, args=(READ_MIX, client.read, deadline))
+            for client in readers
+        ] + [
+            threading.Thread(target=client.run, args=(WRITE_MIX, client.write, deadline))
+            for client in writers
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return summarize(readers + writers, time.perf_counter() - start)
+    finally:
+        process.terminate()
+        process.wait()
+
+def run(args):
+    workdir = tempfile.mkdtemp(prefix='api-bench-')
+    try:
+        results = {f'rows_{rows}': bench_size(args, rows, workdir) for rows in args.rows}
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return new_report('api', {
+        'rows': args.rows, 'content_bytes': args.content_bytes, 'duration': args.duration,
+        'readers': args.readers, 'writers': args.writers, 'db_pool_size': app.DB_POOL_SIZE,
+    }, results)
+
+def main():
+    if len(sys.argv) == 3 and sys.argv[1] == '--serve':
+        serve(sys.argv[2])
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', default='1000,100000,1000000',
+                        help='comma-separated database sizes to test')
+    parser.add_argument('--content-bytes', type=int, default=1024, help='approximate content size per seeded row')
+    parser.add_argument('--duration', type=float, default=15.0, help='seconds of load per database size')
+    parser.add_argument('--readers', type=int, default=8, help='concurrent reader connections')
+    parser.add_argument('--writers', type=int, default=2, help='concurrent writer connections')
+    parser.add_argument('--db-dir', default=os.path.join(tempfile.gettempdir(), 'beyond_chats_api_bench'),
+                        help='where seeded databases are kept between runs')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    parser.add_argument('--compare', help='baseline JSON results to compare against')
+    args = parser.parse_args()
+    args.rows = [int(rows) for rows in args.rows.split(',') if rows]
+
+    report = run(args)
+    print_report(report, load_report(args.compare) if args.compare else None)
+    if args.output:
+        save_report(report, args.output)
+
+if __name__ == '__main__':
+    main()
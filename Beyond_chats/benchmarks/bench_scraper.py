@@ -0,0 +1,168 @@
+"""
+Offline scraper benchmark.
+
+Serves synthetic BeyondChats-style pages from a local stub server and measures
+find_last_page, scrape_articles_from_page, scrape_article_details, HTML parse
+time per page and a full archive crawl (cold and revalidated).
+
+Usage:
+    python benchmarks/bench_scraper.py --output results.json
+    python benchmarks/bench_scraper.py --latency-ms 50 --compare results.json
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+from extractor import parse_html, extract_article_details, extract_article_links  # noqa: E402
+from fixtures import (  # noqa: E402
+    BlogSite, start_stub_server, article_page_html, listing_page_html, article_slug
+)
+from report import new_report, load_report, save_report, print_report  # noqa: E402
+
+# Article body sizes (paragraph counts) used for the parse benchmark
+PARSE_SIZES = {'small': 5, 'medium': 40, 'large': 400}
+
+def _timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def bench_parse(iterations):
+    """Time parse + extraction for listing pages and article pages of several sizes."""
+    results = {}
+    listing = listing_page_html(3, 10, 12).encode('utf-8')
+    start = time.perf_counter()
+    for _ in range(iterations):
+        extract_article_links(parse_html(listing), 'http://bench/blogs/?page=3')
+    results['listing_ms_per_page'] = (time.perf_counter() - start) / iterations * 1000
+
+    for name, paragraphs in PARSE_SIZES.items():
+        html = article_page_html('post-1-1', paragraphs).encode('utf-8')
+        start = time.perf_counter()
+        for _ in range(iterations):
+            extract_article_details(parse_html(html))
+        results[f'article_{name}_ms_per_page'] = (time.perf_counter() - start) / iterations * 1000
+        results[f'article_{name}_bytes'] = len(html)
+    return results
+
+def bench_fetch(site, base_url):
+    """Time the three scraper entry points against the stub server."""
+    results = {}
+
+    site.reset_counters()
+    last_page, elapsed = _timed(app.find_last_page, base_url, refresh=True)
+    results['find_last_page'] = {
+        'seconds': elapsed, 'requests': site.requests, 'last_page': last_page
+    }
+
+    site.reset_counters()
+    articles, elapsed = _timed(
+        app.scrape_articles_from_page, app.listing_page_url(base_url, site.pages), limit=site.per_page
+    )
+    results['scrape_articles_from_page'] = {
+        'seconds': elapsed, 'requests': site.requests, 'articles': len(articles),
+        'articles_per_sec': len(articles) / elapsed if elapsed else None
+    }
+
+    article_url = base_url + article_slug(1, 0) + '/'
+    site.reset_counters()
+    _, elapsed = _timed(app.scrape_article_details, article_url)
+    results['scrape_article_details'] = {'seconds': elapsed, 'requests': site.requests}
+    return results
+
+def bench_crawl(site, base_url, label):
+    """Run a full archive crawl and report throughput and peak Python memory."""
+    site.reset_counters()
+    tracemalloc.start()
+    counts, elapsed = _timed(app.crawl_archive, base_url, full=True)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    stored = sum(counts.values())
+    return {
+        'label': label,
+        'seconds': elapsed,
+        'requests': site.requests,
+        'not_modified': site.not_modified,
+        'bytes_received': site.bytes_sent,
+        'articles_stored': stored,
+        'pages_per_sec': site.requests / elapsed if elapsed else None,
+        'articles_per_sec': stored / elapsed if elapsed else None,
+        'peak_memory_bytes': peak,
+    }
+
+def bench_revalidate(site, base_url):
+    """Re-fetch every article page with a warm HTTP cache (304s, no re-parse)."""
+    urls = [
+        base_url + article_slug(page, index) + '/'
+        for page in range(1, site.pages + 1) for index in range(site.per_page)
+    ]
+    site.reset_counters()
+    _, elapsed = _timed(app.fetch_article_details_concurrently, urls)
+    return {
+        'seconds': elapsed,
+        'requests': site.requests,
+        'not_modified': site.not_modified,
+        'pages_per_sec': len(urls) / elapsed if elapsed else None,
+    }
+
+def run(args):
+    site = BlogSite(
+        pages=args.pages, per_page=args.per_page,
+        paragraphs=args.paragraphs, latency=args.latency_ms / 1000
+    )
+    server, base_url = start_stub_server(site)
+    workdir = tempfile.mkdtemp(prefix='scraper-bench-')
+    app.DB_PATH = os.path.join(workdir, 'articles.db')
+    app.HTTP_CACHE_PATH = os.path.join(workdir, 'http_cache.db')
+    app.SNAPSHOT_PATH = os.path.join(workdir, 'page_snapshots.db')
+    if args.workers:
+        app.SCRAPE_MAX_WORKERS = args.workers
+        app.SCRAPE_PER_HOST_LIMIT = args.workers
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            app.init_articles_db()
+        results = {
+            'parse': bench_parse(args.parse_iterations),
+            'fetch': bench_fetch(site, base_url),
+            'crawl_cold': bench_crawl(site, base_url, 'cold'),
+            'crawl_warm': bench_crawl(site, base_url, 'warm'),
+            'revalidate_articles': bench_revalidate(site, base_url),
+        }
+    finally:
+        server.shutdown()
+
+    return new_report('scraper', {
+        'pages': args.pages, 'per_page': args.per_page, 'paragraphs': args.paragraphs,
+        'latency_ms': args.latency_ms, 'workers': app.SCRAPE_MAX_WORKERS,
+        'per_host_limit': app.SCRAPE_PER_HOST_LIMIT,
+    }, results)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=20, help='listing pages on the stub blog')
+    parser.add_argument('--per-page', type=int, default=6, help='articles per listing page')
+    parser.add_argument('--paragraphs', type=int, default=40, help='paragraphs per article page')
+    parser.add_argument('--latency-ms', type=float, default=20.0, help='stub server latency per request')
+    parser.add_argument('--workers', type=int, default=0, help='override SCRAPE_MAX_WORKERS and per-host limit')
+    parser.add_argument('--parse-iterations', type=int, default=50, help='iterations per parse benchmark')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    parser.add_argument('--compare', help='baseline JSON results to compare against')
+    args = parser.parse_args()
+
+    report = run(args)
+    print_report(report, load_report(args.compare) if args.compare else None)
+    if args.output:
+        save_report(report, args.output)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,184 @@
+"""
+Synthetic BeyondChats-style HTML fixtures and a local HTTP stub server
+used by the offline scraper benchmarks.
+"""
+
+import hashlib
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+WORDS = (
+    'ai chatbot customer support healthcare patients clinic automation leads '
+    'conversion website visitors response time agents knowledge base accuracy '
+    'privacy trust workflow integration analytics engagement marketing sales'
+).split()
+
+AUTHORS = ['Simran Jain', 'pankaj', 'Ritika Sharma', 'Aman Verma']
+
+# Header/footer markup every page carries, like the real WordPress theme
+PAGE_CHROME_TOP = """
+<header class="site-header"><div class="header-inner"><a class="logo" href="/">BeyondChats</a>
+<nav class="main-navigation"><ul class="menu">
+<li class="menu-item"><a href="/">Home</a></li><li class="menu-item"><a href="/pricing/">Pricing</a></li>
+<li class="menu-item"><a href="/blogs/">Blogs</a></li><li class="menu-item"><a href="/contact/">Contact</a></li>
+</ul></nav></div></header>
+"""
+PAGE_CHROME_BOTTOM = """
+<footer class="site-footer"><div class="footer-widgets">
+<section class="widget"><h4 class="widget-title">Company</h4><ul><li><a href="/about/">About</a></li></ul></section>
+<section class="widget"><h4 class="widget-title">Legal</h4><ul><li><a href="/privacy/">Privacy</a></li></ul></section>
+</div><script>window.dataLayer = window.dataLayer || [];</script></footer>
+"""
+
+def _sentence(rng, words=14):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+def article_slug(page, index):
+    """Return the slug of the `index`-th article on listing page `page`."""
+    return f"post-{page}-{index}"
+
+def listing_page_html(page, last_page, per_page):
+    """Build a listing page with `per_page` article cards and pagination links."""
+    cards = []
+    for index in range(per_page):
+        slug = article_slug(page, index)
+        cards.append(f"""
+<article class="elementor-post elementor-grid-item post-{page * 100 + index} post type-post status-publish">
+  <div class="elementor-post__thumbnail"><img src="/img/{slug}.jpg" alt=""></div>
+  <div class="elementor-post__text">
+    <h3 class="elementor-post__title"><a href="/blogs/{slug}/">Article {page}-{index}: How AI helps</a></h3>
+    <div class="elementor-post__meta-data"><span class="elementor-post-date">April {index + 1}, 2025</span></div>
+    <a class="elementor-post__read-more" href="/blogs/{slug}/">Read More</a>
+  </div>
+</article>""")
+    numbers = sorted({1, max(1, page - 1), page, min(last_page, page + 1), last_page})
+    pagination = ''.join(
+        f'<a class="page-numbers" href="/blogs/?page={number}">{number}</a>' for number in numbers
+    )
+    return (
+        f'<!DOCTYPE html><html><head><title>Blogs - Page {page}</title></head><body>'
+        f'{PAGE_CHROME_TOP}<main class="site-main"><div class="elementor-posts-container">'
+        f'{"".join(cards)}</div><nav class="elementor-pagination">{pagination}</nav></main>'
+        f'{PAGE_CHROME_BOTTOM}</body></html>'
+    )
+
+def article_page_html(slug, paragraphs, seed=0):
+    """Build an article page whose body has `paragraphs` paragraphs."""
+    rng = random.Random(f"{seed}-{slug}")
+    body = []
+    for index in range(paragraphs):
+        if index and index % 6 == 0:
+            body.append(f'<h2 class="wp-block-heading">{_sentence(rng, 5)}</h2>')
+        body.append(f'<p>{_sentence(rng)} <strong>{_sentence(rng, 4)}</strong> {_sentence(rng)}</p>')
+    return (
+        f'<!DOCTYPE html><html><head><title>{slug} - BeyondChats</title>'
+        f'<meta property="og:type" content="article"></head><body class="post-template-default single">'
+        f'{PAGE_CHROME_TOP}<main class="site-main"><div class="elementor-widget-wrap">'
+        f'<h1 class="elementor-heading-title">Article {slug}</h1>'
+        f'<ul class="elementor-post-info"><li><span class="elementor-post-info__item--type-author">'
+        f'{rng.choice(AUTHORS)}</span></li><li><time class="entry-date published" '
+        f'datetime="2025-04-{rng.randint(1, 28):02d}T10:00:00+00:00">April 2025</time></li></ul>'
+        f'<div class="elementor-widget-theme-post-content"><div class="elementor-widget-container">'
+        f'{"".join(body)}</div></div></div></main>{PAGE_CHROME_BOTTOM}</body></html>'
+    )
+
+class BlogSite:
+    """Configuration and request counters for the stub blog."""
+
+    def __init__(self, pages=20, per_page=6, paragraphs=40, latency=0.0):
+        self.pages = pages
+        self.per_page = per_page
+        self.paragraphs = paragraphs
+        self.latency = latency
+        self.requests = 0
+        self.not_modified = 0
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self._cache = {}
+
+    @property
+    def article_count(self):
+        return self.pages * self.per_page
+
+    def render(self, path):
+        """Return the HTML for a path, or None for a 404."""
+        if path in self._cache:
+            return self._cache[path]
+        html = None
+        match = re.fullmatch(r'/blogs/(?:\?page=(\d+))?', path)
+        if match:
+            page = int(match.group(1) or 1)
+            if 1 <= page <= self.pages:
+                html = listing_page_html(page, self.pages, self.per_page)
+        else:
+            match = re.fullmatch(r'/blogs/(post-(\d+)-(\d+))/', path)
+            if match and int(match.group(2)) <= self.pages and int(match.group(3)) < self.per_page:
+                html = article_page_html(match.group(1), self.paragraphs)
+        if html is not None:
+            html = html.encode('utf-8')
+            self._cache[path] = html
+        return html
+
+    def count(self, sent, not_modified=False):
+        with self._lock:
+            self.requests += 1
+            self.bytes_sent += sent
+            self.not_modified += int(not_modified)
+
+    def reset_counters(self):
+        with self._lock:
+            self.requests = self.not_modified = self.bytes_sent = 0
+
+def _make_handler(site):
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        # Headers and body are written separately; avoid Nagle/delayed-ACK stalls
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if site.latency:
+                time.sleep(site.latency)
+            body = site.render(self.path)
+            if body is None:
+                body = b'Not found'
+                self.send_response(404)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                site.count(len(body))
+                return
+
+            etag = '"%s"' % hashlib.md5(body).hexdigest()
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                site.count(0, not_modified=True)
+                return
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            site.count(len(body))
+
+    return StubHandler
+
+def start_stub_server(site, host='127.0.0.1', port=0):
+    """
+    Serve a BlogSite on a background thread.
+    Returns (server, base_url); call server.shutdown() when done.
+    """
+    server = ThreadingHTTPServer((host, port), _make_handler(site))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/blogs/"
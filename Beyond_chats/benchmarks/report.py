@@ -0,0 +1,50 @@
+"""
+Shared helpers for saving, loading and printing benchmark results.
+"""
+
+import json
+import platform
+from datetime import datetime, timezone
+
+def new_report(name, config, results):
+    """Wrap benchmark results with run metadata."""
+    return {
+        'benchmark': name,
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': config,
+        'results': results,
+    }
+
+def load_report(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def save_report(report, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {path}")
+
+def flatten(data, prefix=''):
+    """Flatten nested result dictionaries into dotted metric names."""
+    flat = {}
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + '.'))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+def print_report(report, baseline=None):
+    """Print every metric, with the relative change against a baseline report if given."""
+    current = flatten(report['results'])
+    previous = flatten(baseline['results']) if baseline else {}
+    print(f"{report['benchmark']} benchmark {report['timestamp']} config={report['config']}")
+    for name, value in current.items():
+        line = f"  {name:60} {value:14.3f}"
+        if previous.get(name):
+            change = (value - previous[name]) / previous[name] * 100
+            line += f"  ({change:+.1f}% vs baseline)"
+        print(line)
@@ -0,0 +1,274 @@
+"""
+HTML extraction engine used by the scraper.
+Parses pages with lxml and pulls listing links and article fields out of
+a single traversal of the document, using precompiled selector rules.
+"""
+
+import re
+from lxml import html as lxml_html
+
+# Tags whose text is never part of the visible page text
+NON_TEXT_TAGS = {'script', 'style', 'template'}
+
+# Listing page rules, in priority order: (tag names, attribute, compiled pattern)
+LISTING_RULES = [
+    ({'article'}, None, None),
+    ({'div'}, 'class', re.compile(r'article|blog|post', re.I)),
+    ({'div'}, 'id', re.compile(r'article|blog|post', re.I)),
+    ({'div', 'section'}, 'class', re.compile(r'card|item|entry', re.I)),
+]
+
+# Article page rules, in priority order
+CONTENT_RULES = [
+    ({'div'}, 'class', re.compile(r'content|post-content|article-content|entry-content', re.I)),
+    ({'div'}, 'class', re.compile(r'post-body|article-body', re.I)),
+    ({'div'}, 'id', re.compile(r'content|post-content|article-content', re.I)),
+]
+AUTHOR_RULES = [
+    ({'span', 'div', 'a'}, 'class', re.compile(r'author|byline|writer', re.I)),
+    ({'span', 'div', 'a'}, 'itemprop', 'author'),
+]
+DATE_RULES = [
+    ({'time', 'span', 'div'}, 'class', re.compile(r'date|published|time', re.I)),
+    ({'time', 'span', 'div'}, 'itemprop', 'datePublished'),
+    ({'time', 'span', 'div'}, 'datetime', True),
+]
+
+HEADING_TAGS = {'h1', 'h2', 'h3', 'h4'}
+ARTICLE_LINK_MARKERS = ('/blog/', '/article/', '/post/')
+
+def parse_html(content):
+    """
+    Parse raw page bytes/text into an lxml element tree, or None if empty.
+    Bytes are decoded as UTF-8 when possible; otherwise lxml falls back to
+    the charset declared by the page.
+    """
+    if not content:
+        return None
+    if isinstance(content, bytes):
+        try:
+            content = content.decode('utf-8')
+        except UnicodeDecodeError:
+            pass
+    try:
+        return lxml_html.document_fromstring(content)
+    except ValueError:
+        # Decoded text that still carries an XML encoding declaration
+        if isinstance(content, str):
+            return parse_html(content.encode('utf-8'))
+        return None
+    except lxml_html.etree.ParserError:
+        return None
+
+def _matches(element, rule):
+    """Check whether an element matches a (tags, attribute, pattern) rule."""
+    tags, attribute, pattern = rule
+    if element.tag not in tags:
+        return False
+    if attribute is None:
+        return True
+    value = element.get(attribute)
+    if value is None:
+        return False
+    if pattern is True:
+        return True
+    if isinstance(pattern, str):
+        return value == pattern
+    return pattern.search(value) is not None
+
+def _iter_elements(root):
+    """Iterate over the element nodes of a tree in document order, skipping comments."""
+    for element in root.iter():
+        if isinstance(element.tag, str):
+            yield element
+
+def element_text(element):
+    """
+    Return the text of an element with every text node stripped and
+    concatenated, skipping comments and script/style contents.
+    """
+    parts = []
+
+    def collect(node):
+        if isinstance(node.tag, str) and node.tag not in NON_TEXT_TAGS and node.text:
+            text = node.text.strip()
+            if text:
+                parts.append(text)
+        for child in node:
+            collect(child)
+            if child.tail:
+                tail = child.tail.strip()
+                if tail:
+                    parts.append(tail)
+
+    collect(element)
+    return ''.join(parts)
+
+def _first_descendant(element, tags, require_href=False):
+    """Return the first descendant of an element with one of the given tags."""
+    for descendant in element.iterdescendants():
+        if descendant.tag in tags and (not require_href or descendant.get('href') is not None):
+            return descendant
+    return None
+
+def _paragraph_text(element):
+    """Join the text of every <p> below an element with single spaces."""
+    return ' '.join(element_text(p) for p in element.iterdescendants('p'))
+
+def _absolute_url(href, page_url):
+    """Make an href absolute relative to the listing page URL."""
+    if href.startswith('/'):
+        base = '/'.join(page_url.split('/')[:3])
+        return base + href
+    if not href.startswith('http'):
+        return page_url.rstrip('/') + '/' + href.lstrip('/')
+    return href
+
+def has_listing_articles(root):
+    """Check whether a parsed listing page contains any article elements."""
+    if root is None:
+        return False
+    for element in _iter_elements(root):
+        if element.tag == 'article' or _matches(element, LISTING_RULES[1]):
+            return True
+    return False
+
+def extract_article_links(root, page_url, limit=None):
+    """
+    Extract unique article links from a parsed listing page.
+    Candidate elements for every listing rule are collected in one pass;
+    rules are then consumed in priority order until `limit` links are found.
+    Returns a list of {'url', 'title'} dictionaries.
+    """
+    if root is None:
+        return []
+
+    candidates = [[] for _ in LISTING_RULES]
+    anchors = []
+    for element in _iter_elements(root):
+        for index, rule in enumerate(LISTING_RULES):
+            if _matches(element, rule):
+                candidates[index].append(element)
+        if element.tag == 'a' and element.get('href') is not None:
+            anchors.append(element)
+
+    article_links = []
+    seen_urls = set()
+
+    for elements in candidates:
+        for element in elements:
+            if limit is not None and len(article_links) >= limit:
+                return article_links
+            # Find link to article
+            link = _first_descendant(element, {'a'}, require_href=True)
+            if link is None:
+                continue
+            href = link.get('href', '')
+            if not href:
+                continue
+            href = _absolute_url(href, page_url)
+
+            # Get title
+            title_elem = _first_descendant(element, HEADING_TAGS)
+            title = element_text(title_elem) if title_elem is not None else element_text(link)
+
+            if href and title and href not in seen_urls:
+                seen_urls.add(href)
+                article_links.append({
+                    'url': href,
+                    'title': title
+                })
+
+    # If no articles found with common selectors, fall back to blog-looking links
+    if not article_links:
+        for link in anchors:
+            if limit is not None and len(article_links) >= limit:
+                break
+            href = link.get('href', '')
+            text = element_text(link)
+            if any(marker in href for marker in ARTICLE_LINK_MARKERS) and text:
+                href = _absolute_url(href, page_url)
+                if href not in seen_urls:
+                    seen_urls.add(href)
+                    article_links.append({
+                        'url': href,
+                        'title': text
+                    })
+
+    return article_links
+
+def extract_article_details(root):
+    """
+    Extract title, content, author and published date from a parsed article page.
+    The first match of every rule is recorded during a single traversal and
+    the rules are then resolved in priority order.
+    Returns a dictionary with article details.
+    """
+    if root is None:
+        return {'title': '', 'content': '', 'author': '', 'published_date': ''}
+
+    first_h1 = first_title = first_main = first_article = None
+    content_matches = [None] * len(CONTENT_RULES)
+    author_matches = [None] * len(AUTHOR_RULES)
+    date_matches = [None] * len(DATE_RULES)
+
+    for element in _iter_elements(root):
+        tag = element.tag
+        if tag == 'h1':
+            if first_h1 is None:
+                first_h1 = element
+        elif tag == 'title':
+            if first_title is None:
+                first_title = element
+        elif tag == 'main':
+            if first_main is None:
+                first_main = element
+        elif tag == 'article':
+            if first_article is None:
+                first_article = element
+        for matches, rules in ((content_matches, CONTENT_RULES),
+                               (author_matches, AUTHOR_RULES),
+                               (date_matches, DATE_RULES)):
+            for index, rule in enumerate(rules):
+                if matches[index] is None and _matches(element, rule):
+                    matches[index] = element
+
+    # Extract title
+    title_tag = first_h1 if first_h1 is not None else first_title
+    title = element_text(title_tag) if title_tag is not None else ""
+
+    # Extract content - first selector whose element has paragraph text wins
+    content = ""
+    for content_div in content_matches:
+        if content_div is not None:
+            content = _paragraph_text(content_div)
+            if content:
+                break
+
+    # If no content found, try main/article tag
+    if not content:
+        main_tag = first_main if first_main is not None else first_article
+        if main_tag is not None:
+            content = _paragraph_text(main_tag)
+
+    # Extract author
+    author = ""
+    for author_tag in author_matches:
+        if author_tag is not None:
+            author = element_text(author_tag)
+            break
+
+    # Extract published date
+    published_date = ""
+    for date_tag in date_matches:
+        if date_tag is not None:
+            published_date = date_tag.get('datetime') or element_text(date_tag)
+            if published_date:
+                break
+
+    return {
+        'title': title,
+        'content': content,
+        'author': author,
+        'published_date': published_date
+    }
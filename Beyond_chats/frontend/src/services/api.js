@@ -1,6 +1,7 @@
 import axios from 'axios'
 
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:5001/api/articles'
+const PAGE_SIZE = 500
 
 const api = axios.create({
   baseURL: API_BASE_URL,
@@ -11,15 +12,23 @@ const api = axios.create({
 
 export const articleService = {
   /**
-   * Fetch all articles
+   * Fetch all articles, following the API's next_cursor pages
    */
   async getAllArticles() {
     try {
-      const response = await api.get('')
-      if (response.data.success) {
-        return response.data.articles || []
-      }
-      throw new Error(response.data.error || 'Failed to fetch articles')
+      const articles = []
+      let cursor = null
+      do {
+        const params = { limit: PAGE_SIZE }
+        if (cursor) params.cursor = cursor
+        const response = await api.get('', { params })
+        if (!response.data.success) {
+          throw new Error(response.data.error || 'Failed to fetch articles')
+        }
+        articles.push(...(response.data.articles || []))
+        cursor = response.data.next_cursor
+      } while (cursor)
+      return articles
     } catch (error) {
       console.error('Error fetching articles:', error)
       throw error
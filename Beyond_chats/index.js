@@ -13,7 +13,32 @@ import { fetchArticles } from './services/apiService.js';
 import { searchGoogle } from './services/googleSearch.js';
 import { scrapeArticleContent } from './services/scraper.js';
 import { enhanceArticleWithLLM } from './services/llmService.js';
-import { publishArticle } from './services/apiService.js';
+import { publishArticles } from './services/apiService.js';
+
+// Enhanced articles are published in batches of this size (one request and transaction each)
+const PUBLISH_BATCH_SIZE = 20;
+
+/**
+ * Publish the queued enhanced articles in one batch request and report each result
+ */
+async function flushPublishQueue(queue) {
+  if (queue.length === 0) return;
+  console.log(`\n📤 Publishing ${queue.length} enhanced article(s)...`);
+  try {
+    const results = await publishArticles(queue.map(item => item.data));
+    for (const result of results) {
+      const title = queue[result.index].title;
+      if (result.success) {
+        console.log(`✅ Published "${title}" with ID: ${result.article_id}`);
+      } else {
+        console.log(`❌ Failed to publish "${title}": ${result.error}`);
+      }
+    }
+  } catch (error) {
+    console.error('❌ Error publishing batch:', error.message);
+  }
+  queue.length = 0;
+}
 
 async function main() {
   try {
@@ -30,6 +55,8 @@ async function main() {
 
     console.log(`✅ Found ${articles.length} article(s)\n`);
 
+    const publishQueue = [];
+
     // Process each article
     for (const article of articles) {
       try {
@@ -96,20 +123,20 @@ async function main() {
         
         const finalContent = enhancedContent + citationsSection;
 
-        // Step 5: Publish the enhanced article
-        console.log('📤 Publishing enhanced article...');
-        const publishedArticle = await publishArticle({
+        // Step 5: Queue the enhanced article for publishing
+        publishQueue.push({
           title: article.title,
-          url: article.url || `https://example.com/articles/${article.id}`,
-          content: finalContent,
-          author: article.author || '',
-          published_date: article.published_date || new Date().toISOString()
+          data: {
+            title: article.title,
+            url: article.url || `https://example.com/articles/${article.id}`,
+            content: finalContent,
+            author: article.author || '',
+            published_date: article.published_date || new Date().toISOString()
+          }
         });
 
-        if (publishedArticle) {
-          console.log(`✅ Successfully published article with ID: ${publishedArticle.article_id}`);
-        } else {
-          console.log('❌ Failed to publish article');
+        if (publishQueue.length >= PUBLISH_BATCH_SIZE) {
+          await flushPublishQueue(publishQueue);
         }
 
       } catch (error) {
@@ -118,6 +145,8 @@ async function main() {
       }
     }
 
+    await flushPublishQueue(publishQueue);
+
     console.log('\n✨ Article enhancement process completed!');
 
   } catch (error) {
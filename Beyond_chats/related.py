@@ -0,0 +1,365 @@
+"""
+Related-articles index.
+Articles are vectorised into L2-normalised sublinear TF-IDF rows over hashed
+features (so new articles never need a vocabulary refit) and the top
+NEIGHBORS most similar articles of every article are precomputed.
+The matrix and neighbour lists are saved as .npy files and memory-mapped on
+load; changes are applied incrementally and merged into the files every
+SAVE_EVERY changes.
+"""
+
+import hashlib
+import itertools
+import json
+import os
+import shutil
+import threading
+import time
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer
+
+N_FEATURES = 2 ** 18
+NEIGHBORS = 20
+# Rows per block when computing all neighbour lists (block x articles dense scores)
+BUILD_BLOCK_ROWS = 256
+# Merge in-memory changes into the saved files after this many changes
+SAVE_EVERY = 200
+# IDF weights are frozen at build time; rebuild once this share of articles changed
+REBUILD_RATIO = 0.25
+FORMAT_VERSION = 1
+
+_vectorizer = HashingVectorizer(
+    n_features=N_FEATURES,
+    alternate_sign=False,
+    norm=None,
+    stop_words='english',
+    dtype=np.float32
+)
+
+def document_key(title, content_hash):
+    """Return a short key that changes whenever an article's indexed text changes."""
+    return hashlib.sha1(f"{title or ''}\0{content_hash or ''}".encode('utf-8')).hexdigest()[:16].encode('ascii')
+
+def _term_frequencies(texts):
+    """Hashed sublinear term frequencies (1 + log tf) of an iterable of texts, as CSR."""
+    texts = iter(texts)
+    first = next(texts, None)
+    if first is None:
+        return sp.csr_matrix((0, N_FEATURES), dtype=np.float32)
+    counts = _vectorizer.transform(itertools.chain([first], texts))
+    counts.data = 1 + np.log(counts.data)
+    return counts
+
+def _normalize_rows(matrix):
+    """Scale the rows of a CSR matrix to unit L2 norm (all-zero rows stay zero)."""
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return (sp.diags(1 / norms) @ matrix).tocsr().astype(np.float32)
+
+def _top_neighbors(matrix, ids, scores_out, ids_out):
+    """
+    Fill the neighbour arrays with every row's most similar other rows.
+    Cosine similarities are computed a block of rows at a time against the
+    whole (normalised) matrix.
+    """
+    rows = matrix.shape[0]
+    k = min(NEIGHBORS, rows - 1)
+    if k <= 0:
+        return
+    transposed = matrix.T.tocsr()
+    for start in range(0, rows, BUILD_BLOCK_ROWS):
+        block = (matrix[start:start + BUILD_BLOCK_ROWS] @ transposed).toarray()
+        positions = np.arange(block.shape[0])
+        block[positions, start + positions] = -1  # never your own neighbour
+        top = np.argpartition(-block, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(block, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+        found = top_scores > 0
+        ids_out[start:start + block.shape[0], :k] = np.where(found, ids[top], -1)
+        scores_out[start:start + block.shape[0], :k] = np.where(found, top_scores, 0)
+
+class RelatedIndex:
+    """
+    Precomputed nearest neighbours of every article plus the TF-IDF matrix
+    needed to place new or changed articles without a full rebuild.
+    Saved matrix rows are memory-mapped; rows added since the last save live
+    in memory until the next save merges them. Methods are thread-safe.
+    """
+
+    def __init__(self, path, ids, keys, idf, matrix, neighbor_ids, neighbor_scores, changes_since_build=0):
+        self.path = path
+        self.lock = threading.RLock()
+        self.idf = idf
+        # Saved rows (CSC, so a new vector only touches the posting lists of its terms)
+        self.matrix = matrix
+        self.saved_rows = matrix.shape[0]
+        self.row_count = self.saved_rows
+        self.row_ids = ids
+        self.row_keys = keys
+        self.neighbor_ids = neighbor_ids
+        self.neighbor_scores = neighbor_scores
+        self.removed = np.zeros(self.saved_rows, dtype=bool)
+        self.new_vectors = []  # CSR rows added since the last save (None once removed)
+        self.changes_since_build = changes_since_build
+        self.changes_since_save = 0
+        self._row_of = {int(article_id): row for row, article_id in enumerate(ids.tolist())}
+
+    # ---- construction and persistence ----
+
+    @classmethod
+    def build(cls, path, documents):
+        """
+        Build an index from (id, key, text) documents (any iterable) and save it.
+        Returns the new RelatedIndex.
+        """
+        ids = []
+        keys = []
+
+        def texts():
+            for article_id, key, text in documents:
+                ids.append(article_id)
+                keys.append(key)
+                yield text
+
+        frequencies = _term_frequencies(texts())
+        ids = np.array(ids, dtype=np.int64)
+        keys = np.array(keys, dtype='S16')
+        document_frequency = np.bincount(frequencies.indices, minlength=N_FEATURES)
+        idf = (np.log((1 + len(ids)) / (1 + document_frequency)) + 1).astype(np.float32)
+        matrix = _normalize_rows(frequencies.multiply(idf).tocsr())
+
+        neighbor_ids = np.full((len(ids), NEIGHBORS), -1, dtype=np.int64)
+        neighbor_scores = np.zeros((len(ids), NEIGHBORS), dtype=np.float32)
+        _top_neighbors(matrix, ids, neighbor_scores, neighbor_ids)
+
+        index = cls(path, ids, keys, idf, matrix.tocsc(), neighbor_ids, neighbor_scores)
+        index.save()
+        return index
+
+    @classmethod
+    def load(cls, path):
+        """
+        Memory-map a saved index.
+        Returns the RelatedIndex, or None if there is no usable index at `path`.
+        """
+        try:
+            with open(os.path.join(path, 'meta.json'), encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get('format') != FORMAT_VERSION or meta.get('n_features') != N_FEATURES \
+                    or meta.get('neighbors') != NEIGHBORS:
+                return None
+
+            def array(name, mode='r'):
+                return np.load(os.path.join(path, f'{name}.npy'), mmap_mode=mode)
+
+            matrix = sp.csc_matrix(
+                (array('data'), array('indices'), array('indptr')),
+                shape=tuple(meta['shape']), copy=False
+            )
+            # Copy-on-write maps: changes stay in memory until the next save
+            return cls(
+                path, array('ids', 'c'), array('keys', 'c'), array('idf'), matrix,
+                array('neighbor_ids', 'c'), array('neighbor_scores', 'c'),
+                changes_since_build=meta.get('changes_since_build', 0)
+            )
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def save(self):
+        """
+        Merge rows added or removed since the last save into the matrix and
+        write the index to a fresh directory that then replaces `path`, so a
+        crash never leaves a half-written index. The saved files are re-mapped.
+        """
+        with self.lock:
+            live = np.nonzero(self.row_ids[:self.row_count] >= 0)[0]
+            saved_live = live[live < self.saved_rows]
+            parts = [self.matrix.tocsr()[saved_live]] if len(saved_live) else []
+            parts += [self.new_vectors[row - self.saved_rows] for row in live[live >= self.saved_rows]]
+            matrix = (sp.vstack(parts).tocsc() if parts
+                      else sp.csc_matrix((0, N_FEATURES), dtype=np.float32))
+            matrix.sort_indices()
+            index_dtype = np.int32 if matrix.nnz < 2 ** 31 else np.int64
+
+            temporary = f"{self.path}.tmp-{os.getpid()}"
+            shutil.rmtree(temporary, ignore_errors=True)
+            os.makedirs(temporary)
+            arrays = {
+                'data': matrix.data.astype(np.float32),
+                'indices': matrix.indices.astype(index_dtype),
+                'indptr': matrix.indptr.astype(index_dtype),
+                'ids': np.asarray(self.row_ids[live]),
+                'keys': np.asarray(self.row_keys[live]),
+                'idf': np.asarray(self.idf),
+                'neighbor_ids': np.asarray(self.neighbor_ids[live]),
+                'neighbor_scores': np.asarray(self.neighbor_scores[live]),
+            }
+            for name, value in arrays.items():
+                np.save(os.path.join(temporary, f'{name}.npy'), value)
+            with open(os.path.join(temporary, 'meta.json'), 'w', encoding='utf-8') as f:
+                json.dump({
+                    'format': FORMAT_VERSION,
+                    'n_features': N_FEATURES,
+                    'neighbors': NEIGHBORS,
+                    'shape': list(matrix.shape),
+                    'changes_since_build': self.changes_since_build,
+                    'saved_at': time.time(),
+                }, f)
+
+            previous = f"{self.path}.old-{os.getpid()}"
+            if os.path.exists(self.path):
+                os.replace(self.path, previous)
+            os.replace(temporary, self.path)
+            shutil.rmtree(previous, ignore_errors=True)
+
+            saved = RelatedIndex.load(self.path)
+            self.__dict__.update({
+                name: value for name, value in saved.__dict__.items() if name != 'lock'
+            })
+
+    # ---- queries ----
+
+    def __len__(self):
+        return len(self._row_of)
+
+    def neighbors(self, article_id):
+        """
+        Return the precomputed [(article id, score)] neighbours of an article,
+        most similar first, or None if the article is not indexed.
+        """
+        with self.lock:
+            row = self._row_of.get(article_id)
+            if row is None:
+                return None
+            ids = self.neighbor_ids[row]
+            scores = self.neighbor_scores[row]
+            found = ids >= 0
+            return list(zip(ids[found].tolist(), scores[found].tolist()))
+
+    def diff(self, current_keys, article_ids=None):
+        """
+        Compare the index with the current {article id: document key} mapping.
+        With `article_ids`, only those articles are compared (ids missing from
+        `current_keys` were deleted); otherwise the mapping covers every article.
+        Returns (ids to (re)index, ids to remove).
+        """
+        with self.lock:
+            if article_ids is None:
+                article_ids = list(self._row_of)
+                article_ids.extend(article_id for article_id in current_keys if article_id not in self._row_of)
+            indexed = {
+                article_id: self.row_keys[self._row_of[article_id]]
+                for article_id in article_ids if article_id in self._row_of
+            }
+        changed = [
+            article_id for article_id in article_ids
+            if article_id in current_keys and indexed.get(article_id) != current_keys[article_id]
+        ]
+        removed = [article_id for article_id in indexed if article_id not in current_keys]
+        return changed, removed
+
+    def needs_rebuild(self):
+        """True once enough articles changed since the build that the frozen IDF is stale."""
+        return self.changes_since_build > max(50, REBUILD_RATIO * len(self))
+
+    # ---- incremental updates ----
+
+    def update(self, documents=(), removed_ids=()):
+        """
+        Index new or changed (id, key, text) documents and drop removed ids.
+        Each new vector is scored against every row through the posting lists
+        of its terms; it gets its own top neighbours and is inserted into the
+        neighbour lists it now belongs to. Saves once SAVE_EVERY changes piled up.
+        """
+        documents = list(documents)
+        vectors = self._vectors([text for _, _, text in documents]) if documents else None
+        with self.lock:
+            for article_id in removed_ids:
+                self._remove(article_id)
+            for position, (article_id, key, _) in enumerate(documents):
+                self._remove(article_id)
+                self._add(article_id, key, vectors[position])
+            changes = len(documents) + len(removed_ids)
+            self.changes_since_build += changes
+            self.changes_since_save += changes
+            if self.changes_since_save >= SAVE_EVERY:
+                self.save()
+
+    def _vectors(self, texts):
+        return _normalize_rows(_term_frequencies(texts).multiply(self.idf).tocsr())
+
+    def _similarities(self, vector):
+        """Cosine similarity of a normalised vector with every row (-1 for removed rows)."""
+        scores = np.full(self.row_count, -1.0, dtype=np.float32)
+        if self.saved_rows and vector.nnz:
+            saved = self.matrix[:, vector.indices] @ vector.data
+            scores[:self.saved_rows] = np.where(self.removed, -1.0, saved)
+        for offset, other in enumerate(self.new_vectors):
+            if other is not None:
+                scores[self.saved_rows + offset] = other.multiply(vector).sum()
+        return scores
+
+    def _grow(self):
+        """Make room for one more row in the per-row arrays."""
+        if self.row_count < len(self.row_ids):
+            return
+        extra = max(64, self.row_count)
+        self.row_ids = np.concatenate([self.row_ids, np.full(extra, -1, dtype=np.int64)])
+        self.row_keys = np.concatenate([self.row_keys, np.zeros(extra, dtype='S16')])
+        self.neighbor_ids = np.concatenate([self.neighbor_ids, np.full((extra, NEIGHBORS), -1, dtype=np.int64)])
+        self.neighbor_scores = np.concatenate([self.neighbor_scores, np.zeros((extra, NEIGHBORS), dtype=np.float32)])
+
+    def _resort(self, rows):
+        """Re-sort the neighbour lists of some rows by descending score."""
+        if len(rows) == 0:
+            return
+        order = np.argsort(-self.neighbor_scores[rows], axis=1, kind='stable')
+        self.neighbor_scores[rows] = np.take_along_axis(self.neighbor_scores[rows], order, axis=1)
+        self.neighbor_ids[rows] = np.take_along_axis(self.neighbor_ids[rows], order, axis=1)
+
+    def _add(self, article_id, key, vector):
+        scores = self._similarities(vector)
+        self._grow()
+        row = self.row_count
+        self.row_count += 1
+        self.row_ids[row] = article_id
+        self.row_keys[row] = key
+        self.new_vectors.append(vector)
+        self._row_of[article_id] = row
+
+        # Its own neighbour list
+        candidates = np.nonzero(scores > 0)[0]
+        top = candidates[np.argsort(-scores[candidates], kind='stable')[:NEIGHBORS]]
+        self.neighbor_ids[row] = -1
+        self.neighbor_scores[row] = 0
+        self.neighbor_ids[row, :len(top)] = self.row_ids[top]
+        self.neighbor_scores[row, :len(top)] = scores[top]
+
+        # Lists whose weakest entry it now beats (empty slots score 0)
+        beaten = np.nonzero(scores[:row] > self.neighbor_scores[:row, -1])[0]
+        self.neighbor_ids[beaten, -1] = article_id
+        self.neighbor_scores[beaten, -1] = scores[beaten]
+        self._resort(beaten)
+
+    def _remove(self, article_id):
+        row = self._row_of.pop(article_id, None)
+        if row is None:
+            return
+        self.row_ids[row] = -1
+        self.neighbor_ids[row] = -1
+        self.neighbor_scores[row] = 0
+        if row < self.saved_rows:
+            self.removed[row] = True
+        else:
+            self.new_vectors[row - self.saved_rows] = None
+        # Leave a hole (score 0) in the lists that held it until the next rebuild
+        holders = np.nonzero((self.neighbor_ids[:self.row_count] == article_id).any(axis=1))[0]
+        if len(holders):
+            mask = self.neighbor_ids[holders] == article_id
+            self.neighbor_ids[holders] = np.where(mask, -1, self.neighbor_ids[holders])
+            self.neighbor_scores[holders] = np.where(mask, 0, self.neighbor_scores[holders])
+            self._resort(holders)
@@ -0,0 +1,145 @@
+"""
+Reference implementation of the scraper's extraction rules.
+
+This is the BeautifulSoup code app.py used before extraction moved to the
+lxml engine in extractor.py, kept unchanged apart from taking page bytes
+instead of fetching them. The tests compare both engines on the same pages,
+so any change to what the scraper extracts shows up as a failing test.
+"""
+
+import re
+
+from bs4 import BeautifulSoup
+
+def reference_article_links(content, url):
+    """
+    Extract article links from a listing page the way the BeautifulSoup scraper did.
+    Returns a list of {'url', 'title'} dictionaries.
+    """
+    soup = BeautifulSoup(content, 'html.parser')
+    
+    # Try multiple common article/blog post selectors
+    article_selectors = [
+        soup.find_all('article'),
+        soup.find_all('div', class_=re.compile(r'article|blog|post', re.I)),
+        soup.find_all('div', id=re.compile(r'article|blog|post', re.I)),
+        soup.find_all(['div', 'section'], {'class': re.compile(r'card|item|entry', re.I)}),
+    ]
+    
+    article_links = []
+    
+    for selector_result in article_selectors:
+        for element in selector_result:
+            # Find link to article
+            link = element.find('a', href=True)
+            if link:
+                href = link.get('href', '')
+                if href:
+                    # Make absolute URL if relative
+                    if href.startswith('/'):
+                        base = '/'.join(url.split('/')[:3])
+                        href = base + href
+                    elif not href.startswith('http'):
+                        href = url.rstrip('/') + '/' + href.lstrip('/')
+                    
+                    # Get title
+                    title_elem = element.find(['h1', 'h2', 'h3', 'h4'])
+                    title = title_elem.get_text(strip=True) if title_elem else link.get_text(strip=True)
+                    
+                    if href and title and href not in [a['url'] for a in article_links]:
+                        article_links.append({
+                            'url': href,
+                            'title': title
+                        })
+    
+    # If no articles found with common selectors, try finding all links
+    if not article_links:
+        all_links = soup.find_all('a', href=True)
+        for link in all_links:
+            href = link.get('href', '')
+            text = link.get_text(strip=True)
+            # Filter for blog/article links
+            if ('/blog/' in href or '/article/' in href or '/post/' in href) and text:
+                if href.startswith('/'):
+                    base = '/'.join(url.split('/')[:3])
+                    href = base + href
+                elif not href.startswith('http'):
+                    href = url.rstrip('/') + '/' + href.lstrip('/')
+                
+                if href not in [a['url'] for a in article_links]:
+                    article_links.append({
+                        'url': href,
+                        'title': text
+                    })
+    
+    return article_links
+
+def reference_article_details(content):
+    """
+    Extract article fields from an article page the way the BeautifulSoup scraper did.
+    Returns a dictionary with title, content, author and published_date.
+    """
+    soup = BeautifulSoup(content, 'html.parser')
+    
+    # Extract title
+    title = ""
+    title_tag = soup.find('h1') or soup.find('title')
+    if title_tag:
+        title = title_tag.get_text(strip=True)
+    
+    # Extract content - try multiple common selectors
+    content = ""
+    content_selectors = [
+        {'class': re.compile(r'content|post-content|article-content|entry-content', re.I)},
+        {'class': re.compile(r'post-body|article-body', re.I)},
+        {'id': re.compile(r'content|post-content|article-content', re.I)},
+    ]
+    
+    for selector in content_selectors:
+        content_div = soup.find('div', selector)
+        if content_div:
+            # Get all paragraphs
+            paragraphs = content_div.find_all('p')
+            content = ' '.join([p.get_text(strip=True) for p in paragraphs])
+            if content:
+                break
+    
+    # If no content found, try main/article tag
+    if not content:
+        main_tag = soup.find('main') or soup.find('article')
+        if main_tag:
+            paragraphs = main_tag.find_all('p')
+            content = ' '.join([p.get_text(strip=True) for p in paragraphs])
+    
+    # Extract author
+    author = ""
+    author_selectors = [
+        {'class': re.compile(r'author|byline|writer', re.I)},
+        {'itemprop': 'author'},
+    ]
+    for selector in author_selectors:
+        author_tag = soup.find(['span', 'div', 'a'], selector)
+        if author_tag:
+            author = author_tag.get_text(strip=True)
+            break
+    
+    # Extract published date
+    published_date = ""
+    date_selectors = [
+        {'class': re.compile(r'date|published|time', re.I)},
+        {'itemprop': 'datePublished'},
+        {'datetime': True},
+    ]
+    for selector in date_selectors:
+        date_tag = soup.find(['time', 'span', 'div'], selector)
+        if date_tag:
+            published_date = date_tag.get('datetime') or date_tag.get_text(strip=True)
+            if published_date:
+                break
+    
+    return {
+        'title': title,
+        'content': content,
+        'author': author,
+        'published_date': published_date
+    }
@@ -0,0 +1,116 @@
+"""
+Regression tests for the lxml extraction engine (extractor.py).
+
+Every page is extracted with both the lxml engine and the BeautifulSoup
+reference it replaced (reference_extractor.py); the results must be identical.
+
+Run from the Beyond_chats directory:
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(TESTS_DIR))
+sys.path.insert(0, os.path.join(os.path.dirname(TESTS_DIR), 'benchmarks'))
+
+from extractor import parse_html, extract_article_details, extract_article_links  # noqa: E402
+from fixtures import article_page_html, listing_page_html, article_slug  # noqa: E402
+from reference_extractor import reference_article_details, reference_article_links  # noqa: E402
+
+PAGE_URL = 'https://beyondchats.com/blogs/'
+
+# Hand-written article pages for the fallback rules the fixture pages never reach
+ARTICLE_PAGES = {
+    'id_content_itemprop_author': """
+        <html><head><title>Fallback page</title></head><body>
+        <h1>Heading <em>with</em> markup</h1>
+        <div id="content"><p>First &amp; second.</p><p>  Spaced   out  </p><p><!-- note -->Last</p></div>
+        <div itemprop="author">Ritika <b>Sharma</b></div>
+        <span datetime="2024-01-02">January 2, 2024</span>
+        </body></html>
+    """,
+    'article_tag_fallback': """
+        <html><head><title>Only a title tag</title></head><body>
+        <article><p>Inside the article.</p><section><p>Nested paragraph.</p></section></article>
+        <a class="byline" href="/authors/aman/">Aman Verma</a>
+        <div itemprop="datePublished">March 3, 2025</div>
+        </body></html>
+    """,
+    'empty_content_div_then_main': """
+        <html><body>
+        <div class="post-content"><span>No paragraphs here</span></div>
+        <main><p>Main text <script>var skipped = 1;</script>after script.</p></main>
+        <time class="published">Yesterday</time>
+        </body></html>
+    """,
+    'no_fields': """
+        <html><body><div class="wrapper"><span>Nothing to extract</span></div></body></html>
+    """,
+}
+
+# Hand-written listing pages for the secondary selectors and the plain-link fallback
+LISTING_PAGES = {
+    'div_and_section_cards': """
+        <html><body>
+        <div class="blog-entry"><h2>Relative link</h2><a href="relative-post/">Read</a></div>
+        <div id="post-42"><a href="https://other.example/post/42/">Absolute link</a></div>
+        <section class="card"><h4>Card title</h4><a href="/blogs/card/">More</a></section>
+        <div class="blog-entry"><h2>Duplicate</h2><a href="relative-post/">Read</a></div>
+        </body></html>
+    """,
+    'plain_links_only': """
+        <html><body><ul>
+        <li><a href="/blog/first/">First post</a></li>
+        <li><a href="/about/">About us</a></li>
+        <li><a href="/post/second/">Second <b>post</b></a></li>
+        <li><a href="/blog/first/">First post again</a></li>
+        <li><a href="/article/empty/"></a></li>
+        </ul></body></html>
+    """,
+}
+
+class ArticleDetailsTest(unittest.TestCase):
+    """extract_article_details matches the reference on article pages."""
+    
+    def assert_same_details(self, page):
+        self.assertEqual(extract_article_details(parse_html(page)), reference_article_details(page))
+    
+    def test_fixture_pages(self):
+        for paragraphs in (0, 1, 5, 40):
+            for seed in range(3):
+                page = article_page_html(article_slug(1, seed), paragraphs, seed=seed).encode('utf-8')
+                with self.subTest(paragraphs=paragraphs, seed=seed):
+                    self.assert_same_details(page)
+    
+    def test_fallback_rules(self):
+        for name, page in ARTICLE_PAGES.items():
+            with self.subTest(page=name):
+                self.assert_same_details(page.encode('utf-8'))
+
+class ArticleLinksTest(unittest.TestCase):
+    """extract_article_links matches the reference on listing pages."""
+    
+    def assert_same_links(self, page):
+        self.assertEqual(extract_article_links(parse_html(page), PAGE_URL), reference_article_links(page, PAGE_URL))
+    
+    def test_fixture_pages(self):
+        for page, last_page, per_page in ((1, 1, 1), (1, 20, 6), (7, 20, 10), (20, 20, 6)):
+            html = listing_page_html(page, last_page, per_page).encode('utf-8')
+            with self.subTest(page=page, per_page=per_page):
+                self.assert_same_links(html)
+    
+    def test_fallback_rules(self):
+        for name, page in LISTING_PAGES.items():
+            with self.subTest(page=name):
+                self.assert_same_links(page.encode('utf-8'))
+    
+    def test_limit_returns_a_prefix(self):
+        html = listing_page_html(3, 20, 10).encode('utf-8')
+        self.assertEqual(extract_article_links(parse_html(html), PAGE_URL, limit=5),
+                         reference_article_links(html, PAGE_URL)[:5])
+
+if __name__ == '__main__':
+    unittest.main()